@@ -8,4 +8,6 @@ class BgpConfig(AppConfig):
     def ready(self) -> None:
         from peering_manager.models.features import register_models
 
+        from . import search  # noqa: F401
+
         register_models(*self.get_models())
@@ -0,0 +1,9 @@
+from peering_manager.search import SearchIndex, register_search
+
+from .models import Community
+
+
+@register_search
+class CommunityIndex(SearchIndex):
+    model = Community
+    fields = (("name", 100), ("value", 100), ("slug", 110), ("description", 500))
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.contrib.admin import site as admin_site
+
+from .models import ScheduledTask
+
+
+@admin.register(ScheduledTask, site=admin_site)
+class ScheduledTaskAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "command",
+        "arguments",
+        "enabled",
+        "interval",
+        "missed_run_policy",
+        "last_run",
+        "next_run",
+    ]
+    readonly_fields = ["last_run", "next_run"]
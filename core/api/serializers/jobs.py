@@ -7,7 +7,25 @@ from users.api.nested_serializers import NestedUserSerializer
 from ...enums import *
 from ...models import *
 
-__all__ = ("JobSerializer", "NestedJobSerializer")
+__all__ = ("JobLogEntrySerializer", "JobSerializer", "NestedJobSerializer")
+
+
+class NestedJobSerializer(BaseModelSerializer):
+    status = ChoiceField(choices=JobStatus)
+    user = NestedUserSerializer(read_only=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "url",
+            "display_url",
+            "display",
+            "created",
+            "completed",
+            "user",
+            "status",
+        ]
 
 
 class JobSerializer(BaseModelSerializer):
@@ -15,6 +33,7 @@ class JobSerializer(BaseModelSerializer):
     status = ChoiceField(choices=JobStatus, read_only=True)
     object_type = ContentTypeField(read_only=True)
     output = serializers.CharField(read_only=True)
+    parent = NestedJobSerializer(read_only=True)
 
     class Meta:
         model = Job
@@ -34,22 +53,21 @@ class JobSerializer(BaseModelSerializer):
             "data",
             "job_id",
             "output",
+            "parent",
         ]
 
 
-class NestedJobSerializer(BaseModelSerializer):
-    status = ChoiceField(choices=JobStatus)
-    user = NestedUserSerializer(read_only=True)
+class JobLogEntrySerializer(serializers.ModelSerializer):
+    level = ChoiceField(choices=LogLevel, read_only=True)
 
     class Meta:
-        model = Job
+        model = JobLogEntry
         fields = [
             "id",
-            "url",
-            "display_url",
-            "display",
-            "created",
-            "completed",
-            "user",
-            "status",
+            "time",
+            "grouping",
+            "level",
+            "object_repr",
+            "object_url",
+            "message",
         ]
@@ -15,7 +15,7 @@ __all__ = ("DataFileViewSet", "DataSourceViewSet")
 
 
 class DataFileViewSet(PeeringManagerReadOnlyModelViewSet):
-    queryset = models.DataFile.objects.defer("data").prefetch_related("source")
+    queryset = models.DataFile.objects.all().prefetch_related("source")
     serializer_class = serializers.DataFileSerializer
     filterset_class = filtersets.DataFileFilterSet
 
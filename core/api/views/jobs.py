@@ -1,3 +1,10 @@
+import contextlib
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from peering_manager.api.viewsets import BaseViewSet
@@ -14,3 +21,61 @@ class JobViewSet(BaseViewSet, ReadOnlyModelViewSet):
     queryset = models.Job.objects.prefetch_related("user")
     serializer_class = serializers.JobSerializer
     filterset_class = filtersets.JobFilterSet
+
+    @extend_schema(
+        operation_id="core_jobs_log",
+        parameters=[
+            OpenApiParameter(
+                name="after",
+                type=OpenApiTypes.INT,
+                description="Only return log entries recorded after this one.",
+            )
+        ],
+        responses={200: serializers.JobLogEntrySerializer(many=True)},
+    )
+    @action(detail=True, methods=["get"], url_path="log")
+    def log(self, request, pk=None):
+        """
+        Retrieve the log entries of a job, in the order they were recorded, one
+        page at a time.
+        """
+        entries = self.get_object().log_entries.all()
+        with contextlib.suppress(KeyError, ValueError):
+            entries = entries.filter(pk__gt=int(request.query_params["after"]))
+
+        page = self.paginate_queryset(entries)
+        data = serializers.JobLogEntrySerializer(
+            entries if page is None else page, many=True, context={"request": request}
+        ).data
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    @extend_schema(
+        operation_id="core_jobs_cancel",
+        request=None,
+        responses={
+            200: OpenApiResponse(
+                response=serializers.JobSerializer,
+                description="The job and its children are cancelled.",
+            ),
+            403: OpenApiResponse(
+                response=OpenApiTypes.NONE,
+                description="The user does not have the permission to cancel jobs.",
+            ),
+        },
+    )
+    @action(detail=True, methods=["post"], url_path="cancel")
+    def cancel(self, request, pk=None):
+        """
+        Cancel a job which is not over yet, as well as all its children.
+        """
+        if not request.user.has_perm("core.change_job"):
+            return Response(None, status=status.HTTP_403_FORBIDDEN)
+
+        job = self.get_object()
+        job.cancel(user=request.user)
+
+        return Response(
+            serializers.JobSerializer(instance=job, context={"request": request}).data
+        )
@@ -14,5 +14,13 @@ class CoreConfig(AppConfig):
 
         register_models(*self.get_models())
 
+        if settings.METRICS_ENABLED:
+            from prometheus_client import REGISTRY
+
+            from peering_manager.metrics import QueueCollector, StatisticsCollector
+
+            REGISTRY.register(QueueCollector())
+            REGISTRY.register(StatisticsCollector())
+
         if settings.DEBUG:
             cache.clear()
@@ -0,0 +1,51 @@
+from peering_manager.api.caching import invalidate_models
+
+from .enums import ObjectChangeAction
+from .models import ObjectChange
+
+__all__ = ("enqueue_change", "flush_changes")
+
+
+def enqueue_change(queue, objectchange):
+    """
+    Queue a change record to be written once the request has completed.
+
+    Updates of an object already changed during the request are merged into its
+    pending record, keeping its action and pre-change data along with the latest
+    post-change data. This way, an object created and then assigned tags gets a
+    single record.
+    """
+    # Keep references to objects only, deleted ones lose their primary key
+    for field in ("changed_object", "related_object"):
+        objectchange._state.fields_cache.pop(field, None)
+
+    key = (objectchange.changed_object_type_id, objectchange.changed_object_id)
+    changes = queue.setdefault(key, [])
+
+    if (
+        changes
+        and objectchange.action == ObjectChangeAction.UPDATE
+        and changes[-1].action != ObjectChangeAction.DELETE
+    ):
+        changes[-1].postchange_data = objectchange.postchange_data
+        changes[-1].object_repr = objectchange.object_repr
+    else:
+        changes.append(objectchange)
+
+
+def flush_changes(queue):
+    """
+    Write queued change records to the database at once, skipping updates which do
+    not change anything.
+    """
+    changes = ObjectChange.objects.bulk_create(
+        [
+            change
+            for changes in queue.values()
+            for change in changes
+            if change.action != ObjectChangeAction.UPDATE or change.has_changes
+        ]
+    )
+    if changes:
+        # Records are written without signals, make cached API responses stale
+        invalidate_models(ObjectChange)
@@ -7,6 +7,7 @@ __all__ = (
     "CENSORSHIP_STRING_CHANGED",
     "GIT_ERROR_MATCHES",
     "RQ_TASK_STATUSES",
+    "SCHEDULED_TASK_TIMEOUT",
 )
 
 CENSORSHIP_STRING = "*************"
@@ -36,3 +37,6 @@ GIT_ERROR_MATCHES = (
     # GitLab
     "not allowed to push code to protected branches",
 )
+
+# Number of seconds a scheduled task job can run for
+SCHEDULED_TASK_TIMEOUT = 5400
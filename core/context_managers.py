@@ -1,7 +1,20 @@
 from contextlib import contextmanager
+from types import SimpleNamespace
 
-from extras.webhooks import flush_webhooks
-from peering_manager.context import current_request, webhooks_queue
+from django.db.models import prefetch_related_objects
+from django_prometheus.models import model_deletes, model_inserts, model_updates
+
+from extras.webhooks import enqueue_objects, flush_webhooks
+from peering_manager.context import (
+    bulk_changed_objects,
+    current_request,
+    objectchanges_queue,
+    webhooks_queue,
+)
+from utils.functions import is_taggable, serialize_object
+
+from .changelog import enqueue_change, flush_changes
+from .enums import ObjectChangeAction
 
 
 @contextmanager
@@ -11,13 +24,91 @@ def change_logging(request):
     before code is run, and disconnecting them afterward.
     """
     current_request.set(request)
+    objectchanges_queue.set({})
     webhooks_queue.set([])
 
-    yield
+    try:
+        yield
 
-    # Flush queued webhooks to RQ
-    flush_webhooks(webhooks_queue.get())
+        # Write queued changes to the database and flush queued webhooks to RQ
+        flush_changes(objectchanges_queue.get())
+        flush_webhooks(webhooks_queue.get())
+    finally:
+        # Clear context vars, workers can run several jobs in the same process
+        current_request.set(None)
+        objectchanges_queue.set({})
+        webhooks_queue.set([])
 
-    # Clear context vars
-    current_request.set(None)
-    webhooks_queue.set([])
+
+@contextmanager
+def job_change_logging(job):
+    """
+    Enables change logging for code run by a job, outside of any request. Changes
+    are made by the user who started the job and identified by the job ID.
+
+    Changes of jobs started without a user, such as scheduled ones, are not logged.
+    """
+    if job.user is None:
+        yield
+        return
+
+    with change_logging(SimpleNamespace(id=job.job_id, user=job.user)):
+        yield
+
+
+@contextmanager
+def bulk_change_logging(instances, action):
+    """
+    Records changes made to a set of objects of the same model in a set-based way,
+    for code writing them without going through `save()` or `delete()` one by one.
+
+    Objects must be in their final state (updated but not deleted yet) when entering
+    the context. Each one is serialized once, for both its `ObjectChange` and its
+    webhooks, and signal receivers ignore them while the context is active. Changes
+    and webhooks are queued along with the other ones of the request when leaving
+    it without error.
+    """
+    request = current_request.get()
+    if request is None or not instances or not hasattr(instances[0], "to_objectchange"):
+        yield
+        return
+
+    if is_taggable(instances[0]):
+        prefetch_related_objects(instances, "tags")
+
+    changes = []
+    queue = []
+    for instance in instances:
+        if action != ObjectChangeAction.DELETE:
+            instance._postchange_snapshot = serialize_object(instance)
+
+        change = instance.to_objectchange(action)
+        change.user = request.user
+        change.user_name = request.user.username
+        change.request_id = request.id
+        changes.append(change)
+    enqueue_objects(queue, instances, request.user, request.id, action)
+    for instance in instances:
+        instance.__dict__.pop("_postchange_snapshot", None)
+
+    token = bulk_changed_objects.set(
+        bulk_changed_objects.get()
+        | {(instance._meta.label_lower, instance.pk) for instance in instances}
+    )
+    try:
+        yield
+    finally:
+        bulk_changed_objects.reset(token)
+
+    for change in changes:
+        enqueue_change(objectchanges_queue.get(), change)
+    webhooks_queue.get().extend(queue)
+
+    # Increment metric counters
+    model_name = instances[0]._meta.model_name
+    if action == ObjectChangeAction.CREATE:
+        model_inserts.labels(model_name).inc(len(instances))
+    elif action == ObjectChangeAction.UPDATE:
+        model_updates.labels(model_name).inc(len(instances))
+    elif action == ObjectChangeAction.DELETE:
+        model_deletes.labels(model_name).inc(len(instances))
@@ -1,5 +1,8 @@
+import fcntl
 import io
 import logging
+import os
+import shutil
 import tempfile
 import unicodedata
 from contextlib import contextmanager
@@ -10,6 +13,8 @@ from django import forms
 from django.conf import settings
 from dulwich import porcelain
 from dulwich.config import ConfigDict
+from dulwich.diff_tree import tree_changes
+from dulwich.repo import Repo
 
 from .constants import GIT_ERROR_MATCHES
 from .exceptions import FetchError, PushError, SynchronisationError
@@ -31,10 +36,14 @@ class DataBackend:
     sensitive_parameters = []
     do_not_call_in_template = True
 
-    def __init__(self, url, **kwargs):
+    def __init__(self, url, cache_path=None, **kwargs):
         self.url = url
+        # Directory in which the backend can keep data between calls, if any
+        self.cache_path = cache_path
         self.params = kwargs
         self.config = self.init_config()
+        # Paths changed since the last synchronisation, `None` if unknown
+        self.changes = None
 
     @property
     def url_scheme(self):
@@ -118,6 +127,9 @@ class GitRepositoryBackend(DataBackend):
     }
     sensitive_parameters = ["password"]
 
+    # Reference to the last synchronised commit in persistent mirrors
+    synchronised_ref = b"refs/peering-manager/synchronised"
+
     def init_config(self):
         config = ConfigDict()
 
@@ -128,59 +140,166 @@ class GitRepositoryBackend(DataBackend):
 
         return config
 
-    @contextmanager
-    def fetch(self):
-        local_path = tempfile.TemporaryDirectory()
-        clone_args = {
-            "branch": self.params.get("branch"),
-            "config": self.config,
-            "depth": 1,
-            "errstream": porcelain.NoneStream(),
-            "quiet": True,
-        }
-
+    @property
+    def auth_args(self):
         if self.url_scheme in ("http", "https") and self.params.get("username"):
-            clone_args.update(
-                {
-                    "username": self.params.get("username"),
-                    "password": self.params.get("password"),
-                }
-            )
+            return {
+                "username": self.params.get("username"),
+                "password": self.params.get("password"),
+            }
+        return {}
 
+    def clone(self, target):
         logger.debug(f"cloning git repository: {self.url}")
         try:
-            porcelain.clone(source=self.url, target=local_path.name, **clone_args)
+            repo = porcelain.clone(
+                source=self.url,
+                target=target,
+                branch=self.params.get("branch"),
+                config=self.config,
+                depth=1,
+                errstream=porcelain.NoneStream(),
+                quiet=True,
+                **self.auth_args,
+            )
         except BaseException as e:
             raise SynchronisationError(
                 f"Fetching remote data failed ({type(e).__name__})"
             ) from e
 
-        yield local_path.name
+        # Keep the proxy for the following fetches
+        repo_config = repo.get_config()
+        for key, value in self.config.items(("http",)):
+            repo_config.set(("http",), key, value)
+        repo_config.write_to_path()
 
-        local_path.cleanup()
+        return repo
+
+    def update_mirror(self):
+        """
+        Update the persistent mirror of the repository to the head of the remote
+        branch, cloning the repository only if the mirror does not exist yet.
+        """
+        path = Path(self.cache_path)
+
+        repo = None
+        if (path / ".git").is_dir():
+            repo = Repo(str(path))
+            branch = self.params.get("branch")
+            if repo.get_config().get(("remote", "origin"), "url") != (
+                self.url.encode()
+            ) or (
+                branch
+                and repo.refs.get_symrefs().get(b"HEAD")
+                != f"refs/heads/{branch}".encode()
+            ):
+                logger.debug(f"mirror of {self.url} is outdated, removing it")
+                repo.close()
+                repo = None
+
+        if repo is None:
+            shutil.rmtree(path, ignore_errors=True)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return self.clone(str(path))
+
+        logger.debug(f"fetching git repository: {self.url}")
+        try:
+            result = porcelain.fetch(
+                repo,
+                remote_location=self.url,
+                depth=1,
+                errstream=porcelain.NoneStream(),
+                quiet=True,
+                **self.auth_args,
+            )
+            ref = b"HEAD"
+            if branch := self.params.get("branch"):
+                ref = f"refs/heads/{branch}".encode()
+            head = result.refs[ref]
+        except BaseException as e:
+            repo.close()
+            raise SynchronisationError(
+                f"Fetching remote data failed ({type(e).__name__})"
+            ) from e
+
+        # Drop anything left behind, like commits of a failed push
+        porcelain.reset(repo, "hard", head)
+        porcelain.clean(repo, str(path))
+
+        return repo
+
+    @contextmanager
+    def checkout(self):
+        """
+        Yield a working copy of the repository, up-to-date with the remote.
+
+        With a cache path, a persistent mirror is updated and locked while used,
+        otherwise the repository is cloned in a temporary directory.
+        """
+        if not self.cache_path:
+            with tempfile.TemporaryDirectory() as local_path:
+                repo = self.clone(local_path)
+                try:
+                    yield repo
+                finally:
+                    repo.close()
+            return
+
+        lock_path = Path(f"{self.cache_path}.lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with lock_path.open("w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            repo = self.update_mirror()
+            try:
+                yield repo
+            finally:
+                repo.close()
+
+    def get_changes(self, repo):
+        """
+        Return the paths changed between the last synchronised commit and the head
+        of a mirror, `None` if they cannot be known.
+        """
+        try:
+            synchronised = repo[repo.refs[self.synchronised_ref]]
+        except KeyError:
+            return None
+
+        changes = set()
+        for change in tree_changes(
+            repo.object_store, synchronised.tree, repo[repo.head()].tree
+        ):
+            for entry in (change.old, change.new):
+                if entry and entry.path:
+                    changes.add(os.fsdecode(entry.path))
+        return changes
+
+    @contextmanager
+    def fetch(self):
+        with self.checkout() as repo:
+            if self.cache_path:
+                self.changes = self.get_changes(repo)
+
+            yield repo.path
+
+            if self.cache_path:
+                repo.refs[self.synchronised_ref] = repo.head()
 
     @contextmanager
     def push(self, *file_paths, commit_message=settings.GIT_COMMIT_MESSAGE):
         # Fetch the repository first, and yield immediatly to let changes happen
-        with self.fetch() as local_path:
+        with self.checkout() as repo:
+            local_path = repo.path
             yield local_path
 
-            auth_args = {}
-
-            if self.url_scheme in ("http", "https") and self.params.get("username"):
-                auth_args = {
-                    "username": self.params.get("username"),
-                    "password": self.params.get("password"),
-                }
-
             paths = []
             for file_path in file_paths:
                 paths.append(str(Path(local_path, file_path)))
 
             logger.debug(f"staging files for git repository: {self.url}")
-            added, ignored = porcelain.add(repo=local_path, paths=paths)
+            added, ignored = porcelain.add(repo=repo, paths=paths)
 
-            changes = porcelain.get_tree_changes(repo=local_path)
+            changes = porcelain.get_tree_changes(repo=repo)
             if all(not v for v in changes.values()):
                 logger.debug(f"no changes found for git repository: {self.url}")
                 return
@@ -189,7 +308,7 @@ class GitRepositoryBackend(DataBackend):
                 f"staged {added}, ignored {list(ignored)} for git repository: {self.url}"
             )
             commit_sha = porcelain.commit(
-                repo=local_path,
+                repo=repo,
                 message=commit_message,
                 author=settings.GIT_COMMIT_AUTHOR,
             )
@@ -202,11 +321,11 @@ class GitRepositoryBackend(DataBackend):
                 # Fetch stderr to catch errors not raising exceptions
                 errstream = io.BytesIO()
                 porcelain.push(
-                    repo=local_path,
+                    repo=repo,
                     remote_location=self.url,
                     refspecs=self.params.get("branch") or "main",
                     errstream=errstream,
-                    **auth_args,
+                    **self.auth_args,
                 )
 
                 # This does not feel really robust, but that's the best we can do
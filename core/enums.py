@@ -25,6 +25,7 @@ class JobStatus(ChoiceSet):
     COMPLETED = "completed"
     ERRORED = "errored"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
     CHOICES = (
         (PENDING, "Pending", "primary"),
@@ -32,8 +33,11 @@ class JobStatus(ChoiceSet):
         (COMPLETED, "Completed", "success"),
         (ERRORED, "Errored", "danger"),
         (FAILED, "Failed", "danger"),
+        (CANCELLED, "Cancelled", "secondary"),
     )
 
+    TERMINAL_STATE_CHOICES = (COMPLETED, ERRORED, FAILED, CANCELLED)
+
 
 class LogLevel(ChoiceSet):
     DEFAULT = "default"
@@ -51,6 +55,16 @@ class LogLevel(ChoiceSet):
     )
 
 
+class MissedRunPolicy(ChoiceSet):
+    RUN = "run"
+    SKIP = "skip"
+
+    CHOICES = (
+        (RUN, "Run once", "primary"),
+        (SKIP, "Skip", "secondary"),
+    )
+
+
 class ObjectChangeAction(ChoiceSet):
     CREATE = "create"
     UPDATE = "update"
@@ -61,3 +75,17 @@ class ObjectChangeAction(ChoiceSet):
         (UPDATE, "Updated", "warning"),
         (DELETE, "Deleted", "danger"),
     )
+
+
+class ScheduledCommand(ChoiceSet):
+    GET_IRR_DATA = "get_irr_data"
+    HOUSEKEEPING = "housekeeping"
+    PEERINGDB_SYNC = "peeringdb_sync"
+    POLL_BGP_SESSIONS = "poll_bgp_sessions"
+
+    CHOICES = (
+        (GET_IRR_DATA, "Get IRR data"),
+        (HOUSEKEEPING, "Housekeeping"),
+        (PEERINGDB_SYNC, "PeeringDB synchronisation"),
+        (POLL_BGP_SESSIONS, "Poll BGP sessions"),
+    )
@@ -16,6 +16,7 @@ def exception_handler(rq_job, exc_type, exc_value, trace):
         job = Job.objects.get(job_id=rq_job.id)
     except Job.DoesNotExist:
         logger.error(f"could not find job id {rq_job.id}, cannot log exception")
+        return
 
     job.set_output("".join(traceback.format_exception(exc_type, exc_value, trace)))
     job.mark_errored(
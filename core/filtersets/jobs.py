@@ -36,7 +36,7 @@ class JobFilterSet(BaseFilterSet):
 
     class Meta:
         model = Job
-        fields = ("id", "object_type", "object_id", "name", "status", "user")
+        fields = ("id", "object_type", "object_id", "name", "status", "user", "parent")
 
     def search(self, queryset, name, value):
         if not value.strip():
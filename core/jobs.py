@@ -1,14 +1,17 @@
+import io
 import logging
 
+from django.core.management import CommandError, call_command
 from django_rq import job
 
+from .constants import SCHEDULED_TASK_TIMEOUT
 from .enums import *
 from .exceptions import SynchronisationError
 
 logger = logging.getLogger("peering.manager.core.jobs")
 
 
-@job("default")
+@job("sync")
 def synchronise_datasource(object, job):
     job.mark_running(
         "Starting data source synchronisation", object=object, logger=logger
@@ -33,3 +36,20 @@ def synchronise_datasource(object, job):
     job.mark_completed(
         "Successfully synchronised data source.", object=object, logger=logger
     )
+
+
+@job("sync", timeout=SCHEDULED_TASK_TIMEOUT)
+def run_command(command, arguments, job):
+    job.mark_running(f"Running {command} command.", object=job.object, logger=logger)
+
+    output = io.StringIO()
+    try:
+        call_command(command, *arguments, stdout=output, stderr=output)
+    except CommandError as e:
+        output.write(str(e))
+        job.set_output(output.getvalue())
+        job.mark_failed(f"Failed to run {command} command.", logger=logger)
+        return
+
+    job.set_output(output.getvalue())
+    job.mark_completed(f"Successfully ran {command} command.", logger=logger)
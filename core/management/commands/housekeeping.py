@@ -5,17 +5,48 @@ import requests
 from django.conf import settings
 from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from django.db import DEFAULT_DB_ALIAS
+from django.db import DEFAULT_DB_ALIAS, models
 from django.template.defaultfilters import pluralize
 from django.utils import timezone
 from packaging import version
 
-from core.models import Job, ObjectChange
+from core.models import DataBlob, Job, ObjectChange
+from peering_manager.api.caching import invalidate_models
 
 
 class Command(BaseCommand):
     help = "Perform housekeeping tasks. (This command can be run at any time.)"
 
+    # Number of records deleted by each query when deleting expired records
+    delete_batch_size = 10000
+
+    def delete_records(self, model, pks):
+        """
+        Delete records of a model, with the ones depending on them (e.g. job log
+        entries) as the ORM cascade is bypassed.
+        """
+        for relation in model._meta.related_objects:
+            if relation.one_to_many and relation.on_delete is models.CASCADE:
+                related = relation.related_model.objects.filter(
+                    **{f"{relation.field.name}__in": pks}
+                ).values_list("pk", flat=True)
+                if related_pks := list(related):
+                    self.delete_records(relation.related_model, related_pks)
+        model.objects.filter(pk__in=pks)._raw_delete(using=DEFAULT_DB_ALIAS)
+
+    def delete_in_batches(self, queryset, ordering):
+        """
+        Delete records matched by the queryset, oldest first, with several short
+        queries instead of a single long one to avoid locking the table for the
+        whole deletion.
+        """
+        while pks := list(
+            queryset.order_by(ordering).values_list("pk", flat=True)[
+                : self.delete_batch_size
+            ]
+        ):
+            self.delete_records(queryset.model, pks)
+
     def handle(self, *args, **options):
         # Clear expired authentication sessions (replicate `clearsessions` command)
         if options["verbosity"]:
@@ -54,9 +85,10 @@ class Command(BaseCommand):
                         ending="",
                     )
                     self.stdout.flush()
-                ObjectChange.objects.filter(time__lt=cutoff)._raw_delete(
-                    using=DEFAULT_DB_ALIAS
+                self.delete_in_batches(
+                    ObjectChange.objects.filter(time__lt=cutoff), "time"
                 )
+                invalidate_models(ObjectChange)
                 if options["verbosity"]:
                     self.stdout.write("Done.", self.style.SUCCESS)
             elif options["verbosity"]:
@@ -85,9 +117,10 @@ class Command(BaseCommand):
                         ending="",
                     )
                     self.stdout.flush()
-                Job.objects.filter(created__lt=cutoff)._raw_delete(
-                    using=DEFAULT_DB_ALIAS
+                self.delete_in_batches(
+                    Job.objects.filter(created__lt=cutoff), "created"
                 )
+                invalidate_models(Job)
                 if options["verbosity"]:
                     self.stdout.write("Done.", self.style.SUCCESS)
             elif options["verbosity"]:
@@ -97,6 +130,32 @@ class Command(BaseCommand):
                 f"    Skipping: No retention period specified (JOB_RETENTION = {settings.JOB_RETENTION})"
             )
 
+        # Mark jobs which will never be over as errored, e.g. if a worker was killed
+        if options["verbosity"]:
+            self.stdout.write("[*] Checking for interrupted jobs")
+        interrupted = Job.reconcile(cutoff=timezone.now() - timedelta(hours=1))
+        if options["verbosity"]:
+            if interrupted:
+                self.stdout.write(
+                    f"    Marked {interrupted} interrupted job{pluralize(interrupted)} as errored.",
+                    self.style.WARNING,
+                )
+            else:
+                self.stdout.write("    No interrupted jobs found.", self.style.SUCCESS)
+
+        # Delete data blobs of files which have been changed or deleted
+        if options["verbosity"]:
+            self.stdout.write("[*] Checking for unused data blobs")
+        deleted = DataBlob.delete_unused()
+        if options["verbosity"]:
+            if deleted:
+                self.stdout.write(
+                    f"    Deleted {deleted} unused blob{pluralize(deleted)}.",
+                    self.style.SUCCESS,
+                )
+            else:
+                self.stdout.write("    No unused blobs found.", self.style.SUCCESS)
+
         # Check for new releases (if enabled)
         if options["verbosity"]:
             self.stdout.write("[*] Checking for latest release")
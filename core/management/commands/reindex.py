@@ -0,0 +1,72 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import CachedValue
+from peering_manager.registry import SEARCH_KEY, registry
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search cache of objects."
+
+    # Number of objects cached at once
+    batch_size = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help="Models to index, as app_label or app_label.model_name (all by default)",
+        )
+        parser.add_argument(
+            "--lazy",
+            action="store_true",
+            help="Only index models without any cached value",
+        )
+
+    def get_models(self, labels):
+        models = [apps.get_model(label) for label in registry[SEARCH_KEY]]
+        if not labels:
+            return models
+
+        selected = []
+        for label in labels:
+            app_label, _, model_name = label.lower().partition(".")
+            matching = [
+                m
+                for m in models
+                if m._meta.app_label == app_label
+                and model_name in ("", m._meta.model_name)
+            ]
+            if not matching:
+                raise CommandError(f"'{label}' does not match any indexed model")
+            selected.extend(m for m in matching if m not in selected)
+        return selected
+
+    def handle(self, *args, **options):
+        for model in self.get_models(options["models"]):
+            object_type = ContentType.objects.get_for_model(model)
+            cached = CachedValue.objects.filter(object_type=object_type)
+            if options["lazy"] and cached.exists():
+                continue
+
+            if options["verbosity"]:
+                self.stdout.write(f"[*] Indexing {model._meta.verbose_name_plural}")
+
+            cached._raw_delete(cached.db)
+            count = 0
+            batch = []
+            for instance in model.objects.iterator(chunk_size=self.batch_size):
+                batch.append(instance)
+                if len(batch) == self.batch_size:
+                    CachedValue.cache_objects(batch)
+                    count += len(batch)
+                    batch = []
+            CachedValue.cache_objects(batch)
+            count += len(batch)
+
+            if options["verbosity"]:
+                self.stdout.write(f"    {count} objects indexed.", self.style.SUCCESS)
+
+        if options["verbosity"]:
+            self.stdout.write("Finished.", self.style.SUCCESS)
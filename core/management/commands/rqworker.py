@@ -1,14 +1,101 @@
+import multiprocessing
+import os
+import signal
+
 from django.conf import settings
+from django.core.management.base import CommandError
+from django_rq import get_queue
 from django_rq.management.commands.rqworker import Command as BuiltinCommand
+from django_rq.workers import get_worker_class
+from rq.worker_pool import WorkerPool
 
 
 class Command(BuiltinCommand):
     """
     Subclass django_rq's built-in rqworker to listen on all configured queues if none
     are specified (instead of only the 'default' queue).
+
+    With `--pool`, pools of workers dedicated to given queues are started instead.
     """
 
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--pool",
+            help=(
+                "Start pools of workers dedicated to queues, given as comma separated "
+                "queue=count pairs (e.g. interactive=4,polling=2,sync=1)."
+            ),
+        )
+
+    def parse_pools(self, value):
+        pools = {}
+        for item in value.split(","):
+            queue, _, count = item.strip().partition("=")
+            if queue not in settings.RQ_QUEUES:
+                raise CommandError(f"'{queue}' is not a configured queue")
+            try:
+                pools[queue] = int(count or 1)
+            except ValueError as e:
+                raise CommandError(f"'{count}' is not a valid number of workers") from e
+            if pools[queue] < 1:
+                raise CommandError(f"'{count}' is not a valid number of workers")
+        return pools
+
+    def start_pool(self, queue, count, burst, logging_level, worker_class):
+        queue = get_queue(queue)
+        WorkerPool(
+            queues=[queue],
+            connection=queue.connection,
+            num_workers=count,
+            worker_class=get_worker_class(worker_class),
+        ).start(burst=burst, logging_level=logging_level)
+
+    def start_pools(self, pools, burst=False, verbosity=1, worker_class=None):
+        """
+        Run a pool of workers per queue, each in its own process, so that long jobs
+        in a queue never delay jobs of other queues.
+        """
+        if verbosity >= 2:
+            logging_level = "DEBUG"
+        elif verbosity == 0:
+            logging_level = "WARNING"
+        else:
+            logging_level = "INFO"
+
+        processes = [
+            multiprocessing.Process(
+                target=self.start_pool,
+                args=(queue, count, burst, logging_level, worker_class),
+                name=f"rqworker-{queue}",
+            )
+            for queue, count in pools.items()
+        ]
+        for process in processes:
+            process.start()
+
+        # Let pools stop their workers gracefully
+        def stop(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    os.kill(process.pid, signum)
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        for process in processes:
+            process.join()
+
     def handle(self, *args, **options):
+        if options["pool"]:
+            self.start_pools(
+                self.parse_pools(options["pool"]),
+                burst=options["burst"],
+                verbosity=options["verbosity"],
+                worker_class=options["worker_class"],
+            )
+            return
+
         if len(args) < 1:
             args = settings.RQ_QUEUES
 
@@ -0,0 +1,59 @@
+import logging
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...models import ScheduledTask
+
+
+class Command(BaseCommand):
+    help = "Run scheduled tasks when they are due, in background workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=30,
+            help="Number of seconds between checks for due tasks (default: 30).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Check for due tasks once and exit.",
+        )
+
+    def setup_logging(self, verbosity):
+        logging_handler = logging.StreamHandler(self.stdout)
+        logging_handler.setFormatter(
+            logging.Formatter(
+                fmt="%(asctime)s | %(levelname)s | %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            )
+        )
+        logger = logging.getLogger("peering.manager.core.scheduler")
+        logger.addHandler(logging_handler)
+        logger.setLevel(logging.WARNING if verbosity == 0 else logging.INFO)
+
+    def handle(self, *args, **options):
+        self.setup_logging(options["verbosity"])
+
+        if options["once"]:
+            ScheduledTask.run_due_tasks()
+            return
+
+        self.running = True
+
+        def stop(signum, frame):
+            self.running = False
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        while self.running:
+            ScheduledTask.run_due_tasks()
+            # Sleep by small steps to exit quickly when asked to
+            for _ in range(options["interval"]):
+                if not self.running:
+                    break
+                time.sleep(1)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2025-08-09 14:27
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build indexes without locking writes to a possibly large table
+    atomic = False
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0005_move_objectchange"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="objectchange",
+            index=models.Index(
+                fields=["changed_object_type", "changed_object_id", "time"],
+                name="core_object_changed_913c84_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="objectchange",
+            index=models.Index(
+                fields=["related_object_type", "related_object_id", "time"],
+                name="core_object_related_752cf8_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="objectchange",
+            index=models.Index(
+                fields=["request_id", "changed_object_type"],
+                name="core_object_request_3d389d_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="objectchange",
+            index=models.Index(
+                fields=["user", "time"], name="core_object_user_id_582d48_idx"
+            ),
+        ),
+    ]
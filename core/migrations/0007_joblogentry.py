@@ -0,0 +1,79 @@
+# Generated by Django 5.2.4 on 2025-08-24 10:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def move_job_logs(apps, schema_editor):
+    """
+    Move log messages stored in the `data` field of jobs to their own table, only
+    keeping the counters in the jobs.
+    """
+    Job = apps.get_model("core", "Job")
+    JobLogEntry = apps.get_model("core", "JobLogEntry")
+
+    for job in Job.objects.exclude(data__isnull=True).iterator(chunk_size=100):
+        entries = []
+        for grouping, values in job.data.items():
+            if not isinstance(values, dict):
+                continue
+            for time, level, object, url, message in values.pop("log", []):
+                entries.append(
+                    JobLogEntry(
+                        job=job,
+                        time=time,
+                        grouping=grouping,
+                        level=level,
+                        object_repr=(object or "")[:200],
+                        object_url=url or "",
+                        message=message,
+                    )
+                )
+        JobLogEntry.objects.bulk_create(entries)
+        job.save(update_fields=["data"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [("core", "0006_objectchange_indexes")]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobLogEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False
+                    ),
+                ),
+                ("time", models.DateTimeField(default=django.utils.timezone.now)),
+                ("grouping", models.CharField(default="main", max_length=100)),
+                ("level", models.CharField(default="default", max_length=30)),
+                ("object_repr", models.CharField(blank=True, max_length=200)),
+                ("object_url", models.CharField(blank=True, max_length=200)),
+                ("message", models.TextField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="log_entries",
+                        to="core.job",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "job log entry",
+                "verbose_name_plural": "job log entries",
+                "ordering": ["job", "pk"],
+                "indexes": [
+                    models.Index(
+                        fields=["job", "id"], name="core_joblog_job_id_8548a3_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            code=move_job_logs, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2025-08-26 19:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("core", "0007_joblogentry")]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="children",
+                to="core.job",
+            ),
+        ),
+    ]
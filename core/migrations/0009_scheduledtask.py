@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2025-08-30 16:41
+
+import django.core.validators
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("core", "0008_job_parent")]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduledTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("command", models.CharField(max_length=50)),
+                ("arguments", models.CharField(blank=True, max_length=200)),
+                ("enabled", models.BooleanField(default=True)),
+                (
+                    "start",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "interval",
+                    models.PositiveIntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)]
+                    ),
+                ),
+                ("jitter", models.PositiveIntegerField(default=0)),
+                (
+                    "missed_run_policy",
+                    models.CharField(default="run", max_length=30),
+                ),
+                (
+                    "next_run",
+                    models.DateTimeField(blank=True, editable=False, null=True),
+                ),
+                (
+                    "last_run",
+                    models.DateTimeField(blank=True, editable=False, null=True),
+                ),
+            ],
+            options={"ordering": ["name"]},
+        ),
+    ]
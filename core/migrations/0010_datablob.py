@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2025-08-31 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def move_datafile_data(apps, schema_editor):
+    """
+    Store the content of data files in blobs, once per distinct hash.
+    """
+    DataBlob = apps.get_model("core", "DataBlob")
+    DataFile = apps.get_model("core", "DataFile")
+
+    seen = set()
+    blobs = []
+    for hash, data in (
+        DataFile.objects.order_by().values_list("hash", "data").iterator(chunk_size=100)
+    ):
+        if hash in seen:
+            continue
+        seen.add(hash)
+        blobs.append(DataBlob(hash=hash, data=data))
+        if len(blobs) >= 100:
+            DataBlob.objects.bulk_create(blobs, ignore_conflicts=True)
+            blobs = []
+    DataBlob.objects.bulk_create(blobs, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [("core", "0009_scheduledtask")]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataBlob",
+            fields=[
+                (
+                    "hash",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.BinaryField()),
+                (
+                    "last_used",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+        migrations.RunPython(
+            code=move_datafile_data, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RemoveField(model_name="datafile", name="data"),
+    ]
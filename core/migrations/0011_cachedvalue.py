@@ -0,0 +1,64 @@
+# Generated by Django 5.2.4 on 2025-09-02 08:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Trigram index making `icontains` lookups on values fast, only created if the
+# pg_trgm extension is available and can be installed (it is not required)
+CREATE_TRIGRAM_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS core_cachedvalue_value_trgm
+            ON core_cachedvalue USING gin (UPPER("value") gin_trgm_ops);
+    END IF;
+EXCEPTION WHEN insufficient_privilege THEN
+    RAISE NOTICE 'pg_trgm cannot be installed, search values are not indexed';
+END
+$$;
+"""
+DROP_TRIGRAM_INDEX = "DROP INDEX IF EXISTS core_cachedvalue_value_trgm;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0010_datablob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CachedValue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("field", models.CharField(max_length=200)),
+                ("value", models.TextField()),
+                ("weight", models.PositiveSmallIntegerField(default=1000)),
+                (
+                    "object_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["weight", "object_type", "object_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["object_type", "object_id"],
+                        name="core_cached_object__9d4a92_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGRAM_INDEX, reverse_sql=DROP_TRIGRAM_INDEX),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2025-09-03 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0011_cachedvalue"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="objectchange",
+            name="time",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -1,3 +1,5 @@
 from .change_logging import *
 from .data import *
 from .jobs import *
+from .schedules import *
+from .search import *
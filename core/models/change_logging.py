@@ -7,6 +7,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 
 from ..enums import ObjectChangeAction
@@ -22,7 +23,8 @@ class ObjectChange(models.Model):
     Records a change done to an object and the user who did it.
     """
 
-    time = models.DateTimeField(auto_now_add=True, editable=False, db_index=True)
+    # Set when the change is made, records being written later on
+    time = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     user = models.ForeignKey(
         to=User,
         on_delete=models.SET_NULL,
@@ -57,6 +59,12 @@ class ObjectChange(models.Model):
 
     class Meta:
         ordering = ["-time"]
+        indexes = [
+            models.Index(fields=["changed_object_type", "changed_object_id", "time"]),
+            models.Index(fields=["related_object_type", "related_object_id", "time"]),
+            models.Index(fields=["request_id", "changed_object_type"]),
+            models.Index(fields=["user", "time"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.changed_object_type} {self.object_repr} {self.get_action_display().lower()} by {self.user_name}"
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import logging
 import os
+import shutil
+from datetime import timedelta
 from fnmatch import fnmatchcase
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
 import yaml
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
@@ -31,7 +37,7 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("peering.manager.core.data")
 
-__all__ = ("AutoSynchronisationRecord", "DataFile", "DataSource")
+__all__ = ("AutoSynchronisationRecord", "DataBlob", "DataFile", "DataSource")
 
 
 class DataSource(PrimaryModel, JobsMixin):
@@ -110,6 +116,13 @@ class DataSource(PrimaryModel, JobsMixin):
         logger.debug(f"found {len(paths)} files")
         return paths
 
+    def delete(self, *args, **kwargs):
+        cache_path = self.cache_path
+        result = super().delete(*args, **kwargs)
+        if cache_path:
+            shutil.rmtree(cache_path, ignore_errors=True)
+        return result
+
     def clean(self) -> None:
         super().clean()
 
@@ -172,9 +185,17 @@ class DataSource(PrimaryModel, JobsMixin):
             user=request.user,
         )
 
+    @property
+    def cache_path(self):
+        if not settings.DATA_SOURCE_CACHE_PATH or not self.pk:
+            return None
+        return str(Path(settings.DATA_SOURCE_CACHE_PATH, str(self.pk)))
+
     def get_backend(self):
         parameters = self.parameters or {}
-        return self.backend_class(self.source_url, **parameters)
+        return self.backend_class(
+            self.source_url, cache_path=self.cache_path, **parameters
+        )
 
     def synchronise(self):
         """
@@ -213,11 +234,18 @@ class DataSource(PrimaryModel, JobsMixin):
             known_paths = {df.path for df in data_files}
             logger.debug(f"source has already {len(known_paths)} files")
 
+            # Only read files changed since the last synchronisation, if known
+            changes = backend.changes
+            if changes is not None:
+                logger.debug(f"{len(changes)} paths changed since last sync")
+
             changed_files = []
             deleted_file_ids = []
 
             # Update files and detect deleted ones
             for data_file in data_files:
+                if changes is not None and data_file.path not in changes:
+                    continue
                 try:
                     if data_file.refresh_from_disk(source_root=local_path):
                         changed_files.append(data_file)
@@ -227,7 +255,7 @@ class DataSource(PrimaryModel, JobsMixin):
 
             # Update changed files
             changed_count = DataFile.objects.bulk_update(
-                changed_files, ("updated", "size", "hash", "data")
+                changed_files, ("updated", "size", "hash")
             )
             logger.debug(f"changed {changed_count} files")
             # Delete files marked for deletion
@@ -258,6 +286,16 @@ class DataSource(PrimaryModel, JobsMixin):
         """
         Push a file to a data source given its file path and content.
         """
+        return self.push_files({file_path: content})
+
+    def push_files(self, files: dict[str, str]) -> list[str]:
+        """
+        Push files to a data source, given as a dict of their contents by path, in
+        a single commit.
+
+        Files with a content identical to the known one are not pushed again. Return
+        the paths of the files pushed.
+        """
         if not self.enabled:
             raise SynchronisationError("Data source if disabled, push aborted.")
         if self.status == DataSourceStatus.SYNCHRONISING:
@@ -269,6 +307,18 @@ class DataSource(PrimaryModel, JobsMixin):
                 "Pushing already in progress, not starting a new one."
             )
 
+        data_files = {df.path: df for df in self.datafiles.filter(path__in=files)}
+        contents = {}
+        for file_path, content in files.items():
+            data = content.encode()
+            data_file = data_files.get(file_path)
+            if data_file and data_file.hash == hashlib.sha256(data).hexdigest():
+                logger.debug(f"{file_path} is unchanged, skipping it")
+                continue
+            contents[file_path] = data
+        if not contents:
+            return []
+
         self.status = DataSourceStatus.PUSHING
         self.save()
 
@@ -279,27 +329,34 @@ class DataSource(PrimaryModel, JobsMixin):
                 f"Unable to initialise the backend. A dependency needs to be installed: {e}"
             ) from e
 
-        with backend.push(file_path) as local_path:
-            logger.debug(f"pushing {file_path} to {local_path}")
-
-            try:
-                data_file = self.datafiles.get(path=file_path)
-            except DataFile.DoesNotExist:
-                logger.debug(f"creating new file {file_path} to {local_path}")
-                data_file = DataFile(source=self, path=file_path)
-
-            data_file.data = content.encode()
-            data_file.updated = timezone.now()
-            data_file.write_to_disk(source_root=local_path, overwrite=True)
-            data_file.refresh_from_disk(source_root=local_path)
-            data_file.save()
-
-            logger.debug(f"{file_path} written to {local_path}")
+        try:
+            with backend.push(*contents) as local_path:
+                for file_path, data in contents.items():
+                    logger.debug(f"pushing {file_path} to {local_path}")
+
+                    data_file = data_files.get(file_path)
+                    if not data_file:
+                        logger.debug(f"creating new file {file_path} to {local_path}")
+                        data_file = DataFile(source=self, path=file_path)
+
+                    data_file.data = data
+                    data_file.updated = timezone.now()
+                    data_file.write_to_disk(source_root=local_path, overwrite=True)
+                    data_file.refresh_from_disk(source_root=local_path)
+                    data_file.save()
+
+                    logger.debug(f"{file_path} written to {local_path}")
+        except Exception:
+            self.status = DataSourceStatus.FAILED
+            self.save()
+            raise
 
         self.status = DataSourceStatus.COMPLETED
         self.last_synchronised = timezone.now()
         self.save()
 
+        return list(contents)
+
 
 class DataFile(models.Model):
     """
@@ -332,7 +389,6 @@ class DataFile(models.Model):
         ],
         help_text="SHA256 hash of the file data",
     )
-    data = models.BinaryField()
 
     class Meta:
         ordering = ["source", "path"]
@@ -349,6 +405,19 @@ class DataFile(models.Model):
     def get_absolute_url(self) -> str:
         return reverse("core:datafile", args=[self.pk])
 
+    @property
+    def data(self) -> bytes | None:
+        """
+        Content of the file, loaded from its `DataBlob` on first access.
+        """
+        if "_data" not in self.__dict__:
+            self._data = DataBlob.get_data(self.hash)
+        return self._data
+
+    @data.setter
+    def data(self, value: bytes | None) -> None:
+        self._data = value
+
     @property
     def data_as_string(self) -> str | None:
         if not self.data:
@@ -362,13 +431,22 @@ class DataFile(models.Model):
     def get_data(self) -> Any:
         """
         Return a native Python object from either YAML or JSON.
+
+        Parsed data is cached by hash, a copy being returned so that it can be
+        safely modified.
         """
-        return yaml.safe_load(self.data_as_string)
+        if "_data" in self.__dict__:
+            # Content not stored in a blob yet
+            return yaml.safe_load(self.data_as_string)
+        return copy.deepcopy(_parse_blob(self.hash))
 
     def refresh_from_disk(self, source_root) -> bool:
         """
         Update attributes of an instance based on the file on disk. If any attribute
         has changed, this function will return `True`.
+
+        The content of a changed file is stored in a `DataBlob`, only if no other
+        file has the same content, and is not kept in the instance.
         """
         file_path = Path(source_root) / self.path
         file_hash = sha256_hash(file_path).hexdigest()
@@ -378,7 +456,14 @@ class DataFile(models.Model):
             self.updated = timezone.now()
             self.size = file_path.stat().st_size
             self.hash = file_hash
-            self.data = file_path.read_bytes()
+            if not DataBlob.objects.filter(hash=file_hash).update(
+                last_used=timezone.now()
+            ):
+                DataBlob.objects.bulk_create(
+                    [DataBlob(hash=file_hash, data=file_path.read_bytes())],
+                    ignore_conflicts=True,
+                )
+        self.__dict__.pop("_data", None)
 
         return has_changed
 
@@ -395,6 +480,45 @@ class DataFile(models.Model):
         file_path.write_bytes(self.data)
 
 
+class DataBlob(models.Model):
+    """
+    The content of `DataFile`s, stored once for all files with the same content and
+    identified by its SHA256 hash.
+    """
+
+    hash = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    last_used = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return self.hash
+
+    @classmethod
+    def get_data(cls, hash) -> bytes | None:
+        data = cls.objects.filter(hash=hash).values_list("data", flat=True).first()
+        return bytes(data) if data is not None else None
+
+    @classmethod
+    def delete_unused(cls, age=timedelta(days=1)) -> int:
+        """
+        Delete blobs not used by any `DataFile` anymore and return their number.
+
+        Blobs are only deleted some time after their last use, as a synchronisation
+        in progress may store them before saving their files.
+        """
+        deleted, _ = (
+            cls.objects.filter(last_used__lt=timezone.now() - age)
+            .exclude(hash__in=DataFile.objects.values("hash"))
+            .delete()
+        )
+        return deleted
+
+
+@lru_cache(maxsize=256)
+def _parse_blob(hash) -> Any:
+    return yaml.safe_load(DataFile(hash=hash).data_as_string)
+
+
 class AutoSynchronisationRecord(models.Model):
     """
     Map a `DataFile` to a synchronised object to update it automatically.
@@ -4,17 +4,23 @@ import logging
 import uuid
 from collections import OrderedDict
 
+import django_rq
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils import timezone
+from rq.command import send_stop_job_command
+from rq.exceptions import InvalidJobOperation, NoSuchJobError
+from rq.job import Dependency
+from rq.job import Job as RQJob
 
 from ..enums import JobStatus, LogLevel
 
-__all__ = ("Job",)
+__all__ = ("Job", "JobLogEntry")
 
 
 class Job(models.Model):
@@ -46,6 +52,14 @@ class Job(models.Model):
     )
     data = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
     job_id = models.UUIDField(unique=True)
+    parent = models.ForeignKey(
+        to="self",
+        on_delete=models.CASCADE,
+        related_name="children",
+        blank=True,
+        null=True,
+        help_text="The job grouping this one with others",
+    )
 
     class Meta:
         ordering = ["-created"]
@@ -53,6 +67,17 @@ class Job(models.Model):
     def __str__(self) -> str:
         return str(self.job_id)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # Write log entries recorded since the last save, all at once
+        pending = self.__dict__.pop("_pending_log_entries", None)
+        if pending:
+            JobLogEntry.objects.bulk_create(pending)
+
+        if self.__dict__.pop("_over", False) and self.parent_id:
+            self._report_to_parent()
+
     def get_absolute_url(self) -> str:
         return reverse("core:job", args=[self.pk])
 
@@ -76,22 +101,124 @@ class Job(models.Model):
 
         return job
 
+    @classmethod
+    def enqueue_group(
+        cls,
+        func,
+        objects,
+        *args,
+        name="",
+        object_model=None,
+        user=None,
+        concurrency=None,
+        **kwargs,
+    ) -> Job:
+        """
+        Creates a Job instance grouping one child job per object, each of them being
+        enqueued using the given callable with the object as first argument.
+
+        At most `concurrency` child jobs are run at the same time, defaulting to the
+        value of `JOB_CONCURRENCY` for the job name. The limit applies to the
+        children of this group only, jobs of other groups with the same name are
+        not accounted for. The parent job is over once all its children are.
+        """
+        if object_model is None:
+            object_model = objects.model
+        if concurrency is None:
+            concurrency = settings.JOB_CONCURRENCY.get(name)
+        objects = list(objects)
+
+        object_type = ContentType.objects.get_for_model(
+            object_model, for_concrete_model=False
+        )
+        parent = cls.objects.create(
+            name=name, object_type=object_type, user=user, job_id=uuid.uuid4()
+        )
+        if not objects:
+            parent.mark_completed("No jobs to run.")
+            return parent
+
+        children = cls.objects.bulk_create(
+            [
+                cls(
+                    name=name,
+                    object_type=object_type,
+                    object_id=object.pk,
+                    user=user,
+                    job_id=uuid.uuid4(),
+                    parent=parent,
+                )
+                for object in objects
+            ]
+        )
+        parent.mark_running(f"Running {len(children)} jobs.")
+
+        for i, (child, object) in enumerate(zip(children, objects, strict=True)):
+            # Children are run in `concurrency` sequences, waiting for the previous
+            # job of their sequence to be over, whatever its result
+            depends_on = None
+            if concurrency and i >= concurrency:
+                depends_on = Dependency(
+                    jobs=[str(children[i - concurrency].job_id)], allow_failure=True
+                )
+            func.delay(
+                object,
+                *args,
+                job_id=str(child.job_id),
+                depends_on=depends_on,
+                job=child,
+                **kwargs,
+            )
+
+        return parent
+
+    @classmethod
+    def reconcile(cls, cutoff=None) -> int:
+        """
+        Marks as errored unfinished jobs which will never be over: jobs whose worker
+        was killed before they could report their result, or which are not known
+        to the queue anymore. Their parents are then updated as usual.
+
+        Only jobs created before `cutoff` are checked, if given, to leave time for
+        new jobs to be queued. Returns the number of jobs marked as errored.
+        """
+        # Parent jobs are not queued, they are over with their children
+        jobs = cls.objects.exclude(status__in=JobStatus.TERMINAL_STATE_CHOICES).filter(
+            children__isnull=True
+        )
+        if cutoff:
+            jobs = jobs.filter(created__lt=cutoff)
+
+        connection = django_rq.get_connection("default")
+        count = 0
+        for job in jobs:
+            try:
+                rq_job = RQJob.fetch(str(job.job_id), connection=connection)
+            except NoSuchJobError:
+                message = "Job not found in queue."
+            else:
+                if rq_job.get_status() not in ("failed", "stopped", "canceled"):
+                    continue
+                message = f"Job {rq_job.get_status()} without reporting its result."
+            job.mark_errored(message)
+            count += 1
+
+        return count
+
     @staticmethod
     def _data_grouping_struct():
         return OrderedDict(
-            [("success", 0), ("info", 0), ("warning", 0), ("failure", 0), ("log", [])]
+            [("success", 0), ("info", 0), ("warning", 0), ("failure", 0)]
         )
 
     @property
     def output(self) -> str:
-        if not self.data or "output" not in self.data or not self.data["output"]:
+        if not self.data or "output" not in self.data:
             return ""
 
-        lines = []
-        for line in self.data["output"]["log"]:
-            lines.append(line[-1])
-
-        return "\n".join(lines)
+        return "\n".join(
+            self.log_entries.filter(grouping="output").values_list("message", flat=True)
+        )
 
     @property
     def duration(self) -> str:
@@ -109,7 +236,7 @@ class Job(models.Model):
 
     @property
     def is_over(self) -> bool:
-        return self.status in [JobStatus.COMPLETED, JobStatus.ERRORED, JobStatus.FAILED]
+        return self.status in JobStatus.TERMINAL_STATE_CHOICES
 
     def get_status_colour(self):
         return JobStatus.colours.get(self.status)
@@ -122,8 +249,87 @@ class Job(models.Model):
         self.status = status
         if status == JobStatus.RUNNING:
             self.started = timezone.now()
-        if status in [JobStatus.COMPLETED, JobStatus.ERRORED, JobStatus.FAILED]:
+        if status in JobStatus.TERMINAL_STATE_CHOICES:
             self.completed = timezone.now()
+            self._over = True
+
+    def _report_to_parent(self):
+        """
+        Records the result of this job in its parent, marking the parent as over
+        once all its children are.
+        """
+        with transaction.atomic():
+            # Children can end at the same time, lock the parent to count them
+            parent = Job.objects.select_for_update().get(pk=self.parent_id)
+            if parent.is_over:
+                return
+
+            if self.status == JobStatus.COMPLETED:
+                level_choice = LogLevel.SUCCESS
+            elif self.status == JobStatus.CANCELLED:
+                level_choice = LogLevel.WARNING
+            else:
+                level_choice = LogLevel.FAILURE
+            parent.log(
+                f"{self.object or self.object_type}: {self.get_status_display().lower()}.",
+                object=self,
+                level_choice=level_choice,
+                grouping="children",
+                save=False,
+            )
+
+            if parent.children.exclude(
+                status__in=JobStatus.TERMINAL_STATE_CHOICES
+            ).exists():
+                parent.save()
+            elif failures := parent.data["children"].get(LogLevel.FAILURE):
+                parent.mark_failed(f"{failures} jobs did not complete.")
+            else:
+                parent.mark_completed("All jobs completed.")
+
+    def cancel(self, user=None):
+        """
+        Cancels the job, if it is not over yet, as well as all its children.
+
+        Jobs waiting in a queue are removed from it, running ones are stopped.
+        """
+        if self.is_over:
+            return
+
+        jobs = [self]
+        children = list(
+            self.children.exclude(status__in=JobStatus.TERMINAL_STATE_CHOICES)
+        )
+        jobs.extend(children)
+
+        connection = django_rq.get_connection("default")
+        for job in jobs:
+            try:
+                rq_job = RQJob.fetch(str(job.job_id), connection=connection)
+            except NoSuchJobError:
+                continue
+            try:
+                if rq_job.get_status() == "started":
+                    send_stop_job_command(connection, rq_job.id)
+                else:
+                    rq_job.cancel()
+            except InvalidJobOperation:
+                # Job ended in the meantime
+                continue
+
+        # Children are updated all at once, without reporting to the parent which
+        # is cancelled with them
+        message = f"Job cancelled by {user}." if user else "Job cancelled."
+        for child in children:
+            child.set_status(JobStatus.CANCELLED)
+            child.log(message, level_choice=LogLevel.WARNING, save=False)
+        Job.objects.bulk_update(children, ["status", "completed", "data"])
+        JobLogEntry.objects.bulk_create(
+            [e for c in children for e in c.__dict__.pop("_pending_log_entries")]
+        )
+
+        self.set_status(JobStatus.CANCELLED)
+        self.log_warning(message)
 
     def log(
         self,
@@ -135,7 +341,11 @@ class Job(models.Model):
         save=True,
     ):
         """
-        Stores log messages in job's `data` field.
+        Records a log message as a new entry of the job's log, only counters of
+        messages per level are kept in the job's `data` field.
+
+        Entries are written when the job is saved, so that the log is only ever
+        appended to.
         """
         if level_choice not in LogLevel.values():
             raise Exception(f"Unknown logging level: {level_choice}")
@@ -145,24 +355,22 @@ class Job(models.Model):
 
         data = self.data
         data.setdefault(grouping, self._data_grouping_struct())
-        # Just in case it got initialized by something else:
-        if "log" not in data[grouping]:
-            data[grouping]["log"] = []
-        log = data[grouping]["log"]
 
         # Record the log message
-        log.append(
-            [
-                timezone.now().isoformat(),
-                level_choice,
-                str(object) if object else None,
-                (
+        self.__dict__.setdefault("_pending_log_entries", []).append(
+            JobLogEntry(
+                job=self,
+                time=timezone.now(),
+                grouping=grouping,
+                level=level_choice,
+                object_repr=str(object)[:200] if object else "",
+                object_url=(
                     object.get_absolute_url()
                     if hasattr(object, "get_absolute_url")
-                    else None
+                    else ""
                 ),
-                str(message),
-            ]
+                message=str(message),
+            )
         )
 
         # Default log messages have no status and do not get counted
@@ -170,9 +378,7 @@ class Job(models.Model):
             # Update per-grouping and total results counters
             data[grouping].setdefault(level_choice, 0)
             data[grouping][level_choice] += 1
-            if "total" not in data:
-                data["total"] = self._data_grouping_struct()
-                del data["total"]["log"]
+            data.setdefault("total", self._data_grouping_struct())
             data["total"].setdefault(level_choice, 0)
             data["total"][level_choice] += 1
 
@@ -230,3 +436,29 @@ class Job(models.Model):
             grouping="output",
             save=False,
         )
+
+
+class JobLogEntry(models.Model):
+    """
+    A log message recorded by a job. Entries are only ever added to a job's log, so
+    they can be fetched incrementally while the job is running.
+    """
+
+    job = models.ForeignKey(
+        to=Job, on_delete=models.CASCADE, related_name="log_entries"
+    )
+    time = models.DateTimeField(default=timezone.now)
+    grouping = models.CharField(max_length=100, default="main")
+    level = models.CharField(max_length=30, choices=LogLevel, default=LogLevel.DEFAULT)
+    object_repr = models.CharField(max_length=200, blank=True)
+    object_url = models.CharField(max_length=200, blank=True)
+    message = models.TextField()
+
+    class Meta:
+        ordering = ["job", "pk"]
+        indexes = [models.Index(fields=["job", "id"])]
+        verbose_name = "job log entry"
+        verbose_name_plural = "job log entries"
+
+    def __str__(self) -> str:
+        return self.message
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import logging
+import random
+import shlex
+from datetime import timedelta
+
+from django.core.validators import MinValueValidator
+from django.db import models, transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from peering_manager.models import JobsMixin
+
+from ..constants import SCHEDULED_TASK_TIMEOUT
+from ..enums import JobStatus, MissedRunPolicy, ScheduledCommand
+from .jobs import Job
+
+logger = logging.getLogger("peering.manager.core.scheduler")
+
+__all__ = ("ScheduledTask",)
+
+
+class ScheduledTask(JobsMixin, models.Model):
+    """
+    A management command run periodically in a background worker, instead of
+    being started by cron.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    command = models.CharField(max_length=50, choices=ScheduledCommand)
+    arguments = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text="Arguments given to the command, as on the command line",
+    )
+    enabled = models.BooleanField(default=True)
+    start = models.DateTimeField(
+        default=timezone.now,
+        help_text="Time of the first run, following ones being every interval after it",
+    )
+    interval = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)], help_text="Number of minutes between runs"
+    )
+    jitter = models.PositiveIntegerField(
+        default=0,
+        help_text="Maximum number of seconds randomly added to the time of each run",
+    )
+    missed_run_policy = models.CharField(
+        max_length=30,
+        choices=MissedRunPolicy,
+        default=MissedRunPolicy.RUN,
+        help_text="What to do with a run late by more than the interval (e.g. when the scheduler was stopped)",
+    )
+    next_run = models.DateTimeField(blank=True, null=True, editable=False)
+    last_run = models.DateTimeField(blank=True, null=True, editable=False)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def save(self, *args, **kwargs):
+        # The schedule may have changed, unless the scheduler is updating it
+        if "update_fields" not in kwargs:
+            self.next_run = self.get_next_run(timezone.now())
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self) -> str:
+        return reverse("admin:core_scheduledtask_change", args=[self.pk])
+
+    def get_next_run(self, after):
+        """
+        Returns the time of the first run after the given time, with jitter.
+        """
+        next_run = self.start
+        if next_run <= after:
+            interval = timedelta(minutes=self.interval)
+            next_run += ((after - self.start) // interval + 1) * interval
+        if self.jitter:
+            next_run += timedelta(seconds=random.uniform(0, self.jitter))
+        return next_run
+
+    def is_running(self) -> bool:
+        """
+        Returns whether a job of a previous run is still pending or running, jobs
+        older than the timeout being considered as dead.
+        """
+        return (
+            self.jobs.exclude(status__in=JobStatus.TERMINAL_STATE_CHOICES)
+            .filter(
+                created__gte=timezone.now() - timedelta(seconds=SCHEDULED_TASK_TIMEOUT)
+            )
+            .exists()
+        )
+
+    def enqueue(self, user=None) -> Job:
+        return Job.enqueue(
+            import_string("core.jobs.run_command"),
+            self.command,
+            shlex.split(self.arguments),
+            name=f"core.scheduledtask.{self.command}",
+            object=self,
+            user=user,
+        )
+
+    @classmethod
+    def run_due_tasks(cls, now=None) -> list[Job]:
+        """
+        Enqueues a job for each enabled task due to run and schedules their next
+        runs.
+
+        Due tasks are locked while processed, so that several schedulers never run a
+        task twice. A run is skipped if the previous one is not over, or, depending
+        on the task policy, if it is late by more than the interval.
+        """
+        now = now or timezone.now()
+
+        to_run = []
+        with transaction.atomic():
+            for task in cls.objects.select_for_update(skip_locked=True).filter(
+                enabled=True, next_run__lte=now
+            ):
+                if (
+                    task.missed_run_policy == MissedRunPolicy.SKIP
+                    and now - task.next_run >= timedelta(minutes=task.interval)
+                ):
+                    logger.info(f"skipping missed run of {task}")
+                elif task.is_running():
+                    logger.warning(f"skipping run of {task}, previous one not over")
+                else:
+                    to_run.append(task)
+                    task.last_run = now
+                task.next_run = task.get_next_run(now)
+                task.save(update_fields=["next_run", "last_run"])
+
+        # Enqueue once committed, jobs must not be started with tasks still locked
+        jobs = []
+        for task in to_run:
+            logger.info(f"running {task}")
+            jobs.append(task.enqueue())
+        return jobs
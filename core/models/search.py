@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+
+from peering_manager.search import get_indexer
+
+__all__ = ("CachedValue",)
+
+
+class CachedValue(models.Model):
+    """
+    A copy of a field value of an object, so that all object types can be searched
+    at once with a single query on one table.
+    """
+
+    object_type = models.ForeignKey(
+        to=ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    object_id = models.PositiveBigIntegerField()
+    object = GenericForeignKey(ct_field="object_type", fk_field="object_id")
+    field = models.CharField(max_length=200)
+    value = models.TextField()
+    weight = models.PositiveSmallIntegerField(default=1000)
+
+    class Meta:
+        ordering = ["weight", "object_type", "object_id"]
+        indexes = [models.Index(fields=["object_type", "object_id"])]
+
+    def __str__(self) -> str:
+        return f"{self.object_type} {self.object_id}: {self.field}"
+
+    @classmethod
+    def remove_objects(cls, model, pks) -> None:
+        """
+        Deletes the values cached for the objects of a model.
+        """
+        queryset = cls.objects.filter(
+            object_type=ContentType.objects.get_for_model(model), object_id__in=pks
+        )
+        # Values are not referenced by anything, skip the ORM cascade and signals
+        queryset._raw_delete(queryset.db)
+
+    @classmethod
+    def cache_objects(cls, instances) -> None:
+        """
+        Replaces the values cached for the objects by their current ones.
+        """
+        by_model = defaultdict(list)
+        for instance in instances:
+            by_model[type(instance)].append(instance)
+
+        with transaction.atomic():
+            for model, objects in by_model.items():
+                indexer = get_indexer(model)
+                if not indexer:
+                    continue
+
+                object_type = ContentType.objects.get_for_model(model)
+                cls.remove_objects(model, [o.pk for o in objects])
+                cls.objects.bulk_create(
+                    [
+                        cls(
+                            object_type=object_type,
+                            object_id=o.pk,
+                            field=field,
+                            value=value,
+                            weight=weight,
+                        )
+                        for o in objects
+                        for field, value, weight in indexer.to_cache(o)
+                    ],
+                    batch_size=1000,
+                )
+
+    @classmethod
+    def search(cls, value, object_types=None):
+        """
+        Returns (object type ID, object ID) pairs of the objects with a cached value
+        containing the given string, most relevant first.
+
+        Objects with a value equal to the string come first, then the ones with a
+        value starting with it, then others. Each group is ordered by the weight of
+        the best matching field.
+        """
+        queryset = cls.objects.filter(value__icontains=value)
+        if object_types is not None:
+            queryset = queryset.filter(object_type__in=object_types)
+
+        rank = models.Case(
+            models.When(value__iexact=value, then=models.Value(0)),
+            models.When(value__istartswith=value, then=models.Value(10000)),
+            default=models.Value(20000),
+        ) + models.F("weight")
+        return (
+            queryset.values_list("object_type", "object_id")
+            .annotate(rank=models.Min(rank))
+            .order_by("rank", "object_type", "object_id")
+            .values_list("object_type", "object_id")
+        )
@@ -1,13 +1,21 @@
-from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django_prometheus.models import model_deletes, model_inserts, model_updates
 
+from extras.signals import clear_webhooks
 from extras.webhooks import enqueue_object, get_snapshots, serialize_for_webhook
-from peering_manager.context import current_request, webhooks_queue
-
+from peering_manager.api.caching import invalidate_models
+from peering_manager.context import (
+    bulk_changed_objects,
+    current_request,
+    objectchanges_queue,
+    webhooks_queue,
+)
+from peering_manager.search import get_indexer
+from peering_manager.statistics import invalidate_statistics
+
+from .changelog import enqueue_change
 from .enums import ObjectChangeAction
-from .models import ObjectChange
 
 __all__ = ("post_synchronisation", "pre_synchronisation")
 
@@ -26,6 +34,14 @@ def is_same_object(instance, webhook_data, request_id):
     )
 
 
+def is_bulk_changed(instance):
+    """
+    Return True if the change made to the instance is recorded in a set-based way
+    by the `bulk_change_logging` context manager.
+    """
+    return (instance._meta.label_lower, instance.pk) in bulk_changed_objects.get()
+
+
 @receiver((post_save, m2m_changed))
 def handle_changed_object(sender, instance, **kwargs):
     """
@@ -33,8 +49,8 @@ def handle_changed_object(sender, instance, **kwargs):
     """
     m2m_changed = False
 
-    # Ignore object without the right method
-    if not hasattr(instance, "to_objectchange"):
+    # Ignore object without the right method or already logged
+    if not hasattr(instance, "to_objectchange") or is_bulk_changed(instance):
         return
 
     # Get the current request, or bail if not set
@@ -54,25 +70,20 @@ def handle_changed_object(sender, instance, **kwargs):
     else:
         return
 
+    if m2m_changed:
+        # Ensure that we're working with fresh M2M assignments
+        getattr(instance, "_prefetched_objects_cache", {}).clear()
+
+    # Queue the change, merged with the previous one of the object (if any)
     objectchange = instance.to_objectchange(action)
-    if m2m_changed and (
-        prev_change := ObjectChange.objects.filter(
-            changed_object_type=ContentType.objects.get_for_model(instance),
-            changed_object_id=instance.pk,
-            request_id=request.id,
-        ).first()
-    ):
-        prev_change.postchange_data = objectchange.postchange_data
-        prev_change.save()
-    elif objectchange.has_changes:
-        objectchange.user = request.user
-        objectchange.request_id = request.id
-        objectchange.save()
+    objectchange.user = request.user
+    objectchange.user_name = request.user.username
+    objectchange.request_id = request.id
+    enqueue_change(objectchanges_queue.get(), objectchange)
 
     # If this is an M2M change, update the previously queued webhook (from post_save)
     queue = webhooks_queue.get()
     if m2m_changed and queue and is_same_object(instance, queue[-1], request.id):
-        instance.refresh_from_db()  # Ensure that we're working with fresh M2M assignments
         queue[-1]["data"] = serialize_for_webhook(instance)
         queue[-1]["snapshots"]["postchange"] = get_snapshots(instance, action)[
             "postchange"
@@ -93,8 +104,8 @@ def handle_deleted_object(sender, instance, **kwargs):
     """
     Fires when an object is deleted.
     """
-    # Ignore object without the right method
-    if not hasattr(instance, "to_objectchange"):
+    # Ignore object without the right method or already logged
+    if not hasattr(instance, "to_objectchange") or is_bulk_changed(instance):
         return
 
     # Get the current request, or bail if not set
@@ -105,8 +116,9 @@ def handle_deleted_object(sender, instance, **kwargs):
     # Record an object change
     change = instance.to_objectchange(ObjectChangeAction.DELETE)
     change.user = request.user
+    change.user_name = request.user.username
     change.request_id = request.id
-    change.save()
+    enqueue_change(objectchanges_queue.get(), change)
 
     # Enqueue webhooks
     queue = webhooks_queue.get()
@@ -117,6 +129,70 @@ def handle_deleted_object(sender, instance, **kwargs):
     model_deletes.labels(instance._meta.model_name).inc()
 
 
+@receiver((post_save, m2m_changed, post_delete))
+def invalidate_api_cache(sender, instance, **kwargs):
+    """
+    Fires when an object is created, updated or deleted to make cached API responses
+    depending on it stale.
+    """
+    if kwargs.get("action", "post_").startswith("pre_"):
+        return
+
+    models = [instance._meta.model]
+    if kwargs.get("model") is not None:
+        # m2m_changed, objects on the other side of the relation are changed too
+        models.append(kwargs["model"])
+    invalidate_models(*models)
+
+
+@receiver((post_save, post_delete))
+def invalidate_statistics_cache(sender, instance, **kwargs):
+    """
+    Fires when an object is created or deleted to make cached statistics stale.
+    """
+    if kwargs.get("created") is False:
+        return
+    invalidate_statistics(sender)
+
+
+@receiver(post_save)
+def cache_searched_object(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Fires when an object is created or updated to refresh its values in the search
+    cache, unless none of the cached fields is saved.
+    """
+    indexer = get_indexer(sender)
+    if not indexer or raw:
+        return
+    if update_fields and not indexer.get_field_names() & set(update_fields):
+        return
+
+    from .models import CachedValue
+
+    CachedValue.cache_objects([instance])
+
+
+@receiver(post_delete)
+def uncache_searched_object(sender, instance, **kwargs):
+    """
+    Fires when an object is deleted to remove its values from the search cache.
+    """
+    if not get_indexer(sender):
+        return
+
+    from .models import CachedValue
+
+    CachedValue.remove_objects(sender, [instance.pk])
+
+
+@receiver(clear_webhooks)
+def clear_objectchanges_queue(sender, **kwargs):
+    """
+    Deletes any queued object changes (e.g. because of an aborted bulk transaction).
+    """
+    objectchanges_queue.set({})
+
+
 @receiver(post_synchronisation)
 def auto_synchronisation(instance, **kwargs):
     """
@@ -2,6 +2,7 @@ import django_tables2 as tables
 
 from peering_manager.registry import DATA_BACKENDS_KEY, registry
 from peering_manager.tables import PeeringManagerTable, columns
+from utils.functions import count_related
 
 from ..models import DataFile, DataSource
 
@@ -37,7 +38,10 @@ class DataSourceTable(PeeringManagerTable):
     status = columns.ChoiceFieldColumn()
     enabled = columns.BooleanColumn()
     tags = columns.TagColumn(url_name="core:datasource_list")
-    file_count = tables.Column(verbose_name="Files")
+    file_count = columns.Column(
+        annotations={"file_count": count_related(DataFile, "source")},
+        verbose_name="Files",
+    )
 
     class Meta(PeeringManagerTable.Meta):
         model = DataSource
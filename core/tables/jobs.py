@@ -15,6 +15,7 @@ class JobTable(BaseTable):
     started = columns.DateTimeColumn(linkify=True)
     completed = columns.DateTimeColumn(linkify=True)
     status = columns.ChoiceFieldColumn()
+    parent = tables.Column(linkify=True)
     data = tables.TemplateColumn(
         """
         <span class="badge text-bg-success">{{ value.total.success }}</span>
@@ -40,6 +41,7 @@ class JobTable(BaseTable):
             "completed",
             "user",
             "job_id",
+            "parent",
         )
         default_columns = (
             "pk",
@@ -7,6 +7,7 @@ from rest_framework import status
 
 from utils.testing import APITestCase, APIViewTestCases
 
+from ..enums import JobStatus
 from ..models import DataFile, DataSource, Job
 
 
@@ -118,3 +119,39 @@ class JobTest(APIViewTestCases.GetObjectView, APIViewTestCases.ListObjectsView):
             user=None,
             job_id=uuid.uuid4(),
         )
+
+    def test_log(self):
+        self.add_permissions("view")
+        job = Job.objects.get()
+        job.mark_running("Running.")
+        job.mark_completed("Completed.")
+        first_entry = job.log_entries.first()
+
+        url = reverse("core-api:job-log", kwargs={"pk": job.pk})
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(
+            ["Running.", "Completed."], [e["message"] for e in response.data["results"]]
+        )
+
+        response = self.client.get(f"{url}?after={first_entry.pk}", **self.header)
+        self.assertEqual(
+            ["Completed."], [e["message"] for e in response.data["results"]]
+        )
+        self.assertEqual("success", response.data["results"][0]["level"]["value"])
+
+        # Entries are paginated
+        response = self.client.get(f"{url}?limit=1", **self.header)
+        self.assertEqual(2, response.data["count"])
+        self.assertEqual(["Running."], [e["message"] for e in response.data["results"]])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_cancel(self):
+        job = Job.objects.get()
+        url = reverse("core-api:job-cancel", kwargs={"pk": job.pk})
+
+        response = self.client.post(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual("cancelled", response.data["status"]["value"])
+        job.refresh_from_db()
+        self.assertEqual(JobStatus.CANCELLED, job.status)
@@ -0,0 +1,158 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db.models.signals import pre_save
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from extras.models import Tag
+from peering.models import AutonomousSystem
+from utils.exceptions import AbortRequestError
+from utils.testing import APITestCase, TestCase
+
+from ..changelog import enqueue_change, flush_changes
+from ..enums import ObjectChangeAction
+from ..management.commands.housekeeping import Command
+from ..models import ObjectChange
+
+
+class ChangeLoggingTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Tag.objects.bulk_create(
+            (Tag(name="Foo", slug="foo"), Tag(name="Bar", slug="bar"))
+        )
+
+    def _get_changes(self):
+        return ObjectChange.objects.filter(
+            changed_object_type=ContentType.objects.get_for_model(AutonomousSystem)
+        ).order_by("time")
+
+    def test_create_with_tags(self):
+        data = {
+            "asn": 64500,
+            "name": "AS 1",
+            "tags": [{"name": "Foo"}, {"name": "Bar"}],
+        }
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.post(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Creation and tags assignment are merged in a single record
+        changes = self._get_changes()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].action, ObjectChangeAction.CREATE)
+        self.assertEqual(changes[0].changed_object_id, response.data["id"])
+        self.assertEqual(changes[0].user_name, self.user.username)
+        self.assertIsNone(changes[0].prechange_data)
+        self.assertEqual(sorted(changes[0].postchange_data["tags"]), ["Bar", "Foo"])
+
+    def test_update_without_changes(self):
+        asn = AutonomousSystem.objects.create(asn=64500, name="AS 1")
+
+        url = reverse("peering-api:autonomoussystem-detail", kwargs={"pk": asn.pk})
+        response = self.client.patch(
+            url, {"name": "AS 1"}, format="json", **self.header
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        # Nothing changed, nothing is logged
+        self.assertFalse(self._get_changes().exists())
+
+    def test_delete(self):
+        asn = AutonomousSystem.objects.create(asn=64500, name="AS 1")
+
+        url = reverse("peering-api:autonomoussystem-detail", kwargs={"pk": asn.pk})
+        response = self.client.delete(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_204_NO_CONTENT)
+
+        changes = self._get_changes()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].action, ObjectChangeAction.DELETE)
+        self.assertEqual(changes[0].changed_object_id, asn.pk)
+        self.assertEqual(changes[0].object_repr, str(asn))
+        self.assertEqual(changes[0].prechange_data["name"], "AS 1")
+
+    def test_time_of_change(self):
+        asn = AutonomousSystem.objects.create(asn=64500, name="AS 1")
+        queue = {}
+        asn.snapshot()
+        asn.name = "AS 2"
+        change = asn.to_objectchange(ObjectChangeAction.UPDATE)
+        change.request_id = uuid.uuid4()
+        enqueue_change(queue, change)
+        changed_at = change.time
+
+        # Records keep the time of the change, not the one they are written at
+        with patch(
+            "django.utils.timezone.now", return_value=changed_at + timedelta(minutes=1)
+        ):
+            flush_changes(queue)
+        self.assertEqual(changed_at, self._get_changes().get().time)
+
+    @override_settings(CACHE_API_TIMEOUT=60)
+    def test_api_cache_invalidation(self):
+        url = reverse("core-api:objectchange-list")
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data["count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("peering-api:autonomoussystem-list"),
+                {"asn": 64500, "name": "AS 1"},
+                format="json",
+                **self.header,
+            )
+
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], **self.header
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_aborted_request(self):
+        def abort(instance, **kwargs):
+            if instance.name == "AS 2":
+                raise AbortRequestError("Aborted")
+
+        data = [{"asn": 64500, "name": "AS 1"}, {"asn": 64501, "name": "AS 2"}]
+        url = reverse("peering-api:autonomoussystem-list")
+        pre_save.connect(abort, sender=AutonomousSystem)
+        try:
+            response = self.client.post(url, data, format="json", **self.header)
+        finally:
+            pre_save.disconnect(abort, sender=AutonomousSystem)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+        # Changes rolled back are not logged
+        self.assertFalse(AutonomousSystem.objects.exists())
+        self.assertFalse(self._get_changes().exists())
+
+
+class HousekeepingTest(TestCase):
+    @override_settings(CHANGELOG_RETENTION=30, RELEASE_CHECK_URL=None)
+    @patch.object(Command, "delete_batch_size", 2)
+    def test_delete_expired_changes(self):
+        asn = AutonomousSystem.objects.create(asn=64500, name="AS 1")
+        changes = []
+        for _ in range(5):
+            change = asn.to_objectchange(ObjectChangeAction.UPDATE)
+            change.user = self.user
+            change.request_id = uuid.uuid4()
+            changes.append(change)
+        ObjectChange.objects.bulk_create(changes)
+        ObjectChange.objects.filter(pk__in=[c.pk for c in changes[:3]]).update(
+            time=timezone.now() - timedelta(days=31)
+        )
+
+        call_command("housekeeping", verbosity=0)
+
+        self.assertEqual(
+            sorted(ObjectChange.objects.values_list("pk", flat=True)),
+            sorted(c.pk for c in changes[3:]),
+        )
@@ -0,0 +1,173 @@
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.utils import timezone
+from dulwich import porcelain
+from dulwich.repo import Repo
+
+from utils.testing import TestCase
+
+from ..enums import DataSourceStatus
+from ..models import DataBlob, DataFile, DataSource
+
+
+class GitDataSourceTest(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+
+        # A bare repository acting as remote, fed from a working copy
+        self.remote = self.root / "remote.git"
+        porcelain.init(str(self.remote), bare=True).refs.set_symbolic_ref(
+            b"HEAD", b"refs/heads/main"
+        )
+        self.work = self.root / "work"
+        porcelain.init(str(self.work))
+
+        settings = override_settings(DATA_SOURCE_CACHE_PATH=str(self.root / "cache"))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.data_source = DataSource.objects.create(
+            name="Git", type="git", source_url=str(self.remote)
+        )
+
+    def commit(self, files, deleted=()):
+        for path, content in files.items():
+            (self.work / path).write_text(content)
+        porcelain.add(str(self.work), [str(self.work / p) for p in files])
+        if deleted:
+            porcelain.remove(str(self.work), [str(self.work / p) for p in deleted])
+        porcelain.commit(
+            str(self.work), message=b"Commit", author=b"Test <test@example.com>"
+        )
+        porcelain.push(
+            str(self.work),
+            str(self.remote),
+            b"refs/heads/master:refs/heads/main",
+            outstream=porcelain.NoneStream(),
+            errstream=porcelain.NoneStream(),
+        )
+
+    def synchronise(self):
+        with patch.object(
+            DataFile,
+            "refresh_from_disk",
+            autospec=True,
+            side_effect=DataFile.refresh_from_disk,
+        ) as refresh:
+            self.data_source.synchronise()
+        return sorted(call.args[0].path for call in refresh.call_args_list)
+
+    def test_synchronise(self):
+        self.commit({"a.yaml": "a: 1", "b.yaml": "b: 1"})
+        self.assertEqual(["a.yaml", "b.yaml"], self.synchronise())
+        self.assertEqual(DataSourceStatus.COMPLETED, self.data_source.status)
+        self.assertTrue(Path(self.data_source.cache_path, ".git").is_dir())
+
+        # Only changed files are read again
+        self.commit({"b.yaml": "b: 2", "c.yaml": "c: 1"})
+        self.assertEqual(["b.yaml", "c.yaml"], self.synchronise())
+        self.assertEqual(
+            {"b": 2}, self.data_source.datafiles.get(path="b.yaml").get_data()
+        )
+
+        self.commit({}, deleted=["a.yaml"])
+        self.assertEqual(["a.yaml"], self.synchronise())
+        self.assertEqual(
+            ["b.yaml", "c.yaml"],
+            list(self.data_source.datafiles.values_list("path", flat=True)),
+        )
+
+        self.assertEqual([], self.synchronise())
+
+    @override_settings(DATA_SOURCE_CACHE_PATH=None)
+    def test_synchronise_without_cache(self):
+        self.commit({"a.yaml": "a: 1"})
+        self.assertEqual(["a.yaml"], self.synchronise())
+        self.assertEqual(["a.yaml"], self.synchronise())
+        self.assertIsNone(self.data_source.cache_path)
+
+    def test_push(self):
+        self.commit({"a.yaml": "a: 1"})
+        self.synchronise()
+
+        self.data_source.push("b.yaml", "b: 1")
+        self.assertEqual(
+            {"b": 1}, self.data_source.datafiles.get(path="b.yaml").get_data()
+        )
+
+        # Changes made on the remote are still read by the next synchronisation
+        porcelain.pull(
+            str(self.work),
+            str(self.remote),
+            b"refs/heads/main",
+            outstream=porcelain.NoneStream(),
+            errstream=porcelain.NoneStream(),
+        )
+        self.commit({"a.yaml": "a: 2"})
+        self.assertEqual(["a.yaml", "b.yaml"], self.synchronise())
+        self.assertEqual(
+            {"a": 2}, self.data_source.datafiles.get(path="a.yaml").get_data()
+        )
+
+    def test_push_files(self):
+        self.commit({"a.yaml": "a: 1"})
+        self.synchronise()
+        head = Repo(str(self.remote)).head()
+
+        self.assertEqual(
+            ["b.yaml", "c.yaml"],
+            self.data_source.push_files(
+                {"a.yaml": "a: 1", "b.yaml": "b: 1", "c.yaml": "c: 1"}
+            ),
+        )
+        # A single commit with all files
+        commit = Repo(str(self.remote))[Repo(str(self.remote)).head()]
+        self.assertEqual([head], commit.parents)
+        self.assertEqual(3, self.data_source.datafiles.count())
+
+        # Nothing to push
+        self.assertEqual([], self.data_source.push_files({"b.yaml": "b: 1"}))
+        self.assertEqual(commit.id, Repo(str(self.remote)).head())
+
+    def test_blobs(self):
+        self.commit({"a.yaml": "a: [1]", "b.yaml": "a: [1]"})
+        self.synchronise()
+
+        # Files with the same content share their blob
+        a, b = self.data_source.datafiles.all()
+        self.assertEqual(a.hash, b.hash)
+        self.assertEqual(1, DataBlob.objects.count())
+        self.assertEqual(b"a: [1]", a.data)
+
+        # Parsed data is cached, but can be modified safely
+        data = a.get_data()
+        data["a"].append(2)
+        self.assertEqual({"a": [1]}, b.get_data())
+
+        self.commit({"a.yaml": "a: 2", "b.yaml": "b: 2"})
+        self.synchronise()
+        self.assertEqual(3, DataBlob.objects.count())
+
+        # Unused blobs are deleted once they are old enough
+        self.assertEqual(0, DataBlob.delete_unused())
+        DataBlob.objects.update(last_used=timezone.now() - timedelta(days=2))
+        self.assertEqual(1, DataBlob.delete_unused())
+        self.assertEqual(
+            {"b": 2}, self.data_source.datafiles.get(path="b.yaml").get_data()
+        )
+
+    def test_delete(self):
+        self.commit({"a.yaml": "a: 1"})
+        self.synchronise()
+        cache_path = self.data_source.cache_path
+
+        self.data_source.delete()
+        self.assertFalse(Path(cache_path).exists())
@@ -0,0 +1,276 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import django_rq
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from django_rq import job
+from rq import SimpleWorker
+from rq.job import JobStatus as RQJobStatus
+
+from extras.models import Tag
+from peering_manager.metrics import QueueCollector
+from utils.testing import TestCase
+
+from ..enums import JobStatus, MissedRunPolicy, ScheduledCommand
+from ..management.commands.housekeeping import Command
+from ..management.commands.rqworker import Command as RQWorkerCommand
+from ..models import Job, JobLogEntry, ScheduledTask
+
+
+@job("default")
+def tag_job(tag, job, fail=False):
+    job.mark_running("Running.", object=tag)
+    if fail and tag.slug == "tag-2":
+        job.mark_failed("Failed.", object=tag)
+    else:
+        job.mark_completed("Completed.", object=tag)
+
+
+class JobGroupTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Tag.objects.bulk_create(
+            [Tag(name=f"Tag {i}", slug=f"tag-{i}") for i in range(1, 4)]
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        self.queue = django_rq.get_queue("default")
+        self.queue.empty()
+
+    def run_jobs(self):
+        SimpleWorker([self.queue], connection=self.queue.connection).work(
+            burst=True, logging_level="WARNING"
+        )
+
+    def test_enqueue_group(self):
+        parent = Job.enqueue_group(tag_job, Tag.objects.all(), name="test")
+        self.assertEqual(JobStatus.RUNNING, parent.status)
+        self.assertEqual(3, parent.children.count())
+        self.assertEqual(3, self.queue.count)
+
+        self.run_jobs()
+
+        parent.refresh_from_db()
+        self.assertEqual(JobStatus.COMPLETED, parent.status)
+        self.assertEqual(3, parent.data["children"]["success"])
+        self.assertFalse(parent.children.exclude(status=JobStatus.COMPLETED).exists())
+
+    def test_enqueue_group_failure(self):
+        parent = Job.enqueue_group(tag_job, Tag.objects.all(), name="test", fail=True)
+        self.run_jobs()
+
+        parent.refresh_from_db()
+        self.assertEqual(JobStatus.FAILED, parent.status)
+        self.assertEqual(2, parent.data["children"]["success"])
+        self.assertEqual(1, parent.data["children"]["failure"])
+
+    def test_enqueue_group_empty(self):
+        parent = Job.enqueue_group(tag_job, Tag.objects.none(), name="test")
+        self.assertEqual(JobStatus.COMPLETED, parent.status)
+        self.assertEqual(0, self.queue.count)
+
+    @override_settings(JOB_CONCURRENCY={"test": 1})
+    def test_enqueue_group_concurrency(self):
+        parent = Job.enqueue_group(tag_job, Tag.objects.all(), name="test")
+        # Only the first job is queued, others wait for the previous one to be over
+        self.assertEqual(1, self.queue.count)
+        self.assertEqual(2, self.queue.deferred_job_registry.count)
+
+        self.run_jobs()
+
+        parent.refresh_from_db()
+        self.assertEqual(JobStatus.COMPLETED, parent.status)
+        self.assertEqual(3, parent.data["children"]["success"])
+
+    def test_cancel(self):
+        parent = Job.enqueue_group(
+            tag_job, Tag.objects.all(), name="test", concurrency=1
+        )
+        parent.cancel(user=self.user)
+
+        parent.refresh_from_db()
+        self.assertEqual(JobStatus.CANCELLED, parent.status)
+        for child in parent.children.all():
+            self.assertEqual(JobStatus.CANCELLED, child.status)
+            self.assertEqual(
+                RQJobStatus.CANCELED,
+                self.queue.fetch_job(str(child.job_id)).get_status(),
+            )
+        self.assertEqual(0, self.queue.count)
+
+    def test_reconcile(self):
+        parent = Job.enqueue_group(tag_job, Tag.objects.all(), name="test")
+        first, second, third = parent.children.order_by("pk")
+        # Jobs killed with their worker are failed by RQ without reporting to us
+        self.queue.remove(str(first.job_id))
+        self.queue.fetch_job(str(first.job_id)).set_status(RQJobStatus.FAILED)
+        self.queue.fetch_job(str(second.job_id)).delete()
+
+        self.assertEqual(2, Job.reconcile())
+
+        parent.refresh_from_db()
+        self.assertEqual(JobStatus.RUNNING, parent.status)
+        self.assertEqual(2, parent.data["children"]["failure"])
+        self.assertEqual(JobStatus.PENDING, Job.objects.get(pk=third.pk).status)
+
+        self.run_jobs()
+
+        parent.refresh_from_db()
+        self.assertEqual(JobStatus.FAILED, parent.status)
+        self.assertEqual(1, parent.data["children"]["success"])
+        # Nothing left to reconcile
+        self.assertEqual(0, Job.reconcile())
+
+    def test_reconcile_cutoff(self):
+        parent = Job.enqueue_group(tag_job, Tag.objects.all(), name="test")
+        self.queue.empty()
+
+        self.assertEqual(0, Job.reconcile(cutoff=timezone.now() - timedelta(hours=1)))
+        self.assertEqual(3, Job.reconcile(cutoff=timezone.now()))
+
+        parent.refresh_from_db()
+        self.assertEqual(JobStatus.FAILED, parent.status)
+
+    @override_settings(JOB_RETENTION=30, RELEASE_CHECK_URL=None)
+    @patch.object(Command, "delete_batch_size", 1)
+    def test_housekeeping(self):
+        parent = Job.enqueue_group(tag_job, Tag.objects.all(), name="test")
+        self.run_jobs()
+        Job.objects.update(created=timezone.now() - timedelta(days=31))
+        # Delete the parent first, with its children
+        Job.objects.filter(pk=parent.pk).update(
+            created=timezone.now() - timedelta(days=32)
+        )
+
+        call_command("housekeeping", verbosity=0)
+
+        self.assertFalse(Job.objects.filter(pk=parent.pk).exists())
+        self.assertEqual(0, Job.objects.count())
+        self.assertEqual(0, JobLogEntry.objects.count())
+        connection.check_constraints()
+
+
+class QueueTest(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.queue = django_rq.get_queue("interactive")
+        self.queue.empty()
+        django_rq.get_queue("sync").empty()
+
+    def tearDown(self):
+        self.queue.empty()
+
+    def test_parse_pools(self):
+        command = RQWorkerCommand()
+        self.assertEqual(
+            {"interactive": 4, "polling": 2, "sync": 1},
+            command.parse_pools("interactive=4, polling=2,sync"),
+        )
+        with self.assertRaises(CommandError):
+            command.parse_pools("unknown=1")
+        with self.assertRaises(CommandError):
+            command.parse_pools("sync=0")
+
+    def test_queue_metrics(self):
+        self.queue.enqueue("core.tests.test_jobs.tag_job")
+        metrics = {
+            m.name: {s.labels["queue"]: s.value for s in m.samples}
+            for m in QueueCollector().collect()
+        }
+
+        self.assertEqual(1, metrics["rq_queue_depth"]["interactive"])
+        self.assertEqual(0, metrics["rq_queue_depth"]["sync"])
+        self.assertGreaterEqual(metrics["rq_queue_latency_seconds"]["interactive"], 0)
+        self.assertEqual(0, metrics["rq_queue_latency_seconds"]["sync"])
+
+
+class ScheduledTaskTest(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.queue = django_rq.get_queue("sync")
+        self.queue.empty()
+        self.start = timezone.now().replace(microsecond=0) - timedelta(minutes=90)
+        self.task = ScheduledTask.objects.create(
+            name="Housekeeping",
+            command=ScheduledCommand.HOUSEKEEPING,
+            start=self.start,
+            interval=60,
+        )
+
+    def tearDown(self):
+        self.queue.empty()
+
+    def test_get_next_run(self):
+        self.assertEqual(self.start + timedelta(minutes=120), self.task.next_run)
+        self.assertEqual(
+            self.start, self.task.get_next_run(self.start - timedelta(seconds=1))
+        )
+        self.assertEqual(
+            self.start + timedelta(minutes=60), self.task.get_next_run(self.start)
+        )
+
+        self.task.jitter = 30
+        next_run = self.task.get_next_run(self.start)
+        self.assertGreaterEqual(next_run, self.start + timedelta(minutes=60))
+        self.assertLessEqual(next_run, self.start + timedelta(minutes=60, seconds=30))
+
+    def test_run_due_tasks(self):
+        self.assertEqual([], ScheduledTask.run_due_tasks())
+
+        now = self.task.next_run + timedelta(seconds=10)
+        jobs = ScheduledTask.run_due_tasks(now=now)
+        self.assertEqual(1, len(jobs))
+        self.assertEqual(self.task, jobs[0].object)
+        self.assertEqual(1, self.queue.count)
+
+        self.task.refresh_from_db()
+        self.assertEqual(now, self.task.last_run)
+        self.assertEqual(self.start + timedelta(minutes=180), self.task.next_run)
+
+        # Previous run is not over yet
+        now = self.task.next_run
+        with self.assertLogs("peering.manager.core.scheduler", level="WARNING"):
+            self.assertEqual([], ScheduledTask.run_due_tasks(now=now))
+        self.task.refresh_from_db()
+        self.assertEqual(self.start + timedelta(minutes=240), self.task.next_run)
+
+    def test_run_due_tasks_disabled(self):
+        self.task.enabled = False
+        self.task.save()
+        self.assertEqual([], ScheduledTask.run_due_tasks(now=self.task.next_run))
+
+    def test_run_due_tasks_missed(self):
+        now = self.task.next_run + timedelta(minutes=61)
+
+        self.task.missed_run_policy = MissedRunPolicy.SKIP
+        self.task.save(update_fields=["missed_run_policy"])
+        self.assertEqual([], ScheduledTask.run_due_tasks(now=now))
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.last_run)
+        self.assertEqual(self.start + timedelta(minutes=240), self.task.next_run)
+
+        self.task.missed_run_policy = MissedRunPolicy.RUN
+        self.task.next_run = self.start + timedelta(minutes=120)
+        self.task.save(update_fields=["missed_run_policy", "next_run"])
+        self.assertEqual(1, len(ScheduledTask.run_due_tasks(now=now)))
+
+    @override_settings(RELEASE_CHECK_URL=None)
+    def test_run_command(self):
+        self.task.arguments = "--verbosity 1"
+        self.task.save()
+        job = self.task.enqueue(user=self.user)
+        SimpleWorker([self.queue], connection=self.queue.connection).work(
+            burst=True, logging_level="WARNING"
+        )
+
+        job.refresh_from_db()
+        self.assertEqual(JobStatus.COMPLETED, job.status)
+        self.assertIn("Finished.", job.output)
+        self.assertFalse(self.task.is_running())
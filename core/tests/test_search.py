@@ -0,0 +1,77 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase
+
+from net.models import Connection
+from peering.models import AutonomousSystem, InternetExchange
+
+from ..models import CachedValue
+
+
+class CachedValueTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.autonomous_system = AutonomousSystem.objects.create(
+            asn=64500, name="Example", irr_as_set="AS-EXAMPLE"
+        )
+        cls.internet_exchange = InternetExchange.objects.create(
+            name="Example IX", slug="example-ix"
+        )
+
+    def search(self, value):
+        return [
+            ContentType.objects.get_for_id(object_type).get_object_for_this_type(
+                pk=object_id
+            )
+            for object_type, object_id in CachedValue.search(value)
+        ]
+
+    def test_signals(self):
+        self.assertEqual(
+            {("asn", "64500"), ("name", "Example"), ("irr_as_set", "AS-EXAMPLE")},
+            set(
+                CachedValue.objects.filter(
+                    object_id=self.autonomous_system.pk,
+                    object_type=ContentType.objects.get_for_model(AutonomousSystem),
+                ).values_list("field", "value")
+            ),
+        )
+
+        self.autonomous_system.name = "Renamed"
+        self.autonomous_system.save()
+        self.assertEqual([], self.search("Example AS"))
+        self.assertEqual([self.autonomous_system], self.search("renamed"))
+
+        self.autonomous_system.delete()
+        self.assertEqual([self.internet_exchange], self.search("example"))
+
+    def test_search(self):
+        # Exact matches first, then values starting with the string, then others
+        other = AutonomousSystem.objects.create(asn=64501, name="Other Example")
+        self.assertEqual(
+            [self.autonomous_system, self.internet_exchange, other],
+            self.search("example"),
+        )
+        self.assertEqual([self.internet_exchange], self.search("example-"))
+        self.assertEqual([], self.search("foo"))
+
+        # Addresses are cached without their prefix length
+        connection = Connection.objects.create(
+            ipv4_address="192.0.2.1/24", internet_exchange_point=self.internet_exchange
+        )
+        self.assertEqual([connection], self.search("192.0.2.1"))
+
+    def test_reindex(self):
+        CachedValue.objects.all().delete()
+        call_command("reindex", "peering", "--lazy", verbosity=0)
+        self.assertEqual(
+            [self.autonomous_system, self.internet_exchange], self.search("example")
+        )
+
+        AutonomousSystem.objects.filter(pk=self.autonomous_system.pk).update(
+            name="Renamed"
+        )
+        call_command("reindex", "peering.autonomoussystem", "--lazy", verbosity=0)
+        self.assertEqual([], self.search("renamed"))
+        call_command("reindex", "peering.autonomoussystem", verbosity=0)
+        self.assertEqual([self.autonomous_system], self.search("renamed"))
@@ -1,6 +1,7 @@
 import uuid
 
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
@@ -110,6 +111,66 @@ class ObjectChangeTestCase(ViewTestCases.ReadOnlyObjectViewTestCase):
             change.save()
 
 
+class JobTestCase(TestCase):
+    user_permissions = ["core.view_job"]
+
+    def setUp(self):
+        super().setUp()
+
+        self.job = Job.objects.create(
+            name="test",
+            object_type=ContentType.objects.get_for_model(Job),
+            user=self.user,
+            job_id=uuid.uuid4(),
+        )
+
+    def test_log(self):
+        self.job.mark_running("Running.")
+        self.job.set_output("Output line")
+        # Entries are written when the job is saved
+        self.assertEqual(1, self.job.log_entries.count())
+        self.job.log_warning("Warning.", grouping="other")
+        self.assertEqual(3, self.job.log_entries.count())
+
+        self.job.mark_completed("Completed.")
+        self.assertEqual(
+            ["Running.", "Output line", "Warning.", "Completed."],
+            list(self.job.log_entries.values_list("message", flat=True)),
+        )
+        self.assertEqual("Output line", self.job.output)
+
+        self.job.refresh_from_db()
+        self.assertEqual(JobStatus.COMPLETED, self.job.status)
+        self.assertEqual(
+            {"success": 1, "info": 1, "warning": 0, "failure": 0}, self.job.data["main"]
+        )
+        self.assertEqual(1, self.job.data["other"]["warning"])
+        self.assertEqual(
+            2, self.job.data["total"]["info"] + self.job.data["total"]["success"]
+        )
+
+    def test_job_view(self):
+        self.job.mark_running("Running.")
+
+        response = self.client.get(self.job.get_absolute_url())
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertContains(response, "Running.")
+        self.assertContains(response, "fetchLogEntries")
+
+    def test_job_view_log_entries(self):
+        self.job.mark_running("Running.")
+        last_entry = self.job.log_entries.get()
+        self.job.mark_completed("Completed.")
+
+        response = self.client.get(
+            self.job.get_absolute_url(), {"after": last_entry.pk}
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotContains(response, "Running.")
+        self.assertContains(response, "Completed.")
+        self.assertEqual("true", response["X-Job-Over"])
+
+
 class SystemTestCase(TestCase):
     def setUp(self):
         super().setUp()
@@ -30,7 +30,7 @@ __all__ = (
 @register_model_view(DataFile, name="list", path="", detail=False)
 class DataFileListView(ObjectListView):
     permission_required = "core.view_datafile"
-    queryset = DataFile.objects.defer("data")
+    queryset = DataFile.objects.all()
     filterset = filtersets.DataFileFilterSet
     filterset_form = forms.DataFileFilterForm
     table = tables.DataFileTable
@@ -74,9 +74,7 @@ class DataSourceView(ObjectView):
 
     def get_extra_context(self, request, instance):
         return {
-            "datafile_count": DataFile.objects.filter(source=instance)
-            .defer("data")
-            .count(),
+            "datafile_count": DataFile.objects.filter(source=instance).count(),
         }
 
 
@@ -122,8 +120,4 @@ class DataSourceFilesView(ObjectChildrenView):
     tab = ViewTab(label="Files", permission="core.view_datafile")
 
     def get_children(self, request, parent):
-        return (
-            DataFile.objects.filter(source=parent)
-            .defer("data")
-            .prefetch_related("source")
-        )
+        return DataFile.objects.filter(source=parent).prefetch_related("source")
@@ -1,3 +1,5 @@
+from django.shortcuts import render
+
 from peering_manager.views.generic import (
     BulkDeleteView,
     ObjectDeleteView,
@@ -7,6 +9,7 @@ from peering_manager.views.generic import (
 from utils.views import register_model_view
 
 from .. import filtersets, forms, tables
+from ..enums import JobStatus
 from ..models import Job
 
 __all__ = ("JobBulkDeleteView", "JobDeleteView", "JobListView", "JobView")
@@ -27,6 +30,53 @@ class JobView(ObjectView):
     permission_required = "core.view_job"
     queryset = Job.objects.all()
 
+    def get(self, request, *args, **kwargs):
+        if "after" not in request.GET:
+            return super().get(request, *args, **kwargs)
+
+        # Only render log entries recorded after the last one already displayed,
+        # this is used to follow the log of a running job
+        instance = self.get_object(**kwargs)
+        try:
+            after = int(request.GET["after"])
+        except ValueError:
+            after = 0
+
+        response = render(
+            request,
+            "core/job/inc/log_entries.html",
+            {
+                "entries": instance.log_entries.filter(pk__gt=after).exclude(
+                    grouping="output"
+                )
+            },
+        )
+        if instance.is_over:
+            response["X-Job-Over"] = "true"
+        return response
+
+    def get_extra_context(self, request, instance):
+        groupings = {
+            grouping: {"counters": counters, "entries": []}
+            for grouping, counters in (instance.data or {}).items()
+            if grouping not in ("total", "output")
+        }
+        last_entry = 0
+        for entry in instance.log_entries.exclude(grouping="output"):
+            groupings.setdefault(entry.grouping, {"counters": {}, "entries": []})[
+                "entries"
+            ].append(entry)
+            last_entry = entry.pk
+
+        return {
+            "groupings": groupings,
+            "last_entry": last_entry,
+            "children_count": instance.children.count(),
+            "children_over": instance.children.filter(
+                status__in=JobStatus.TERMINAL_STATE_CHOICES
+            ).count(),
+        }
+
 
 @register_model_view(Job, name="delete")
 class JobDeleteView(ObjectDeleteView):
@@ -15,7 +15,7 @@ from ..enums import DeviceStatus
 from ..filtersets import ConfigurationFilterSet, PlatformFilterSet, RouterFilterSet
 from ..jobs import (
     poll_bgp_sessions,
-    push_configuration_to_data_source,
+    push_configurations_to_data_sources,
     render_configuration,
     set_napalm_configuration,
     test_napalm_connection,
@@ -126,20 +126,19 @@ class RouterViewSet(PeeringManagerModelViewSet):
         if not routers:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        jobs = []
-        for router in routers:
-            job = Job.enqueue(
-                set_napalm_configuration,
-                router,
-                commit,
-                name="devices.router.set_napalm_configuration",
-                object=router,
-                user=request.user,
-            )
-            jobs.append(job)
+        # One job per router, grouped to be tracked (and cancelled) as a whole
+        job = Job.enqueue_group(
+            set_napalm_configuration,
+            routers,
+            commit,
+            name="devices.router.set_napalm_configuration",
+            user=request.user,
+        )
 
         return Response(
-            JobSerializer(jobs, many=True, context={"request": request}).data,
+            JobSerializer(
+                job.children.order_by("pk"), many=True, context={"request": request}
+            ).data,
             status=status.HTTP_202_ACCEPTED,
         )
 
@@ -362,16 +361,18 @@ class RouterViewSet(PeeringManagerModelViewSet):
         if not routers:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        jobs = []
-        for router in routers:
-            job = Job.enqueue(
-                push_configuration_to_data_source,
-                router,
+        # Push all configurations at once, with a single commit per data source
+        routers = list(routers.select_related("data_source"))
+        jobs = [
+            Job.enqueue(
+                push_configurations_to_data_sources,
+                routers,
                 name="devices.router.push_to_data_source",
-                object=router,
+                object=routers[0] if len(routers) == 1 else None,
+                object_model=Router,
                 user=request.user,
             )
-            jobs.append(job)
+        ]
 
         return Response(
             JobSerializer(jobs, many=True, context={"request": request}).data,
@@ -6,6 +6,7 @@
 
 import base64
 import binascii
+from functools import lru_cache
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.decrepit.ciphers.algorithms import TripleDES
@@ -173,6 +174,16 @@ def _hashkey(pw: bytes) -> bytes:
     return bytes(result)
 
 
+@lru_cache(maxsize=4096)
+def _get_cipher(key: str) -> Cipher:
+    """
+    Returns the TripleDES cipher for a key, built once as many values are usually
+    encrypted and decrypted with the same key (e.g. a session IP address).
+    """
+    hashed_key = _hashkey(bytes(f"{key}_passwd", encoding="UTF-8"))
+    return Cipher(TripleDES(hashed_key), modes.CBC(bytes(8)), default_backend())
+
+
 class AristaType7Cipher(PasswordCipher):
     """
     Arista Type 7 password encryption/decryption implementation.
@@ -204,11 +215,7 @@ class AristaType7Cipher(PasswordCipher):
         except binascii.Error:
             return value
 
-        key_bytes = bytes(f"{key}_passwd", encoding="UTF-8")
-        hashed_key = _hashkey(key_bytes)
-
-        cipher = Cipher(TripleDES(hashed_key), modes.CBC(bytes(8)), default_backend())
-        decryptor = cipher.decryptor()
+        decryptor = _get_cipher(key).decryptor()
         result = decryptor.update(data)
         decryptor.finalize()
 
@@ -234,14 +241,10 @@ class AristaType7Cipher(PasswordCipher):
             return value
 
         data = bytes(value, encoding="UTF-8")
-        key_bytes = bytes(f"{key}_passwd", encoding="UTF-8")
-        hashed_key = _hashkey(key_bytes)
-
         padding = (8 - ((len(data) + 4) % 8)) % 8
         ciphertext = ENC_SIG + bytes([padding * 16 + 0xE]) + data + bytes(padding)
 
-        cipher = Cipher(TripleDES(hashed_key), modes.CBC(bytes(8)), default_backend())
-        encryptor = cipher.encryptor()
+        encryptor = _get_cipher(key).encryptor()
         result = encryptor.update(ciphertext)
         encryptor.finalize()
 
@@ -66,6 +66,7 @@ XLAT = [
     0x38,
     0x37,
 ]
+ENCRYPTED = re.compile("(^[0-9A-Fa-f]{2})([0-9A-Fa-f]+)")
 
 
 class CiscoType7Cipher(PasswordCipher):
@@ -97,8 +98,7 @@ class CiscoType7Cipher(PasswordCipher):
 
         decrypted = ""
 
-        regex = re.compile("(^[0-9A-Fa-f]{2})([0-9A-Fa-f]+)")
-        result = regex.search(value)
+        result = ENCRYPTED.search(value)
 
         s, e = int(result.group(1), 16), result.group(2)
         for position in range(0, len(e), 2):
@@ -3,13 +3,14 @@ import logging
 from django.template.defaultfilters import pluralize
 from django_rq import job
 
-from core.enums import DataSourceStatus, LogLevel
-from core.exceptions import SynchronisationError
+from core.enums import LogLevel
+
+from .models import Router
 
 logger = logging.getLogger("peering.manager.devices.jobs")
 
 
-@job("default")
+@job("interactive")
 def render_configuration(router, job):
     job.mark_running("Rendering router configuration.", object=router, logger=logger)
 
@@ -28,7 +29,7 @@ def render_configuration(router, job):
     job.mark_completed("Router configuration rendered.", object=router, logger=logger)
 
 
-@job("default")
+@job("polling")
 def poll_bgp_sessions(router, job):
     if not router.is_usable_for_task(job=job, logger=logger):
         job.mark_completed("Task cancelled")
@@ -52,7 +53,7 @@ def poll_bgp_sessions(router, job):
     return success
 
 
-@job("default")
+@job("deploy")
 def set_napalm_configuration(router, commit, job):
     if not router.is_usable_for_task(job=job, logger=logger):
         job.mark_completed("Task cancelled")
@@ -88,7 +89,7 @@ def set_napalm_configuration(router, commit, job):
     return True
 
 
-@job("default")
+@job("interactive")
 def test_napalm_connection(router, job):
     if not router.is_usable_for_task(job=job, logger=logger):
         job.mark_completed("Task cancelled")
@@ -106,31 +107,46 @@ def test_napalm_connection(router, job):
     return success
 
 
-@job("default")
-def push_configuration_to_data_source(router, job):
-    if not router.data_source or not router.data_path:
-        job.mark_completed("No data source and file to push configuration to")
-        return False
-
+@job("deploy")
+def push_configurations_to_data_sources(routers, job):
     job.mark_running(
-        f"Pushing router configuration to {router.data_source}:{router.data_path}.",
-        object=router,
+        f"Pushing {len(routers)} router configuration{pluralize(len(routers))} to data sources.",
         logger=logger,
     )
 
-    try:
-        router.push(save=True)
-        job.mark_completed("Router configuration pushed.", object=router, logger=logger)
-    except Exception as e:
-        job.set_output(str(e))
-        job.mark_failed("Failed to push to data source.", object=router, logger=logger)
-        router.data_source.status = DataSourceStatus.FAILED
-        router.data_source.save()
-
-        if isinstance(e, SynchronisationError):
-            logger.error(e)
-            return False
+    pushed, errors = Router.push_many(routers, save=True)
+    for router in pushed:
+        job.log(
+            f"Router configuration pushed to {router.data_source}:{router.data_path}.",
+            object=router,
+            level_choice=LogLevel.SUCCESS,
+            logger=logger,
+            save=False,
+        )
+    for router, error in errors.items():
+        job.log(
+            f"Failed to push to data source: {error}",
+            object=router,
+            level_choice=LogLevel.FAILURE,
+            logger=logger,
+            save=False,
+        )
 
-        raise e
+    if errors:
+        job.mark_failed("Failed to push some router configurations.", logger=logger)
+        return False
 
+    job.mark_completed("Router configurations pushed.", logger=logger)
     return True
+
+
+@job("sync")
+def import_routers_from_netbox(full, job):
+    job.mark_running("Importing routers from NetBox devices.", logger=logger)
+
+    created, updated = Router.import_from_netbox(full=full)
+
+    job.mark_completed(
+        f"{created} router{pluralize(created)} created, {updated} updated.",
+        logger=logger,
+    )
@@ -33,14 +33,7 @@ class Command(BaseCommand):
             help="Override default configuration to use for config generation/deployment. Give the name of the configuration.",
         )
 
-    def process(
-        self,
-        router,
-        quiet=False,
-        as_task=False,
-        no_commit_check=False,
-        config_override="",
-    ):
+    def override_configuration(self, router, config_override):
         # Override default configuration linked in the Router object
         if config_override:
             try:
@@ -55,32 +48,24 @@ class Command(BaseCommand):
                     )
                 )
 
+    def process(self, router, quiet=False, no_commit_check=False, config_override=""):
+        self.override_configuration(router, config_override)
+
         if not quiet:
             self.stdout.write(f"  - {router.hostname} ... ", ending="")
 
-        if not as_task:
-            configuration = router.render_configuration()
-            error, changes = router.set_napalm_configuration(
-                configuration, commit=no_commit_check
-            )
-            if not no_commit_check and not error and changes:
-                error, _ = router.set_napalm_configuration(configuration, commit=True)
+        configuration = router.render_configuration()
+        error, changes = router.set_napalm_configuration(
+            configuration, commit=no_commit_check
+        )
+        if not no_commit_check and not error and changes:
+            error, _ = router.set_napalm_configuration(configuration, commit=True)
 
-            if not quiet:
-                if not error:
-                    self.stdout.write(self.style.SUCCESS("success"))
-                else:
-                    self.stdout.write(self.style.ERROR("failed"))
-        else:
-            job = Job.enqueue(
-                set_napalm_configuration,
-                router,
-                True,
-                name="commands.configure_routers",
-                object=router,
-            )
-            if not quiet:
-                self.stdout.write(self.style.SUCCESS(f"task #{job.id}"))
+        if not quiet:
+            if not error:
+                self.stdout.write(self.style.SUCCESS("success"))
+            else:
+                self.stdout.write(self.style.ERROR("failed"))
 
     def handle(self, *args, **options):
         quiet = options["verbosity"] == 0
@@ -101,11 +86,26 @@ class Command(BaseCommand):
 
             self.stdout.write("[*] Deploying configurations")
 
+        if options["tasks"]:
+            # Run one job per router, grouped to be tracked as a whole
+            routers = list(routers)
+            for r in routers:
+                self.override_configuration(r, options["config"])
+            job = Job.enqueue_group(
+                set_napalm_configuration,
+                routers,
+                True,
+                name="commands.configure_routers",
+                object_model=Router,
+            )
+            if not quiet:
+                self.stdout.write(self.style.SUCCESS(f"  - task #{job.id}"))
+            return
+
         for r in routers:
             self.process(
                 r,
                 quiet=quiet,
-                as_task=options["tasks"],
                 no_commit_check=options["no_commit_check"],
                 config_override=options["config"],
             )
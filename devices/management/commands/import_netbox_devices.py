@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Job
+
+from ...jobs import import_routers_from_netbox
+from ...models import Router
+
+
+class Command(BaseCommand):
+    help = "Create or update routers from NetBox devices."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-f",
+            "--full",
+            action="store_true",
+            help="Import all devices, not only the ones updated since the last import.",
+        )
+        parser.add_argument(
+            "-t",
+            "--tasks",
+            action="store_true",
+            help="Delegate the import to Redis worker process.",
+        )
+
+    def handle(self, *args, **options):
+        quiet = options["verbosity"] == 0
+        if not settings.NETBOX_API:
+            raise CommandError("NETBOX_API is not configured.")
+
+        if not quiet:
+            self.stdout.write("[*] Importing routers from NetBox devices")
+
+        if options["tasks"]:
+            job = Job.enqueue(
+                import_routers_from_netbox,
+                options["full"],
+                name="commands.import_netbox_devices",
+                object_model=Router,
+            )
+            if not quiet:
+                self.stdout.write(self.style.SUCCESS(f"  - task #{job.id}"))
+            return
+
+        created, updated = Router.import_from_netbox(full=options["full"])
+        if not quiet:
+            self.stdout.write(
+                self.style.SUCCESS(f"  - {created} created, {updated} updated")
+            )
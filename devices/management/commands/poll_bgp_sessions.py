@@ -23,26 +23,16 @@ class Command(BaseCommand):
             help="Delegate BGP sessions polling to Redis worker process.",
         )
 
-    def process(self, router, quiet=False, as_task=False):
+    def process(self, router, quiet=False):
         if not quiet:
             self.stdout.write(f"  - {router.hostname} ... ", ending="")
 
-        if not as_task:
-            success = router.poll_bgp_sessions()
-            if not quiet:
-                if success:
-                    self.stdout.write(self.style.SUCCESS("success"))
-                else:
-                    self.stdout.write(self.style.ERROR("failed"))
-        else:
-            job = Job.enqueue(
-                poll_bgp_sessions,
-                router,
-                name="commands.poll_bgp_sessions",
-                object=router,
-            )
-            if not quiet:
-                self.stdout.write(self.style.SUCCESS(f"task #{job.id}"))
+        success = router.poll_bgp_sessions()
+        if not quiet:
+            if success:
+                self.stdout.write(self.style.SUCCESS("success"))
+            else:
+                self.stdout.write(self.style.ERROR("failed"))
 
     def handle(self, *args, **options):
         quiet = options["verbosity"] == 0
@@ -53,5 +43,14 @@ class Command(BaseCommand):
         if not quiet:
             self.stdout.write("[*] Polling BGP sessions state")
 
+        if options["tasks"]:
+            # Run one job per router, grouped to be tracked as a whole
+            job = Job.enqueue_group(
+                poll_bgp_sessions, routers, name="commands.poll_bgp_sessions"
+            )
+            if not quiet:
+                self.stdout.write(self.style.SUCCESS(f"  - task #{job.id}"))
+            return
+
         for r in routers:
-            self.process(r, quiet=quiet, as_task=options["tasks"])
+            self.process(r, quiet=quiet)
@@ -2,7 +2,7 @@ from django.core.management.base import BaseCommand
 
 from core.models import Job
 
-from ...jobs import push_configuration_to_data_source
+from ...jobs import push_configurations_to_data_sources
 from ...models import Router
 
 
@@ -22,28 +22,6 @@ class Command(BaseCommand):
             help="Delegate router configuration to Redis worker process.",
         )
 
-    def process(self, router, quiet=False, as_task=False):
-        if not quiet:
-            self.stdout.write(f"  - {router.hostname} ... ", ending="")
-
-        if not as_task:
-            try:
-                router.push(save=True)
-                if not quiet:
-                    self.stdout.write(self.style.SUCCESS("success"))
-            except Exception:
-                if not quiet:
-                    self.stdout.write(self.style.ERROR("failed"))
-        else:
-            job = Job.enqueue(
-                push_configuration_to_data_source,
-                router,
-                name="commands.push_to_data_sources",
-                object=router,
-            )
-            if not quiet:
-                self.stdout.write(self.style.SUCCESS(f"task #{job.id}"))
-
     def handle(self, *args, **options):
         quiet = options["verbosity"] == 0
 
@@ -51,12 +29,31 @@ class Command(BaseCommand):
         # data source
         routers = Router.objects.filter(
             configuration_template__isnull=False, data_source__isnull=False
-        )
+        ).select_related("data_source")
         if options["limit"]:
             routers = routers.filter(hostname__in=options["limit"].split(","))
 
         if not quiet:
             self.stdout.write("[*] Pushing configurations")
 
-        for r in routers:
-            self.process(r, quiet=quiet, as_task=options["tasks"])
+        # Push all configurations at once, with a single commit per data source
+        if options["tasks"]:
+            job = Job.enqueue(
+                push_configurations_to_data_sources,
+                list(routers),
+                name="commands.push_to_data_sources",
+                object_model=Router,
+            )
+            if not quiet:
+                self.stdout.write(self.style.SUCCESS(f"  - task #{job.id}"))
+            return
+
+        pushed, errors = Router.push_many(routers, save=True)
+        if quiet:
+            return
+        for router in pushed:
+            self.stdout.write(f"  - {router.hostname} ... ", ending="")
+            self.stdout.write(self.style.SUCCESS("success"))
+        for router in errors:
+            self.stdout.write(f"  - {router.hostname} ... ", ending="")
+            self.stdout.write(self.style.ERROR("failed"))
@@ -12,6 +12,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from bgp.models import Community
+from extras.netbox import DEVICES_CURSOR_CACHE_KEY, NetBox
 from net.models import BFD, Connection
 from peering.enums import BGPState
 from peering.models import (
@@ -184,6 +185,95 @@ class Router(JobsMixin, PushedDataMixin, PrimaryModel):
     def is_netbox_device(self):
         return self.netbox_device_id != 0
 
+    @classmethod
+    def import_from_netbox(cls, full=False):
+        """
+        Creates or updates routers from devices found with the NetBox API, mapping
+        them like the NetBox webhook does, with bulk writes for each page of devices.
+
+        Unless `full` is set, only devices updated since the last import are
+        requested. Returns the numbers of created and updated routers.
+
+        Imports are run by a management command or a job, without any user, so
+        changes are not logged.
+        """
+        from core.models import CachedValue
+        from peering_manager.api.caching import invalidate_models
+        from peering_manager.statistics import invalidate_statistics
+
+        platforms = {p.slug: p for p in Platform.objects.all()}
+        cursor = None if full else cache.get(DEVICES_CURSOR_CACHE_KEY)
+        created, updated = [], []
+
+        for page in NetBox().get_device_pages(updated_since=cursor):
+            existing = cls.objects.filter(
+                Q(netbox_device_id__in=[d.id for d in page])
+                | Q(name__in=[d.name for d in page if d.name])
+            )
+            by_id = {r.netbox_device_id: r for r in existing if r.netbox_device_id}
+            by_name = {r.name: r for r in existing}
+
+            new, changed = [], []
+            for device in page:
+                if device.last_updated and device.last_updated > (cursor or ""):
+                    cursor = device.last_updated
+
+                # Platform slugs must be the same in NetBox and Peering Manager
+                platform = platforms.get(getattr(device.platform, "slug", None))
+                if not device.name or not platform:
+                    continue
+                status = (
+                    DeviceStatus.ENABLED
+                    if device.status.value == "active"
+                    else DeviceStatus.DISABLED
+                )
+
+                router = by_id.get(device.id)
+                if router is None:
+                    router = by_name.get(device.name)
+                    if router is not None and router.netbox_device_id:
+                        # Name already used by the router of another device
+                        continue
+                if router is None:
+                    router = cls(
+                        netbox_device_id=device.id,
+                        name=device.name,
+                        hostname=device.name,
+                        status=status,
+                        platform=platform,
+                        local_context_data=device.local_context_data,
+                    )
+                    by_name[router.name] = router
+                    new.append(router)
+                elif (
+                    router.netbox_device_id != device.id
+                    or router.platform_id != platform.pk
+                    or router.status != status
+                ):
+                    router.netbox_device_id = device.id
+                    router.platform = platform
+                    router.status = status
+                    router.updated = timezone.now()
+                    changed.append(router)
+
+            with transaction.atomic():
+                cls.objects.bulk_create(new)
+                cls.objects.bulk_update(
+                    changed, ["netbox_device_id", "platform", "status", "updated"]
+                )
+                CachedValue.cache_objects(new + changed)
+            created.extend(new)
+            updated.extend(changed)
+
+        if created or updated:
+            invalidate_models(cls)
+        if created:
+            invalidate_statistics(cls)
+        if cursor:
+            cache.set(DEVICES_CURSOR_CACHE_KEY, cursor, timeout=None)
+
+        return len(created), len(updated)
+
     def is_usable_for_task(self, job=None, logger=None):
         """
         Performs pre-flight checks to understand if a router is suited for background
@@ -937,6 +1027,5 @@ class Router(JobsMixin, PushedDataMixin, PrimaryModel):
 
         return True, count
 
-    def push_data(self):
-        if self.data_source and self.data_path:
-            self.data_source.push(self.data_path, self.render_configuration())
+    def render_data(self):
+        return self.render_configuration()
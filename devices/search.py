@@ -0,0 +1,15 @@
+from peering_manager.search import SearchIndex, register_search
+
+from .models import Configuration, Router
+
+
+@register_search
+class ConfigurationIndex(SearchIndex):
+    model = Configuration
+    fields = (("name", 100), ("description", 500), ("template", 1000))
+
+
+@register_search
+class RouterIndex(SearchIndex):
+    model = Router
+    fields = (("name", 100), ("hostname", 110), ("description", 500))
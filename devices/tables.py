@@ -2,7 +2,9 @@ import django_tables2 as tables
 
 from bgp.tables import CommunityColumn
 from net.models import Connection
+from peering.models import DirectPeeringSession, InternetExchangePeeringSession
 from peering_manager.tables import PeeringManagerTable, columns
+from utils.functions import count_related
 
 from .models import Configuration, Platform, Router
 
@@ -36,7 +38,8 @@ class ConfigurationTable(PeeringManagerTable):
 
 
 class PlatformTable(PeeringManagerTable):
-    router_count = tables.Column(
+    router_count = columns.Column(
+        annotations={"router_count": count_related(Router, "platform")},
         verbose_name="Routers",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
@@ -76,15 +79,24 @@ class RouterTable(PeeringManagerTable):
     encrypt_passwords = columns.BooleanColumn(verbose_name="Encrypt Password")
     poll_bgp_sessions_state = columns.BooleanColumn(verbose_name="Poll BGP Sessions")
     configuration_template = tables.Column(linkify=True, verbose_name="Configuration")
-    connection_count = tables.Column(
+    connection_count = columns.Column(
+        annotations={"connection_count": count_related(Connection, "router")},
         verbose_name="Connections",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
-    directpeeringsession_count = tables.Column(
+    directpeeringsession_count = columns.Column(
+        annotations={
+            "directpeeringsession_count": count_related(DirectPeeringSession, "router")
+        },
         verbose_name="Direct Sessions",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
-    internetexchangepeeringsession_count = tables.Column(
+    internetexchangepeeringsession_count = columns.Column(
+        annotations={
+            "internetexchangepeeringsession_count": count_related(
+                InternetExchangePeeringSession, "ixp_connection__router"
+            )
+        },
         verbose_name="IX Sessions",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
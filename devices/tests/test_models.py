@@ -1,9 +1,12 @@
 import ipaddress
+import tempfile
+from pathlib import Path
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from bgp.models import Community, Relationship
+from core.models import DataSource
 from net.models import Connection
 from peering.enums import BGPSessionStatus, BGPState
 from peering.models import (
@@ -14,7 +17,7 @@ from peering.models import (
     InternetExchangePeeringSession,
     RoutingPolicy,
 )
-from utils.testing import load_json
+from utils.testing import MockedResponse, clear_cache, load_json
 
 from ..enums import *
 from ..models import *
@@ -96,6 +99,58 @@ class RouterTest(TestCase):
     def test_is_usable_for_task(self):
         self.assertFalse(self.router.is_usable_for_task())
 
+    def test_push_many(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        data_source = DataSource.objects.create(
+            name="Local", type="local", source_url=directory.name
+        )
+        template = Configuration.objects.create(
+            name="Test", template="hostname {{ router.hostname }}"
+        )
+        routers = [
+            Router.objects.create(
+                local_autonomous_system=self.local_as,
+                name=f"Router {i}",
+                hostname=f"router{i}.example.com",
+                configuration_template=template if i < 3 else None,
+                data_source=data_source,
+                data_path=f"router{i}.conf",
+            )
+            for i in range(1, 4)
+        ]
+
+        with patch.object(
+            DataSource, "push_files", autospec=True, side_effect=DataSource.push_files
+        ) as push_files:
+            pushed, errors = Router.push_many(routers, save=True)
+        push_files.assert_called_once()
+        self.assertEqual(routers, pushed)
+        self.assertEqual({}, errors)
+        self.assertEqual(
+            "hostname router1.example.com",
+            Path(directory.name, "router1.conf").read_text(),
+        )
+        routers[0].refresh_from_db()
+        self.assertTrue(routers[0].is_pushed)
+
+        # Unchanged configurations are not pushed again
+        self.assertEqual(
+            [], data_source.push_files({r.data_path: r.render_data() for r in routers})
+        )
+
+        # Routers sharing a file are not pushed, as one would overwrite the other
+        routers[1].data_path = routers[0].data_path
+        routers[1].hostname = "other.example.com"
+        pushed, errors = Router.push_many(routers)
+        self.assertEqual([routers[2]], pushed)
+        self.assertEqual([routers[0], routers[1]], list(errors))
+        self.assertIn("is used by 2 objects", str(errors[routers[0]]))
+        self.assertEqual(
+            "hostname router1.example.com",
+            Path(directory.name, "router1.conf").read_text(),
+        )
+
     def test_get_configuration_context(self):
         for i in range(1, 6):
             AutonomousSystem.objects.create(asn=i, name=f"Test {i}")
@@ -325,3 +380,64 @@ class RouterTest(TestCase):
         error, changes = self.router.set_napalm_configuration("")
         self.assertIsNotNone(error)
         self.assertIsNone(changes)
+
+
+@override_settings(
+    NETBOX_API="http://netbox.example.net/api", NETBOX_URL="http://netbox.example.net"
+)
+class RouterNetBoxImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.platform = Platform.objects.get(slug="juniper-junos")
+        cls.router = Router.objects.create(
+            name="router01.example.net",
+            hostname="router01.example.net",
+            status=DeviceStatus.DISABLED,
+        )
+
+    def setUp(self):
+        clear_cache()
+
+    def get_devices(self, devices):
+        return MockedResponse(content={"count": len(devices), "results": devices})
+
+    def test_import_from_netbox(self):
+        devices = [
+            {
+                "id": i,
+                "name": f"router{i:02}.example.net",
+                "platform": {"id": 1, "slug": slug},
+                "status": {"value": "active", "label": "Active"},
+                "local_context_data": None,
+                "last_updated": f"2024-01-0{i}T00:00:00Z",
+            }
+            for i, slug in ((1, "juniper-junos"), (2, "juniper-junos"), (3, "other"))
+        ]
+        with patch(
+            "requests.sessions.Session.get", return_value=self.get_devices(devices)
+        ) as mocked:
+            self.assertEqual((1, 1), Router.import_from_netbox())
+        self.assertNotIn("last_updated__gte", mocked.call_args.kwargs["params"])
+
+        # Existing router is linked by name, unknown platforms are ignored
+        self.router.refresh_from_db()
+        self.assertEqual(1, self.router.netbox_device_id)
+        self.assertEqual(self.platform, self.router.platform)
+        self.assertEqual(DeviceStatus.ENABLED, self.router.status)
+        router = Router.objects.get(netbox_device_id=2)
+        self.assertEqual("router02.example.net", router.hostname)
+        self.assertEqual(2, Router.objects.count())
+
+        # Next import only requests devices updated since the last one
+        devices[1]["status"]["value"] = "offline"
+        with patch(
+            "requests.sessions.Session.get",
+            return_value=self.get_devices(devices[1:]),
+        ) as mocked:
+            self.assertEqual((0, 1), Router.import_from_netbox())
+        self.assertEqual(
+            "2024-01-03T00:00:00Z",
+            mocked.call_args.kwargs["params"]["last_updated__gte"],
+        )
+        router.refresh_from_db()
+        self.assertEqual(DeviceStatus.DISABLED, router.status)
@@ -1,5 +1,3 @@
-from django.db.models import Count
-
 from peering_manager.views.generic import (
     BulkDeleteView,
     ObjectDeleteView,
@@ -19,9 +17,7 @@ __all__ = ("PlatformBulkDelete", "PlatformDelete", "PlatformEdit", "PlatformList
 @register_model_view(model=Platform, name="list", path="", detail=False)
 class PlatformList(ObjectListView):
     permission_required = "devices.view_platform"
-    queryset = Platform.objects.annotate(
-        router_count=Count("router", distinct=True)
-    ).order_by("name")
+    queryset = Platform.objects.order_by("name")
     table = PlatformTable
     template_name = "devices/platform/list.html"
 
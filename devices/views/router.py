@@ -1,4 +1,3 @@
-from django.db.models import Count
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.views import View
@@ -42,16 +41,8 @@ __all__ = (
 @register_model_view(model=Router, name="list", path="", detail=False)
 class RouterList(ObjectListView):
     permission_required = "devices.view_router"
-    queryset = (
-        Router.objects.annotate(
-            connection_count=Count("connection", distinct=True),
-            directpeeringsession_count=Count("directpeeringsession", distinct=True),
-            internetexchangepeeringsession_count=Count(
-                "connection__internetexchangepeeringsession", distinct=True
-            ),
-        )
-        .prefetch_related("configuration_template")
-        .order_by("local_autonomous_system", "name")
+    queryset = Router.objects.prefetch_related("configuration_template").order_by(
+        "local_autonomous_system", "name"
     )
     filterset = RouterFilterSet
     filterset_form = RouterFilterForm
@@ -221,6 +221,7 @@ class WebhookSerializer(ValidatedModelSerializer):
             "conditions",
             "ssl_verification",
             "ca_file_path",
+            "batch_size",
             "created",
             "updated",
         ]
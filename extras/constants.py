@@ -10,3 +10,16 @@ Subject: {subject}
 {body}
 ```
 """
+
+# Names that cannot be used by export templates as they are used by built-in exports
+EXPORT_TEMPLATE_RESERVED_NAMES = ("csv", "ndjson", "table")
+
+# Number of seconds after which cached data of IX-API endpoints are refreshed
+IXAPI_REFRESH_INTERVALS = {
+    "network_service_configs": 300,
+    "network_services": 3600,
+    "network_features": 3600,
+    "product_offerings": 86400,
+    "macs": 300,
+    "ips": 300,
+}
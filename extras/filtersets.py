@@ -175,4 +175,5 @@ class WebhookFilterSet(BaseFilterSet):
             "secret",
             "ssl_verification",
             "ca_file_path",
+            "batch_size",
         ]
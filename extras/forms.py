@@ -305,6 +305,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
                 "additional_headers",
                 "body_template",
                 "secret",
+                "batch_size",
             ),
         ),
         ("Conditions", ("conditions",)),
@@ -329,6 +330,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
             "conditions",
             "ssl_verification",
             "ca_file_path",
+            "batch_size",
         )
         labels = {
             "type_create": "Creations",
@@ -7,7 +7,7 @@ from core.enums import LogLevel
 logger = logging.getLogger("peering.manager.extras.jobs")
 
 
-@job("default")
+@job("interactive")
 def render_export_template(export_template, job):
     job.mark_running(
         "Rendering export template.", object=export_template, logger=logger
@@ -28,3 +28,16 @@ def render_export_template(export_template, job):
     job.mark_completed(
         "Export template rendered.", object=export_template, logger=logger
     )
+
+
+@job("sync")
+def refresh_ixapi_data(ixapi, job):
+    job.mark_running("Refreshing IX-API data.", object=ixapi, logger=logger)
+
+    endpoints = ixapi.refresh_ixapi_data()
+
+    job.mark_completed(
+        f"Refreshed IX-API data for {', '.join(endpoints) or 'no endpoints'}.",
+        object=ixapi,
+        logger=logger,
+    )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2025-08-02 10:12
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("extras", "0021_ixapi_api_url_field")]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhook",
+            name="batch_size",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        )
+    ]
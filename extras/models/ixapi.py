@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
 import pyixapi
@@ -10,10 +11,13 @@ from django.core.cache import cache
 from django.db import models
 from django.db.models import Q
 from django.urls import reverse
+from django.utils.module_loading import import_string
 
 from core.constants import CENSORSHIP_STRING, CENSORSHIP_STRING_CHANGED
 from peering_manager.models import ChangeLoggedModel
 
+from ..constants import IXAPI_REFRESH_INTERVALS
+
 if TYPE_CHECKING:
     from core.models import ObjectChange
 
@@ -54,10 +58,6 @@ class IXAPI(ChangeLoggedModel):
             )
         ]
 
-    @property
-    def _cache_key(self) -> str:
-        return f"ixapi_data__{self.pk}"
-
     @property
     def version(self) -> int:
         """
@@ -200,43 +200,107 @@ class IXAPI(ChangeLoggedModel):
         accounts = self.get_accounts(id=self.identity)
         return next(accounts) if len(accounts) == 1 else None
 
-    def search_in_list(self, items, value, key="id"):
-        """
-        Looks up a value for a specific attribute (default to `id`) in a list of
-        items.
-        """
-        for i in items:
-            if hasattr(i, key) and getattr(i, key) == value:
-                return i
-        return None
+    def get_cache_key(self, endpoint) -> str:
+        return f"ixapi_data__{self.pk}__{endpoint}"
 
-    def cache_ixapi_data(self):
+    def cache_ixapi_data(self, endpoints=IXAPI_REFRESH_INTERVALS):
         """
-        Fetches all IX-API useful data and cache them, to improve lookup speed.
+        Fetches IX-API useful data and cache them, by endpoint and ID, to improve
+        lookup speed.
+
+        Each endpoint is cached along with the time after which it must be
+        refreshed, given by `IXAPI_REFRESH_INTERVALS`.
         """
         api = self.dial()
+        now = time.time()
         data = {
-            "network_service_configs": list(api.network_service_configs.all()),
-            "network_services": list(api.network_services.all()),
-            "network_features": list(api.network_features.all()),
-            "product_offerings": list(api.product_offerings.all()),
-            "macs": list(api.macs.all()),
-            "ips": list(api.ips.all()),
+            endpoint: {i.id: i for i in getattr(api, endpoint).all()}
+            for endpoint in endpoints
         }
-        cache.set(self._cache_key, data)
+        cache.set_many(
+            {
+                self.get_cache_key(endpoint): (
+                    now + IXAPI_REFRESH_INTERVALS[endpoint],
+                    items,
+                )
+                for endpoint, items in data.items()
+            },
+            timeout=settings.CACHE_IXAPI_TIMEOUT,
+        )
+
+        return data
+
+    def get_stale_endpoints(self):
+        """
+        Returns the endpoints which cached data are missing or must be refreshed.
+        """
+        cached = cache.get_many(
+            [self.get_cache_key(e) for e in IXAPI_REFRESH_INTERVALS]
+        )
+        now = time.time()
+        return [
+            endpoint
+            for endpoint in IXAPI_REFRESH_INTERVALS
+            if cached.get(self.get_cache_key(endpoint), (now, None))[0] <= now
+        ]
+
+    def refresh_ixapi_data(self):
+        """
+        Fetches and caches data of endpoints that are stale, leaving others
+        untouched. Returns the list of refreshed endpoints.
+        """
+        endpoints = self.get_stale_endpoints()
+        if endpoints:
+            self.cache_ixapi_data(endpoints)
+        cache.delete(f"ixapi_refresh__{self.pk}")
+
+        return endpoints
+
+    def enqueue_refresh_job(self):
+        """
+        Enqueues a background job to refresh stale cached data, unless one is
+        already waiting to be run.
+        """
+        timeout = min(IXAPI_REFRESH_INTERVALS.values())
+        if not cache.add(f"ixapi_refresh__{self.pk}", True, timeout=timeout):
+            return None
+
+        return apps.get_model("core", "Job").enqueue(
+            import_string("extras.jobs.refresh_ixapi_data"),
+            self,
+            name="extras.ixapi.refresh",
+            object=self,
+        )
+
+    def get_many_cached_data(self, *endpoints):
+        """
+        Retrieves cached values for IX-API endpoints, as a dict of items by ID for
+        each endpoint. Endpoints without cached data are fetched and cached before
+        returning; stale ones are returned as is and refreshed by a background job.
+        """
+        keys = {self.get_cache_key(e): e for e in endpoints}
+        cached = cache.get_many(keys)
+        data = {keys[key]: items for key, (_, items) in cached.items()}
+
+        missing = [e for e in endpoints if e not in data]
+        if missing:
+            logger.debug(
+                f"ix-api {', '.join(missing)} not cached, fetching and caching"
+            )
+            data.update(self.cache_ixapi_data(missing))
+
+        now = time.time()
+        if any(expires <= now for expires, _ in cached.values()):
+            logger.debug("ix-api cached data are stale, refreshing in background")
+            self.enqueue_refresh_job()
 
         return data
 
     def get_cached_data(self, endpoint):
         """
-        Retrieves a cached value for an IX-API endpoint. If not cached data are found,
-        build the cache and return its value.
+        Retrieves the cached value for an IX-API endpoint, as a dict of items by ID.
         """
-        cached_value = cache.get(self._cache_key)
-        if not cached_value:
-            logger.debug("ix-api data not cached, fetching and caching")
-            cached_value = self.cache_ixapi_data()
-        return cached_value.get(endpoint, [])
+        return self.get_many_cached_data(endpoint)[endpoint]
 
     def get_network_service_configs(
         self,
@@ -249,14 +313,10 @@ class IXAPI(ChangeLoggedModel):
 
         TODO: retrieve RS configurations with network feature configs
         """
-        c = []
-        network_service_configs = self.get_cached_data("network_service_configs")
+        data = self.get_many_cached_data("network_service_configs", "ips", "macs")
 
-        if not network_service_configs:
-            # Data must be cached to use this function
-            return []
-
-        for nsc in network_service_configs:
+        c = []
+        for nsc in data["network_service_configs"].values():
             # Ignore depends on state or if network service IDs don't match
             if (
                 (states and nsc.state not in states)
@@ -266,71 +326,67 @@ class IXAPI(ChangeLoggedModel):
                 continue
 
             # Resolve IP addresses
-            ips = []
-            for ip in nsc.ips:
-                i = self.search_in_list(self.get_cached_data("ips"), ip)
-                if i:
-                    ips.append(i.cidr)
-            nsc.ips = ips
+            nsc.ips = [data["ips"][i].cidr for i in nsc.ips if i in data["ips"]]
             for ip in nsc.ips:
                 setattr(nsc, f"ipv{ip.version}_address", ip)
 
             # Resolve MAC addresses
-            macs = []
-            for mac in nsc.macs:
-                m = self.search_in_list(self.get_cached_data("macs"), mac)
-                if m:
-                    macs.append(m.address.lower())
-            nsc.macs = macs
-
-            # Check if it matches a known connection
-            Connection = apps.get_model("net", "Connection")
-            qs_filter = Q()
-            if hasattr(nsc, "ipv6_address"):
-                qs_filter |= Q(ipv4_address=nsc.ipv6_address)
-            if hasattr(nsc, "ipv4_address"):
-                qs_filter |= Q(ipv4_address=nsc.ipv4_address)
-            if qs_filter:
-                try:
-                    nsc.connection = Connection.objects.get(qs_filter)
-                except (Connection.DoesNotExist, Connection.MultipleObjectsReturned):
-                    nsc.connectin = None
+            nsc.macs = [
+                data["macs"][m].address.lower() for m in nsc.macs if m in data["macs"]
+            ]
 
             c.append(nsc)
 
+        # Check if configs match known connections, looking them all up at once
+        connections = {}
+        addresses = {ip for nsc in c for ip in nsc.ips}
+        if addresses:
+            Connection = apps.get_model("net", "Connection")
+            for connection in Connection.objects.filter(
+                Q(ipv4_address__in=[ip for ip in addresses if ip.version == 4])
+                | Q(ipv6_address__in=[ip for ip in addresses if ip.version == 6])
+            ):
+                for ip in (connection.ipv4_address, connection.ipv6_address):
+                    if ip:
+                        connections.setdefault(ip, set()).add(connection)
+        for nsc in c:
+            matches = set().union(*(connections.get(ip, ()) for ip in nsc.ips))
+            nsc.connection = matches.pop() if len(matches) == 1 else None
+
         return c
 
     def get_network_services(self):
         """
         Returns all known network services assigned to us.
         """
-        network_services = self.get_cached_data("network_services")
+        data = self.get_many_cached_data(
+            "network_services", "product_offerings", "network_features", "ips"
+        )
+
+        network_service_configs = {}
+        for nsc in self.get_network_service_configs():
+            network_service_configs.setdefault(nsc.network_service, []).append(nsc)
+
+        network_services = list(data["network_services"].values())
         for ns in network_services:
             # Product IX-APi v1/v2 compatibility
             if hasattr(ns, "product"):
-                ns.product = self.search_in_list(
-                    self.get_cached_data("product_offerings"), ns.product
-                )
+                ns.product = data["product_offerings"].get(ns.product)
             if hasattr(ns, "product_offering"):
-                ns.product_offering = self.search_in_list(
-                    self.get_cached_data("product_offerings"), ns.product_offering
-                )
+                ns.product_offering = data["product_offerings"].get(ns.product_offering)
             if hasattr(ns, "ips"):
                 for ip in ns.ips:
-                    i = self.search_in_list(self.get_cached_data("ips"), ip)
-                    if i:
+                    if ip in data["ips"]:
+                        i = data["ips"][ip]
                         setattr(ns, f"subnet_v{i.network.version}", i.network)
             if hasattr(ns, "network_features"):
-                features = []
-                for feature in ns.network_features:
-                    f = self.search_in_list(
-                        self.get_cached_data("network_features"), feature
-                    )
-                    if f:
-                        features.append(f)
-                ns.network_features = features
+                ns.network_features = [
+                    data["network_features"][f]
+                    for f in ns.network_features
+                    if f in data["network_features"]
+                ]
             if not hasattr(ns, "network_service_configs"):
-                ns.network_service_configs = self.get_network_service_configs(ns)
+                ns.network_service_configs = network_service_configs.get(ns.id, [])
 
         return network_services
 
@@ -343,10 +399,13 @@ class IXAPI(ChangeLoggedModel):
         mac_address = str(mac_address).lower()
 
         # Return existing object if MAC already exists
-        for mac in self.get_cached_data("macs"):
-            if mac["address"].lower() == mac_address:
+        for mac in self.get_cached_data("macs").values():
+            if mac.address.lower() == mac_address:
                 logger.debug(f"{mac_address} already exists")
                 return mac
 
         logger.debug(f"create mac address {mac_address}")
-        return self.dial().macs.create(address=mac_address, **self.get_account_dict())
+        mac = self.dial().macs.create(address=mac_address, **self.get_account_dict())
+        # Cached MAC addresses are now outdated
+        cache.delete(self.get_cache_key("macs"))
+        return mac
@@ -7,25 +7,33 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.http import StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
+from jinja2 import TemplateSyntaxError
 from rest_framework.utils.encoders import JSONEncoder
 
-from peering_manager.jinja2 import render_jinja2
+from peering_manager.jinja2 import compile_jinja2, render_jinja2, stream_jinja2
 from peering_manager.models import (
     ChangeLoggedModel,
     ExportTemplatesMixin,
     SynchronisedDataMixin,
     TagsMixin,
 )
+from utils.functions import QuerySetStream
 
 from ..conditions import ConditionSet
+from ..constants import EXPORT_TEMPLATE_RESERVED_NAMES
 from ..enums import WEBHOOK_HTTP_CONTENT_TYPE_JSON, HttpMethod, JournalEntryKind
 from ..utils import FeatureQuery
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from django.contrib.auth.models import User
+    from django.db.models import QuerySet
 
 __all__ = ("ExportTemplate", "JournalEntry", "Webhook")
 
@@ -69,7 +77,7 @@ class ExportTemplate(SynchronisedDataMixin, ChangeLoggedModel):
     def clean(self) -> None:
         super().clean()
 
-        if self.name.lower() == "table":
+        if self.name.lower() in EXPORT_TEMPLATE_RESERVED_NAMES:
             raise ValidationError(
                 {
                     "name": f'"{self.name}" is a reserved name. Please choose a different name.'
@@ -79,12 +87,48 @@ class ExportTemplate(SynchronisedDataMixin, ChangeLoggedModel):
     def synchronise_data(self) -> None:
         self.template = self.data_file.data_as_string
 
-    def render(self) -> str:
+    def get_context(self, queryset: QuerySet | None = None) -> dict:
+        if queryset is None:
+            queryset = self.content_type.model_class().objects.all()
+        return {"dataset": queryset}
+
+    def render(self, queryset: QuerySet | None = None) -> str:
         """
         Renders the content of the export template.
+
+        If no queryset is given, all objects of the content type are exported.
         """
         return render_jinja2(
-            self.template, {"dataset": self.content_type.model_class().objects.all()}
+            self.template,
+            self.get_context(queryset),
+            trim=self.jinja2_trim,
+            lstrip=self.jinja2_lstrip,
+        )
+
+    def stream(
+        self, queryset: QuerySet | None = None, chunk_size: int = 2000
+    ) -> Iterator[str]:
+        """
+        Renders the content of the export template piece by piece.
+
+        Objects are fetched in chunks while iterating over the dataset, so the
+        memory usage does not grow with the number of exported objects.
+        """
+        context = self.get_context(queryset)
+        context["dataset"] = QuerySetStream(context["dataset"], chunk_size=chunk_size)
+        return stream_jinja2(
+            self.template, context, trim=self.jinja2_trim, lstrip=self.jinja2_lstrip
+        )
+
+    def render_to_response(
+        self, queryset: QuerySet | None = None, chunk_size: int = 2000
+    ) -> StreamingHttpResponse:
+        """
+        Returns a response streaming the rendered export template.
+        """
+        return StreamingHttpResponse(
+            self.stream(queryset, chunk_size=chunk_size),
+            content_type="text/plain; charset=utf-8",
         )
 
 
@@ -217,6 +261,11 @@ class Webhook(ChangeLoggedModel):
         verbose_name="CA File Path",
         help_text="CA certificate file to use for SSL verification. Leave blank to use the system defaults.",
     )
+    batch_size = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text="Maximum number of events sent in a single request. When greater than 1, the context of each event is available in the <code>events</code> list.",
+    )
 
     class Meta:
         ordering = ["name"]
@@ -247,6 +296,26 @@ class Webhook(ChangeLoggedModel):
                 }
             )
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Compiled templates cannot be pickled, e.g. when enqueued for a retry
+        state.pop("_compiled_templates", None)
+        return state
+
+    def _render(self, template: str, context) -> str:
+        """
+        Render one of the webhook's templates, compiling it only once for all the
+        deliveries processed with this instance.
+        """
+        compiled_templates = self.__dict__.setdefault("_compiled_templates", {})
+        if template not in compiled_templates:
+            try:
+                compiled_templates[template] = compile_jinja2(template)
+            except TemplateSyntaxError:
+                # Let the rendering report the error
+                compiled_templates[template] = template
+        return render_jinja2(compiled_templates[template], context)
+
     def render_headers(self, context) -> dict[str, str]:
         """
         Render `additional_headers` and return a dict of `Header: Value`
@@ -256,7 +325,7 @@ class Webhook(ChangeLoggedModel):
             return {}
 
         r = {}
-        data = render_jinja2(self.additional_headers, context)
+        data = self._render(self.additional_headers, context)
         for line in data.splitlines():
             header, value = line.split(":", 1)
             r[header.strip()] = value.strip()
@@ -268,11 +337,11 @@ class Webhook(ChangeLoggedModel):
         object.
         """
         if self.body_template:
-            return render_jinja2(self.body_template, context)
+            return self._render(self.body_template, context)
         return json.dumps(context, cls=JSONEncoder)
 
     def render_payload_url(self, context) -> str:
         """
         Render the payload URL.
         """
-        return render_jinja2(self.payload_url, context)
+        return self._render(self.payload_url, context)
@@ -1,18 +1,36 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import pynetbox
 from django.conf import settings
 
 if TYPE_CHECKING:
-    from pynetbox.core.response import RecordSet
+    from collections.abc import Iterator
+
+    from pynetbox.core.response import Record, RecordSet
 
 __all__ = ("NetBox",)
 
 logger = logging.getLogger("peering.manager.netbox")
 
+# Fields of devices mapped to routers, the only ones requested when importing
+DEVICE_FIELDS = (
+    "id",
+    "name",
+    "platform",
+    "status",
+    "local_context_data",
+    "last_updated",
+)
+DEVICE_PAGE_SIZE = 500
+# Last update time of the most recently updated device imported
+DEVICES_CURSOR_CACHE_KEY = "netbox_devices_cursor"
+# Number of pages fetched at the same time when `NETBOX_API_THREADING` is enabled
+DEVICE_PAGE_WORKERS = 4
+
 
 class NetBox:
     """
@@ -30,13 +48,10 @@ class NetBox:
             # Enable/disable SSL verification on user request
             self.api.http_session.verify = settings.NETBOX_API_VERIFY_SSL
 
-    def get_devices(self) -> RecordSet:
+    def get_device_filters(self) -> dict[str, list[str] | set[str]]:
         """
-        Return all devices found with the NetBox API.
+        Returns the filters devices must match to be used.
         """
-        if not settings.NETBOX_DEVICE_ROLES and not settings.NETBOX_TAGS:
-            return self.api.dcim.devices.all()
-
         filter = {}
         if settings.NETBOX_DEVICE_ROLES:
             logger.debug(
@@ -46,4 +61,48 @@ class NetBox:
         if settings.NETBOX_TAGS:
             logger.debug(f"will call dcim.devices.filter: tag={settings.NETBOX_TAGS}")
             filter["tag"] = settings.NETBOX_TAGS
+        return filter
+
+    def get_devices(self) -> RecordSet:
+        """
+        Return all devices found with the NetBox API.
+        """
+        filter = self.get_device_filters()
+        if not filter:
+            return self.api.dcim.devices.all()
         return self.api.dcim.devices.filter(**filter)
+
+    def get_device_pages(
+        self, updated_since: str | None = None, page_size: int = DEVICE_PAGE_SIZE
+    ) -> Iterator[list[Record]]:
+        """
+        Yields devices found with the NetBox API page by page, with only the fields
+        mapped to routers and, if `updated_since` is given, only the ones updated
+        since then.
+
+        Pages are fetched while previous ones are consumed, several at a time when
+        `NETBOX_API_THREADING` is enabled, so that all devices are never held in
+        memory at once.
+        """
+        filter = self.get_device_filters()
+        # Fields are ignored by NetBox < 4.0, at least skip the costly config context
+        filter.update(
+            fields=",".join(DEVICE_FIELDS), exclude="config_context", ordering="id"
+        )
+        if updated_since:
+            filter["last_updated__gte"] = updated_since
+
+        def get_page(offset):
+            return list(
+                self.api.dcim.devices.filter(limit=page_size, offset=offset, **filter)
+            )
+
+        # The first page tells how many devices there are to fetch
+        devices = self.api.dcim.devices.filter(limit=page_size, offset=0, **filter)
+        yield list(devices)
+
+        offsets = range(page_size, devices.request.count, page_size)
+        workers = DEVICE_PAGE_WORKERS if settings.NETBOX_API_THREADING else 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i in range(0, len(offsets), workers):
+                yield from pool.map(get_page, offsets[i : i + workers])
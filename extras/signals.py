@@ -1,8 +1,10 @@
 import logging
 
+from django.db.models.signals import pre_save
 from django.dispatch import Signal, receiver
 
 from peering_manager.context import webhooks_queue
+from peering_manager.models.features import ConfigContextMixin
 
 # Define a custom signal that can be sent to clear any queued webhooks
 clear_webhooks = Signal()
@@ -17,3 +19,13 @@ def clear_webhook_queue(sender, **kwargs):
         f"clearing {len(webhooks_queue.get())} queued webhooks ({sender})"
     )
     webhooks_queue.set([])
+
+
+@receiver(pre_save)
+def clear_config_context(sender, instance, **kwargs):
+    """
+    Forgets the config context resolved for an object being saved, as its local
+    context data may have changed.
+    """
+    if isinstance(instance, ConfigContextMixin):
+        instance.__dict__.pop("_config_context", None)
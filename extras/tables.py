@@ -1,6 +1,7 @@
 import django_tables2 as tables
 
 from peering_manager.tables import PeeringManagerTable, columns
+from utils.functions import count_related
 
 from .models import (
     IXAPI,
@@ -133,6 +134,9 @@ class JournalEntryTable(PeeringManagerTable):
 class TagTable(PeeringManagerTable):
     name = tables.Column(linkify=True)
     color = columns.ColourColumn()
+    items = columns.Column(
+        annotations={"items": count_related(TaggedItem, "tag")}, verbose_name="Items"
+    )
 
     class Meta(PeeringManagerTable.Meta):
         model = Tag
@@ -181,6 +185,7 @@ class WebhookTable(PeeringManagerTable):
             "secret",
             "ssl_validation",
             "ca_file_path",
+            "batch_size",
             "created",
             "last_updated",
         )
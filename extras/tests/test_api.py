@@ -1,3 +1,4 @@
+import json
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
@@ -148,6 +149,87 @@ class ExportTemplateTest(APIViewTestCases.View):
             },
         ]
 
+    def _create_autonomous_systems(self):
+        AutonomousSystem.objects.bulk_create(
+            [
+                AutonomousSystem(asn=64500 + i, name=f"AS {i}", affiliated=i == 0)
+                for i in range(5)
+            ]
+        )
+        ExportTemplate.objects.create(
+            content_type=ContentType.objects.get_for_model(AutonomousSystem),
+            name="ASNs",
+            template="{% for a in dataset %}{{ a.asn }}\n{% endfor %}{{ dataset | length }}",
+        )
+
+    def test_export_template(self):
+        self._create_autonomous_systems()
+        url = reverse("peering-api:autonomoussystem-list")
+
+        response = self.client.get(f"{url}?export=ASNs&affiliated=false", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(
+            b"".join(response.streaming_content).decode(),
+            "64501\n64502\n64503\n64504\n4",
+        )
+
+        response = self.client.get(f"{url}?export=Unknown", **self.header)
+        self.assertHttpStatus(response, status.HTTP_404_NOT_FOUND)
+
+    def test_export_template_queries(self):
+        self._create_autonomous_systems()
+        ExportTemplate.objects.create(
+            content_type=ContentType.objects.get_for_model(AutonomousSystem),
+            name="Filtered",
+            template=(
+                "{{ dataset | filter(affiliated=False) | length }} "
+                "{{ (dataset | get(asn=64501)).name }} "
+                "{{ dataset.filter(asn__gte=64503).order_by('-asn') | join(',', attribute='asn') }} "
+                "{{ dataset.count() }}"
+            ),
+        )
+        url = reverse("peering-api:autonomoussystem-list")
+
+        # Token and template lookups, then filters and queryset methods run by the
+        # database, without loading the whole table
+        with self.assertNumQueries(8):
+            response = self.client.get(f"{url}?export=Filtered", **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual(
+                b"".join(response.streaming_content).decode(), "4 AS 1 64504,64503 5"
+            )
+
+    def test_export_ndjson(self):
+        self._create_autonomous_systems()
+        url = reverse("peering-api:autonomoussystem-list")
+
+        response = self.client.get(
+            f"{url}?export=ndjson&fields=asn,name&asn__gte=64503", **self.header
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [
+                json.loads(line)
+                for line in b"".join(response.streaming_content).splitlines()
+            ],
+            [{"asn": 64503, "name": "AS 3"}, {"asn": 64504, "name": "AS 4"}],
+        )
+
+    def test_export_csv(self):
+        self._create_autonomous_systems()
+        url = reverse("peering-api:autonomoussystem-list")
+
+        response = self.client.get(
+            f"{url}?export=csv&fields=asn,name,tags&asn__lte=64501", **self.header
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            b"".join(response.streaming_content).decode().splitlines(),
+            ["asn,name,tags", "64500,AS 0,", "64501,AS 1,"],
+        )
+
 
 class IXAPITest(APIViewTestCases.View):
     model = IXAPI
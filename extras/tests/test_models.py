@@ -1,12 +1,16 @@
+import json
+from pathlib import Path
 from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
+from net.models import Connection
 from peering.models import AutonomousSystem
-from utils.testing import MockedResponse
+from utils.testing import MockedResponse, clear_cache
 
-from ..models import IXAPI, ExportTemplate
+from ..models import IXAPI, ConfigContext, ConfigContextAssignment, ExportTemplate
 
 
 class ExportTemplateTest(TestCase):
@@ -21,6 +25,104 @@ class ExportTemplateTest(TestCase):
         self.assertEqual("0", self.export_template.render())
 
 
+class ConfigContextTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.autonomous_systems = AutonomousSystem.objects.bulk_create(
+            [AutonomousSystem(asn=i, name=f"AS {i}") for i in range(64500, 64503)]
+        )
+        cls.contexts = ConfigContext.objects.bulk_create(
+            [
+                ConfigContext(name="Context 1", data={"a": 1, "list": [1]}),
+                ConfigContext(name="Context 2", data={"b": 2, "list": [2]}),
+            ]
+        )
+        content_type = ContentType.objects.get_for_model(AutonomousSystem)
+        ConfigContextAssignment.objects.bulk_create(
+            [
+                ConfigContextAssignment(
+                    content_type=content_type,
+                    object_id=cls.autonomous_systems[0].pk,
+                    config_context=cls.contexts[0],
+                    weight=1,
+                ),
+                ConfigContextAssignment(
+                    content_type=content_type,
+                    object_id=cls.autonomous_systems[0].pk,
+                    config_context=cls.contexts[1],
+                    weight=2,
+                ),
+                ConfigContextAssignment(
+                    content_type=content_type,
+                    object_id=cls.autonomous_systems[1].pk,
+                    config_context=cls.contexts[1],
+                ),
+            ]
+        )
+
+    def setUp(self):
+        clear_cache()
+
+    def test_get_config_context(self):
+        autonomous_system = self.autonomous_systems[0]
+        expected = {"a": 1, "b": 2, "list": [2]}
+        self.assertEqual(expected, autonomous_system.get_config_context())
+        # Kept by the object, callers get their own copy
+        with self.assertNumQueries(0):
+            autonomous_system.get_config_context()["list"].append(3)
+            self.assertEqual(expected, autonomous_system.get_config_context())
+        # Cached, only assignments are looked up
+        autonomous_system.refresh_from_db()
+        with self.assertNumQueries(1):
+            self.assertEqual(expected, autonomous_system.get_config_context())
+
+        # Changes to contexts, assignments and local data are seen once reloaded
+        self.contexts[1].data = {"b": 3}
+        self.contexts[1].save()
+        autonomous_system.refresh_from_db()
+        self.assertEqual(
+            {"a": 1, "b": 3, "list": [1]}, autonomous_system.get_config_context()
+        )
+        ConfigContextAssignment.objects.filter(config_context=self.contexts[0]).delete()
+        autonomous_system.refresh_from_db()
+        self.assertEqual({"b": 3}, autonomous_system.get_config_context())
+        autonomous_system.local_context_data = {"c": 4}
+        autonomous_system.save()
+        self.assertEqual({"b": 3, "c": 4}, autonomous_system.get_config_context())
+
+        self.assertIsNone(self.autonomous_systems[2].get_config_context())
+
+    @override_settings(CACHE_CONFIG_CONTEXT_TIMEOUT=0)
+    def test_get_config_context_without_cache(self):
+        self.assertEqual(
+            {"a": 1, "b": 2, "list": [2]},
+            self.autonomous_systems[0].get_config_context(),
+        )
+
+    def test_prefetch_config_contexts(self):
+        autonomous_systems = list(AutonomousSystem.objects.order_by("asn"))
+        with self.assertNumQueries(2):
+            AutonomousSystem.prefetch_config_contexts(autonomous_systems)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [{"a": 1, "b": 2, "list": [2]}, {"b": 2, "list": [2]}, None],
+                [a.get_config_context() for a in autonomous_systems],
+            )
+        # Objects with the same contexts do not share them
+        autonomous_systems[0].get_config_context()["list"].append(3)
+        self.assertEqual(
+            {"a": 1, "b": 2, "list": [2]}, autonomous_systems[0].get_config_context()
+        )
+
+        # Cached contexts are not fetched again
+        autonomous_systems = list(AutonomousSystem.objects.order_by("asn"))
+        with self.assertNumQueries(1):
+            AutonomousSystem.prefetch_config_contexts(autonomous_systems)
+        self.assertEqual(
+            {"b": 2, "list": [2]}, autonomous_systems[1].get_config_context()
+        )
+
+
 class IXAPITest(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -48,6 +150,9 @@ class IXAPITest(TestCase):
         )
         cls.ix_api = IXAPI.objects.get(name="IXP 1")
 
+    def setUp(self):
+        clear_cache()
+
     @patch(
         "requests.sessions.Session.post",
         return_value=MockedResponse(
@@ -156,20 +261,84 @@ class IXAPITest(TestCase):
                 MockedResponse(
                     fixture="extras/tests/fixtures/ix_api/network_service_configs.json"
                 ),
-                MockedResponse(
-                    fixture="extras/tests/fixtures/ix_api/network_services.json"
-                ),
-                MockedResponse(
-                    fixture="extras/tests/fixtures/ix_api/network_features.json"
-                ),
-                MockedResponse(fixture="extras/tests/fixtures/ix_api/products.json"),
-                MockedResponse(fixture="extras/tests/fixtures/ix_api/macs.json"),
                 MockedResponse(fixture="extras/tests/fixtures/ix_api/ips.json"),
+                MockedResponse(fixture="extras/tests/fixtures/ix_api/macs.json"),
             ],
         ):
             i = self.ix_api.get_network_service_configs()
             self.assertEqual("1234", i[0].id)
             self.assertEqual("production", i[0].state)
+            self.assertIsNone(i[0].connection)
+
+    @patch(
+        "requests.sessions.Session.post",
+        return_value=MockedResponse(
+            fixture="extras/tests/fixtures/ix_api/authenticate.json"
+        ),
+    )
+    @patch("pyixapi.core.api.API.version", return_value=1)
+    def test_get_network_service_configs_connection(self, *_):
+        connection = Connection.objects.create(
+            ipv6_address="2001:db8::/64", ipv4_address="192.0.2.0/24"
+        )
+        configs = json.loads(
+            Path(
+                "extras/tests/fixtures/ix_api/network_service_configs.json"
+            ).read_text()
+        )
+        configs[0]["ips"] = ["1234", "5678"]
+        configs[0]["macs"] = ["1234"]
+        with patch(
+            "requests.sessions.Session.get",
+            side_effect=[
+                MockedResponse(content=configs),
+                MockedResponse(fixture="extras/tests/fixtures/ix_api/ips.json"),
+                MockedResponse(fixture="extras/tests/fixtures/ix_api/macs.json"),
+            ],
+        ):
+            i = self.ix_api.get_network_service_configs()
+            self.assertEqual(connection, i[0].connection)
+            self.assertEqual(["aa:bb:cc:dd:ee:ff"], i[0].macs)
+            self.assertEqual("192.0.2.0/24", str(i[0].ipv4_address))
+            self.assertEqual("2001:db8::/64", str(i[0].ipv6_address))
+
+    @patch(
+        "requests.sessions.Session.post",
+        return_value=MockedResponse(
+            fixture="extras/tests/fixtures/ix_api/authenticate.json"
+        ),
+    )
+    @patch("pyixapi.core.api.API.version", return_value=1)
+    def test_cached_data_refresh(self, *_):
+        with patch(
+            "requests.sessions.Session.get",
+            return_value=MockedResponse(
+                fixture="extras/tests/fixtures/ix_api/macs.json"
+            ),
+        ) as get:
+            self.assertEqual(["1234"], list(self.ix_api.get_cached_data("macs")))
+            self.assertEqual(1, get.call_count)
+
+            # Fresh data are not fetched again
+            with patch.object(IXAPI, "enqueue_refresh_job") as enqueue:
+                self.ix_api.get_cached_data("macs")
+                enqueue.assert_not_called()
+            self.assertEqual(1, get.call_count)
+            self.assertNotIn("macs", self.ix_api.get_stale_endpoints())
+
+            # Stale data are used while being refreshed in background
+            key = self.ix_api.get_cache_key("macs")
+            cache.set(key, (0, cache.get(key)[1]))
+            with patch.object(IXAPI, "enqueue_refresh_job") as enqueue:
+                self.assertIn("1234", self.ix_api.get_cached_data("macs"))
+                enqueue.assert_called_once()
+            self.assertEqual(1, get.call_count)
+
+            # Only stale endpoints are refreshed
+            with patch.object(IXAPI, "get_stale_endpoints", return_value=["macs"]):
+                self.assertEqual(["macs"], self.ix_api.refresh_ixapi_data())
+            self.assertEqual(2, get.call_count)
+            self.assertNotIn("macs", self.ix_api.get_stale_endpoints())
 
     @patch(
         "requests.sessions.Session.post",
@@ -182,18 +351,18 @@ class IXAPITest(TestCase):
         with patch(
             "requests.sessions.Session.get",
             side_effect=[
-                MockedResponse(
-                    fixture="extras/tests/fixtures/ix_api/network_service_configs.json"
-                ),
                 MockedResponse(
                     fixture="extras/tests/fixtures/ix_api/network_services.json"
                 ),
+                MockedResponse(fixture="extras/tests/fixtures/ix_api/products.json"),
                 MockedResponse(
                     fixture="extras/tests/fixtures/ix_api/network_features.json"
                 ),
-                MockedResponse(fixture="extras/tests/fixtures/ix_api/products.json"),
-                MockedResponse(fixture="extras/tests/fixtures/ix_api/macs.json"),
                 MockedResponse(fixture="extras/tests/fixtures/ix_api/ips.json"),
+                MockedResponse(
+                    fixture="extras/tests/fixtures/ix_api/network_service_configs.json"
+                ),
+                MockedResponse(fixture="extras/tests/fixtures/ix_api/macs.json"),
             ],
         ):
             i = self.ix_api.get_network_services()
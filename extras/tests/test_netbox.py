@@ -1,7 +1,7 @@
 from unittest.mock import patch
 
 import pynetbox
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from utils.testing import MockedResponse
 
@@ -41,3 +41,29 @@ class NetBoxTestCase(TestCase):
         self.assertEqual(2, len(devices))
         self.assertEqual("router01.example.net", next(devices).name)
         self.assertEqual("router02.example.net", next(devices).name)
+
+    @override_settings(NETBOX_API_THREADING=True)
+    def test_get_device_pages(self):
+        def get(url, params=None, **kwargs):
+            offset = params["offset"]
+            return MockedResponse(
+                content={
+                    "count": 5,
+                    "results": [
+                        {"id": i, "name": f"router{i:02}.example.net"}
+                        for i in range(offset + 1, min(offset + 2, 5) + 1)
+                    ],
+                }
+            )
+
+        with patch("requests.sessions.Session.get", side_effect=get) as mocked:
+            pages = list(
+                self.netbox.get_device_pages(
+                    updated_since="2024-01-01T00:00:00Z", page_size=2
+                )
+            )
+
+        self.assertEqual([[1, 2], [3, 4], [5]], [[d.id for d in p] for p in pages])
+        params = mocked.call_args.kwargs["params"]
+        self.assertEqual("2024-01-01T00:00:00Z", params["last_updated__gte"])
+        self.assertIn("platform", params["fields"].split(","))
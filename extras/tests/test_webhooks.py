@@ -5,17 +5,24 @@ from unittest.mock import patch
 import django_rq
 from django.contrib.contenttypes.models import ContentType
 from django.http import HttpResponse
+from django.test import override_settings
 from django.urls import reverse
-from requests import Session
+from requests import RequestException, Session
 from rest_framework import status
 
 from core.enums import ObjectChangeAction
+from core.models import ObjectChange
 from peering.models import AutonomousSystem
 from utils.testing import APITestCase
 
 from ..models import Tag, Webhook
-from ..webhooks import enqueue_object, flush_webhooks, generate_signature
-from ..workers import process_webhook
+from ..webhooks import (
+    enqueue_object,
+    enqueue_objects,
+    flush_webhooks,
+    generate_signature,
+)
+from ..workers import get_session, process_webhooks
 
 
 class WebhookTest(APITestCase):
@@ -25,6 +32,9 @@ class WebhookTest(APITestCase):
         # Make sure the queue is empty before testing
         self.queue = django_rq.get_queue("default")
         self.queue.empty()
+        registry = self.queue.scheduled_job_registry
+        for job_id in registry.get_job_ids():
+            registry.remove(job_id, delete_job=True)
 
     @classmethod
     def setUpTestData(cls):
@@ -82,13 +92,15 @@ class WebhookTest(APITestCase):
         self.assertEqual(self.queue.count, 1)
         job = self.queue.jobs[0]
         self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_create=True))
-        self.assertEqual(job.kwargs["event"], ObjectChangeAction.CREATE)
-        self.assertEqual(job.kwargs["model_name"], "autonomoussystem")
-        self.assertEqual(job.kwargs["data"]["id"], response.data["id"])
-        self.assertEqual(len(job.kwargs["data"]["tags"]), len(response.data["tags"]))
-        self.assertEqual(job.kwargs["snapshots"]["postchange"]["name"], "AS 1")
+        self.assertEqual(len(job.kwargs["deliveries"]), 1)
+        delivery = job.kwargs["deliveries"][0]
+        self.assertEqual(delivery["event"], ObjectChangeAction.CREATE)
+        self.assertEqual(delivery["model_name"], "autonomoussystem")
+        self.assertEqual(delivery["data"]["id"], response.data["id"])
+        self.assertEqual(len(delivery["data"]["tags"]), len(response.data["tags"]))
+        self.assertEqual(delivery["snapshots"]["postchange"]["name"], "AS 1")
         self.assertEqual(
-            sorted(job.kwargs["snapshots"]["postchange"]["tags"]), ["Bar", "Foo"]
+            sorted(delivery["snapshots"]["postchange"]["tags"]), ["Bar", "Foo"]
         )
 
     def test_enqueue_webhook_bulk_create(self):
@@ -104,23 +116,23 @@ class WebhookTest(APITestCase):
         self.assertEqual(AutonomousSystem.objects.count(), 3)
         self.assertEqual(AutonomousSystem.objects.first().tags.count(), 2)
 
-        # Verify that a webhook was queued for each object
-        self.assertEqual(self.queue.count, 3)
-        for i, job in enumerate(self.queue.jobs):
-            self.assertEqual(
-                job.kwargs["webhook"], Webhook.objects.get(type_create=True)
-            )
-            self.assertEqual(job.kwargs["event"], ObjectChangeAction.CREATE)
-            self.assertEqual(job.kwargs["model_name"], "autonomoussystem")
-            self.assertEqual(job.kwargs["data"]["id"], response.data[i]["id"])
+        # Verify that a single job was queued for all objects
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_create=True))
+        self.assertEqual(len(job.kwargs["deliveries"]), 3)
+        for i, delivery in enumerate(job.kwargs["deliveries"]):
+            self.assertEqual(delivery["event"], ObjectChangeAction.CREATE)
+            self.assertEqual(delivery["model_name"], "autonomoussystem")
+            self.assertEqual(delivery["data"]["id"], response.data[i]["id"])
             self.assertEqual(
-                len(job.kwargs["data"]["tags"]), len(response.data[i]["tags"])
+                len(delivery["data"]["tags"]), len(response.data[i]["tags"])
             )
             self.assertEqual(
-                job.kwargs["snapshots"]["postchange"]["name"], response.data[i]["name"]
+                delivery["snapshots"]["postchange"]["name"], response.data[i]["name"]
             )
             self.assertEqual(
-                sorted(job.kwargs["snapshots"]["postchange"]["tags"]), ["Bar", "Foo"]
+                sorted(delivery["snapshots"]["postchange"]["tags"]), ["Bar", "Foo"]
             )
 
     def test_enqueue_webhook_update(self):
@@ -141,16 +153,18 @@ class WebhookTest(APITestCase):
         self.assertEqual(self.queue.count, 1)
         job = self.queue.jobs[0]
         self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_update=True))
-        self.assertEqual(job.kwargs["event"], ObjectChangeAction.UPDATE)
-        self.assertEqual(job.kwargs["model_name"], "autonomoussystem")
-        self.assertEqual(job.kwargs["data"]["id"], asn.pk)
-        self.assertEqual(len(job.kwargs["data"]["tags"]), len(response.data["tags"]))
-        self.assertEqual(job.kwargs["snapshots"]["prechange"]["name"], "AS 1")
+        self.assertEqual(len(job.kwargs["deliveries"]), 1)
+        delivery = job.kwargs["deliveries"][0]
+        self.assertEqual(delivery["event"], ObjectChangeAction.UPDATE)
+        self.assertEqual(delivery["model_name"], "autonomoussystem")
+        self.assertEqual(delivery["data"]["id"], asn.pk)
+        self.assertEqual(len(delivery["data"]["tags"]), len(response.data["tags"]))
+        self.assertEqual(delivery["snapshots"]["prechange"]["name"], "AS 1")
         self.assertEqual(
-            sorted(job.kwargs["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
+            sorted(delivery["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
         )
-        self.assertEqual(job.kwargs["snapshots"]["postchange"]["name"], "My AS")
-        self.assertEqual(sorted(job.kwargs["snapshots"]["postchange"]["tags"]), ["Baz"])
+        self.assertEqual(delivery["snapshots"]["postchange"]["name"], "My AS")
+        self.assertEqual(sorted(delivery["snapshots"]["postchange"]["tags"]), ["Baz"])
 
     def test_enqueue_webhook_bulk_update(self):
         asns = (
@@ -173,26 +187,26 @@ class WebhookTest(APITestCase):
         self.assertHttpStatus(response, status.HTTP_200_OK)
 
         # Verify that a job was queued for the object update webhook
-        self.assertEqual(self.queue.count, 3)
-        for i, job in enumerate(self.queue.jobs):
-            self.assertEqual(
-                job.kwargs["webhook"], Webhook.objects.get(type_update=True)
-            )
-            self.assertEqual(job.kwargs["event"], ObjectChangeAction.UPDATE)
-            self.assertEqual(job.kwargs["model_name"], "autonomoussystem")
-            self.assertEqual(job.kwargs["data"]["id"], data[i]["id"])
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_update=True))
+        self.assertEqual(len(job.kwargs["deliveries"]), 3)
+        for i, delivery in enumerate(job.kwargs["deliveries"]):
+            self.assertEqual(delivery["event"], ObjectChangeAction.UPDATE)
+            self.assertEqual(delivery["model_name"], "autonomoussystem")
+            self.assertEqual(delivery["data"]["id"], data[i]["id"])
             self.assertEqual(
-                len(job.kwargs["data"]["tags"]), len(response.data[i]["tags"])
+                len(delivery["data"]["tags"]), len(response.data[i]["tags"])
             )
-            self.assertEqual(job.kwargs["snapshots"]["prechange"]["name"], asns[i].name)
+            self.assertEqual(delivery["snapshots"]["prechange"]["name"], asns[i].name)
             self.assertEqual(
-                sorted(job.kwargs["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
+                sorted(delivery["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
             )
             self.assertEqual(
-                job.kwargs["snapshots"]["postchange"]["name"], response.data[i]["name"]
+                delivery["snapshots"]["postchange"]["name"], response.data[i]["name"]
             )
             self.assertEqual(
-                sorted(job.kwargs["snapshots"]["postchange"]["tags"]), ["Baz"]
+                sorted(delivery["snapshots"]["postchange"]["tags"]), ["Baz"]
             )
 
     def test_enqueue_webhook_delete(self):
@@ -208,12 +222,14 @@ class WebhookTest(APITestCase):
         self.assertEqual(self.queue.count, 1)
         job = self.queue.jobs[0]
         self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_delete=True))
-        self.assertEqual(job.kwargs["event"], ObjectChangeAction.DELETE)
-        self.assertEqual(job.kwargs["model_name"], "autonomoussystem")
-        self.assertEqual(job.kwargs["data"]["id"], asn.pk)
-        self.assertEqual(job.kwargs["snapshots"]["prechange"]["name"], "AS 1")
+        self.assertEqual(len(job.kwargs["deliveries"]), 1)
+        delivery = job.kwargs["deliveries"][0]
+        self.assertEqual(delivery["event"], ObjectChangeAction.DELETE)
+        self.assertEqual(delivery["model_name"], "autonomoussystem")
+        self.assertEqual(delivery["data"]["id"], asn.pk)
+        self.assertEqual(delivery["snapshots"]["prechange"]["name"], "AS 1")
         self.assertEqual(
-            sorted(job.kwargs["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
+            sorted(delivery["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
         )
 
     def test_enqueue_webhook_bulk_delete(self):
@@ -233,19 +249,116 @@ class WebhookTest(APITestCase):
         self.assertHttpStatus(response, status.HTTP_204_NO_CONTENT)
 
         # Verify that a job was queued for the object update webhook
-        self.assertEqual(self.queue.count, 3)
-        for i, job in enumerate(self.queue.jobs):
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_delete=True))
+        self.assertEqual(len(job.kwargs["deliveries"]), 3)
+        for i, delivery in enumerate(job.kwargs["deliveries"]):
+            self.assertEqual(delivery["event"], ObjectChangeAction.DELETE)
+            self.assertEqual(delivery["model_name"], "autonomoussystem")
+            self.assertEqual(delivery["data"]["id"], asns[i].pk)
+            self.assertEqual(delivery["snapshots"]["prechange"]["name"], asns[i].name)
             self.assertEqual(
-                job.kwargs["webhook"], Webhook.objects.get(type_delete=True)
+                sorted(delivery["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
+            )
+
+    def test_enqueue_webhook_set_based_bulk_update(self):
+        asns = (
+            AutonomousSystem(asn=64500, name="AS 1"),
+            AutonomousSystem(asn=64501, name="AS 2"),
+            AutonomousSystem(asn=64502, name="AS 3"),
+        )
+        AutonomousSystem.objects.bulk_create(asns)
+        for asn in asns:
+            asn.tags.set(Tag.objects.filter(name__in=["Foo", "Bar"]))
+
+        # Update three objects via the REST API using set-based writes
+        data = [
+            {"id": asns[0].pk, "name": "ASN 1"},
+            {"id": asns[1].pk, "name": "ASN 2"},
+            {"id": asns[2].pk, "name": "ASN 3"},
+        ]
+        url = f"{reverse('peering-api:autonomoussystem-list')}?set_based=true"
+        response = self.client.patch(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(AutonomousSystem.objects.values_list("name", flat=True)),
+            ["ASN 1", "ASN 2", "ASN 3"],
+        )
+
+        # Verify that a single job was queued for all objects
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.func_name, "extras.workers.process_webhooks")
+        self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_update=True))
+        self.assertEqual(len(job.kwargs["deliveries"]), 3)
+        for i, delivery in enumerate(job.kwargs["deliveries"]):
+            self.assertEqual(delivery["event"], ObjectChangeAction.UPDATE)
+            self.assertEqual(delivery["model_name"], "autonomoussystem")
+            self.assertEqual(delivery["data"]["id"], data[i]["id"])
+            self.assertEqual(len(delivery["data"]["tags"]), 2)
+            self.assertEqual(delivery["snapshots"]["prechange"]["name"], asns[i].name)
+            self.assertEqual(
+                delivery["snapshots"]["postchange"]["name"], data[i]["name"]
             )
-            self.assertEqual(job.kwargs["event"], ObjectChangeAction.DELETE)
-            self.assertEqual(job.kwargs["model_name"], "autonomoussystem")
-            self.assertEqual(job.kwargs["data"]["id"], asns[i].pk)
-            self.assertEqual(job.kwargs["snapshots"]["prechange"]["name"], asns[i].name)
             self.assertEqual(
-                sorted(job.kwargs["snapshots"]["prechange"]["tags"]), ["Bar", "Foo"]
+                sorted(delivery["snapshots"]["postchange"]["tags"]), ["Bar", "Foo"]
             )
 
+        # Verify that changes were logged for each object
+        changes = ObjectChange.objects.filter(
+            changed_object_type=ContentType.objects.get_for_model(AutonomousSystem),
+            action=ObjectChangeAction.UPDATE,
+        ).order_by("changed_object_id")
+        self.assertEqual(len(changes), 3)
+        for i, change in enumerate(changes):
+            self.assertEqual(change.changed_object_id, asns[i].pk)
+            self.assertEqual(change.user, self.user)
+            self.assertEqual(change.user_name, self.user.username)
+            self.assertEqual(change.object_repr, str(change.changed_object))
+            self.assertEqual(change.prechange_data["name"], asns[i].name)
+            self.assertEqual(change.postchange_data["name"], data[i]["name"])
+            self.assertNotIn("updated", change.postchange_data)
+
+    def test_enqueue_webhook_set_based_bulk_delete(self):
+        asns = (
+            AutonomousSystem(asn=64500, name="AS 1"),
+            AutonomousSystem(asn=64501, name="AS 2"),
+            AutonomousSystem(asn=64502, name="AS 3"),
+        )
+        AutonomousSystem.objects.bulk_create(asns)
+        for asn in asns:
+            asn.tags.set(Tag.objects.filter(name__in=["Foo", "Bar"]))
+
+        # Delete three objects via the REST API using set-based writes
+        data = [{"id": asn.pk} for asn in asns]
+        url = f"{reverse('peering-api:autonomoussystem-list')}?set_based=true"
+        response = self.client.delete(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(AutonomousSystem.objects.exists())
+
+        # Verify that a single job was queued for all objects
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.func_name, "extras.workers.process_webhooks")
+        self.assertEqual(job.kwargs["webhook"], Webhook.objects.get(type_delete=True))
+        self.assertEqual(len(job.kwargs["deliveries"]), 3)
+        for i, delivery in enumerate(job.kwargs["deliveries"]):
+            self.assertEqual(delivery["event"], ObjectChangeAction.DELETE)
+            self.assertEqual(delivery["data"]["id"], asns[i].pk)
+            self.assertEqual(delivery["snapshots"]["prechange"]["name"], asns[i].name)
+            self.assertIsNone(delivery["snapshots"]["postchange"])
+
+        # Verify that each deletion was logged only once
+        changes = ObjectChange.objects.filter(
+            changed_object_type=ContentType.objects.get_for_model(AutonomousSystem),
+            action=ObjectChangeAction.DELETE,
+        )
+        self.assertEqual(
+            sorted(changes.values_list("changed_object_id", flat=True)),
+            sorted(asn.pk for asn in asns),
+        )
+
     def test_worker(self):
         request_id = uuid.uuid4()
 
@@ -265,7 +378,9 @@ class WebhookTest(APITestCase):
             # Validate the outgoing request body
             body = json.loads(request.body)
             self.assertEqual(body["event"], ObjectChangeAction.CREATE)
-            self.assertEqual(body["timestamp"], job.kwargs["timestamp"])
+            self.assertEqual(
+                body["timestamp"], job.kwargs["deliveries"][0]["timestamp"]
+            )
             self.assertEqual(body["model"], "autonomoussystem")
             self.assertEqual(body["username"], "testuser")
             self.assertEqual(body["request_id"], str(request_id))
@@ -290,4 +405,102 @@ class WebhookTest(APITestCase):
 
         # Patch the Session object with our dummy_send() method, then process the webhook for sending
         with patch.object(Session, "send", mock_send) as mock_send:
-            process_webhook(**job.kwargs)
+            process_webhooks(**job.kwargs)
+
+    def _enqueue_deliveries(self, count):
+        webhooks_queue = []
+        enqueue_objects(
+            webhooks_queue,
+            instances=[
+                AutonomousSystem.objects.create(asn=64500 + i, name=f"AS {i}")
+                for i in range(count)
+            ],
+            user=self.user,
+            request_id=uuid.uuid4(),
+            action=ObjectChangeAction.CREATE,
+        )
+        flush_webhooks(webhooks_queue)
+        return self.queue.jobs[0]
+
+    def test_worker_single_session(self):
+        job = self._enqueue_deliveries(3)
+        sessions = set()
+
+        def mock_send(session, request, **kwargs):
+            sessions.add(session)
+            return HttpResponse()
+
+        with patch.object(Session, "send", mock_send):
+            process_webhooks(**job.kwargs)
+
+        # All deliveries went through the same connection pool
+        self.assertEqual(len(sessions), 1)
+
+    def test_session_per_webhook(self):
+        webhooks = list(Webhook.objects.all()[:2])
+        self.assertIs(get_session(webhooks[0]), get_session(webhooks[0]))
+        # Cookies set by an endpoint are not sent to the one of another webhook
+        self.assertIsNot(get_session(webhooks[0]), get_session(webhooks[1]))
+
+    def test_worker_batch(self):
+        Webhook.objects.filter(type_create=True).update(batch_size=2)
+        job = self._enqueue_deliveries(3)
+        bodies = []
+
+        def mock_send(_, request, **kwargs):
+            bodies.append(json.loads(request.body))
+            return HttpResponse()
+
+        with patch.object(Session, "send", mock_send):
+            process_webhooks(**job.kwargs)
+
+        # Events are sent by two, the default body holding the list of their contexts
+        self.assertEqual([len(body["events"]) for body in bodies], [2, 1])
+        self.assertEqual(
+            [event["data"]["name"] for body in bodies for event in body["events"]],
+            ["AS 0", "AS 1", "AS 2"],
+        )
+
+    @override_settings(WEBHOOK_RETRIES=1, WEBHOOK_RETRY_BACKOFF=10)
+    def test_worker_retry(self):
+        job = self._enqueue_deliveries(3)
+        self.queue.empty()
+
+        def mock_send(_, request, **kwargs):
+            body = json.loads(request.body)
+            return HttpResponse(status=500 if body["data"]["name"] == "AS 1" else 200)
+
+        # Only the failed delivery is scheduled to be retried
+        with patch.object(Session, "send", mock_send):
+            process_webhooks(**job.kwargs)
+        registry = self.queue.scheduled_job_registry
+        self.assertEqual(registry.count, 1)
+        retry = self.queue.fetch_job(registry.get_job_ids()[0])
+        self.assertEqual(retry.kwargs["attempt"], 2)
+        self.assertEqual(
+            [d["data"]["name"] for d in retry.kwargs["deliveries"]], ["AS 1"]
+        )
+
+        # Once retries are exhausted, the job fails with the remaining deliveries
+        with (
+            patch.object(Session, "send", mock_send),
+            self.assertRaises(RequestException),
+        ):
+            process_webhooks(**retry.kwargs)
+        registry.remove(retry, delete_job=True)
+
+    @override_settings(WEBHOOK_RETRIES=1)
+    def test_worker_render_error_not_retried(self):
+        Webhook.objects.filter(type_create=True).update(
+            additional_headers="Invalid header"
+        )
+        job = self._enqueue_deliveries(2)
+        self.queue.empty()
+
+        with (
+            patch.object(Session, "send", return_value=HttpResponse()) as send,
+            self.assertRaises(RequestException),
+        ):
+            process_webhooks(**job.kwargs)
+        send.assert_not_called()
+        self.assertEqual(self.queue.scheduled_job_registry.count, 0)
@@ -25,11 +25,15 @@ def serialize_for_webhook(instance):
 
 
 def get_snapshots(instance, action):
+    postchange = None
+    if action != ObjectChangeAction.DELETE:
+        postchange = getattr(instance, "_postchange_snapshot", None)
+        if postchange is None:
+            postchange = serialize_object(instance)
+
     return {
         "prechange": getattr(instance, "_prechange_snapshot", None),
-        "postchange": (
-            serialize_object(instance) if action != ObjectChangeAction.DELETE else None
-        ),
+        "postchange": postchange,
     }
 
 
@@ -62,12 +66,42 @@ def enqueue_object(queue, instance, user, request_id, action):
     )
 
 
+def enqueue_objects(queue, instances, user, request_id, action):
+    """
+    Enqueues serialized representations of a set of created/updated/deleted objects
+    of the same model, serializing them all at once.
+    """
+    if not instances:
+        return
+
+    content_type = ContentType.objects.get_for_model(instances[0])
+    serializer_class = get_serializer_for_model(instances[0].__class__)
+    serializer = serializer_class(instances, many=True, context={"request": None})
+
+    for instance, data in zip(instances, serializer.data, strict=True):
+        queue.append(
+            {
+                "content_type": content_type,
+                "object_id": instance.pk,
+                "event": action,
+                "data": data,
+                "snapshots": get_snapshots(instance, action),
+                "username": user.username,
+                "request_id": request_id,
+            }
+        )
+
+
 def flush_webhooks(queue):
     """
     Flush a list of object representation to RQ for webhook processing.
+
+    Deliveries are grouped by webhook, each webhook getting a single job to send
+    all of them.
     """
     rq_queue = get_queue("default")
     webhooks_cache = {"type_create": {}, "type_update": {}, "type_delete": {}}
+    deliveries = {}
 
     for data in queue:
         action_flag = {
@@ -85,14 +119,20 @@ def flush_webhooks(queue):
         webhooks = webhooks_cache[action_flag][content_type]
 
         for webhook in webhooks:
-            rq_queue.enqueue(
-                "extras.workers.process_webhook",
-                webhook=webhook,
-                model_name=content_type.model,
-                event=data["event"],
-                data=data["data"],
-                snapshots=data["snapshots"],
-                timestamp=str(timezone.now()),
-                username=data["username"],
-                request_id=data["request_id"],
-            )
+            delivery = {
+                "model_name": content_type.model,
+                "event": data["event"],
+                "data": data["data"],
+                "snapshots": data["snapshots"],
+                "timestamp": str(timezone.now()),
+                "username": data["username"],
+                "request_id": data["request_id"],
+            }
+            deliveries.setdefault(webhook.pk, (webhook, []))[1].append(delivery)
+
+    for webhook, webhook_deliveries in deliveries.values():
+        rq_queue.enqueue(
+            "extras.workers.process_webhooks",
+            webhook=webhook,
+            deliveries=webhook_deliveries,
+        )
@@ -1,16 +1,24 @@
 import logging
+import time
+from datetime import timedelta
 
 import requests
 from django.conf import settings
-from django_rq import job
+from django_rq import get_queue, job
 from jinja2.exceptions import TemplateError
 
+from peering_manager.metrics import webhook_deliveries, webhook_delivery_latency
 from utils.functions import generate_signature
 
 from .conditions import ConditionSet
 
 logger = logging.getLogger("peering.manager.extras")
 
+# HTTP sessions by webhook, kept for the lifetime of the process running
+# jobs: a single job with the default worker which forks a process for each job,
+# all jobs with a non-forking worker (e.g. `rq.worker.SimpleWorker`)
+_sessions = {}
+
 
 def eval_conditions(webhook, data):
     """
@@ -25,17 +33,28 @@ def eval_conditions(webhook, data):
     return ConditionSet(webhook.conditions).eval(data)
 
 
-@job("default")
-def process_webhook(
-    webhook, model_name, event, data, snapshots, timestamp, username, request_id
-):
+def get_session(webhook):
     """
-    Makes a request to the defined Webhook endpoint.
+    Return the HTTP session to use to send requests of a webhook.
+
+    Each webhook has its own session, so that cookies set by its endpoint are
+    not sent to the ones of other webhooks, keeping connections alive to reuse
+    them for the following requests of the job, or of all jobs run by a
+    non-forking worker. A new session is used if the SSL verification changes.
     """
-    # Evaluate webhook conditions (if any)
-    if not eval_conditions(webhook, data):
-        return None
+    verify = webhook.ca_file_path or webhook.ssl_verification
+    key = (webhook.pk, verify)
+    if key not in _sessions:
+        session = requests.Session()
+        session.verify = verify
+        _sessions[key] = session
+    return _sessions[key]
 
+
+def get_context(model_name, event, data, snapshots, timestamp, username, request_id):
+    """
+    Return the context used to render the request of a webhook for an event.
+    """
     context = {
         "event": event.lower(),
         "timestamp": timestamp,
@@ -46,7 +65,14 @@ def process_webhook(
     }
     if snapshots:
         context.update({"snapshots": snapshots})
+    return context
 
+
+def send_request(webhook, context):
+    """
+    Makes a request to the defined Webhook endpoint using the given context and
+    return the response if it succeeded.
+    """
     # Build the headers for the HTTP request
     headers = {
         "User-Agent": settings.REQUESTS_USER_AGENT,
@@ -72,9 +98,7 @@ def process_webhook(
         "data": body.encode("utf8"),
     }
 
-    logger.info(
-        f"sending {params['method']} request to {params['url']} ({model_name} {event})"
-    )
+    logger.info(f"sending {params['method']} request to {params['url']}")
     logger.debug(params)
     try:
         prepared_request = requests.Request(**params).prepare()
@@ -89,15 +113,15 @@ def process_webhook(
         )
 
     # Send the request
-    with requests.Session() as session:
-        session.verify = webhook.ssl_verification
-        if webhook.ca_file_path:
-            session.verify = webhook.ca_file_path
-        response = session.send(prepared_request, proxies=settings.HTTP_PROXIES)
+    start = time.monotonic()
+    response = get_session(webhook).send(
+        prepared_request, proxies=settings.HTTP_PROXIES
+    )
+    webhook_delivery_latency.labels(webhook.name).observe(time.monotonic() - start)
 
     if response.status_code == requests.codes.ok:
         logger.info(f"request succeeded; response status {response.status_code}")
-        return f"status {response.status_code} returned, webhook successfully processed"
+        return response
 
     logger.warning(
         f"request failed; response status {response.status_code}: {response.content}"
@@ -105,3 +129,78 @@ def process_webhook(
     raise requests.exceptions.RequestException(
         f"status {response.status_code} returned with content '{response.content}', webhook FAILED to process"
     )
+
+
+@job("default")
+def process_webhook(
+    webhook, model_name, event, data, snapshots, timestamp, username, request_id
+):
+    """
+    Makes a request to the defined Webhook endpoint.
+    """
+    # Evaluate webhook conditions (if any)
+    if not eval_conditions(webhook, data):
+        return None
+
+    context = get_context(
+        model_name, event, data, snapshots, timestamp, username, request_id
+    )
+    response = send_request(webhook, context)
+    return f"status {response.status_code} returned, webhook successfully processed"
+
+
+@job("default")
+def process_webhooks(webhook, deliveries, attempt=1):
+    """
+    Makes requests to the defined Webhook endpoint for a group of deliveries.
+
+    Deliveries are sent in batches of `webhook.batch_size` events, reusing the same
+    connection. Failed deliveries are retried later, with an increasing delay, up to
+    `WEBHOOK_RETRIES` times. After that, they are kept in this failed job, as are
+    deliveries which requests cannot be rendered since retrying them is pointless.
+    """
+    deliveries = [d for d in deliveries if eval_conditions(webhook, d["data"])]
+
+    failed = []
+    broken = []
+    for i in range(0, len(deliveries), webhook.batch_size):
+        batch = deliveries[i : i + webhook.batch_size]
+        if webhook.batch_size > 1:
+            context = {"events": [get_context(**d) for d in batch]}
+        else:
+            context = get_context(**batch[0])
+
+        try:
+            send_request(webhook, context)
+        except (TemplateError, ValueError) as e:
+            logger.warning(f"request to webhook {webhook} cannot be rendered: {e}")
+            broken.extend(batch)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"delivery to webhook {webhook} failed: {e}")
+            failed.extend(batch)
+        else:
+            webhook_deliveries.labels(webhook.name, "success").inc(len(batch))
+
+    message = f"{len(deliveries) - len(failed) - len(broken)} out of {len(deliveries)} deliveries successfully processed"
+    if failed:
+        if attempt <= settings.WEBHOOK_RETRIES:
+            delay = settings.WEBHOOK_RETRY_BACKOFF * 2 ** (attempt - 1)
+            get_queue("default").enqueue_in(
+                timedelta(seconds=delay),
+                "extras.workers.process_webhooks",
+                webhook=webhook,
+                deliveries=failed,
+                attempt=attempt + 1,
+            )
+            webhook_deliveries.labels(webhook.name, "retried").inc(len(failed))
+            message += f", {len(failed)} failed, retrying in {delay} seconds"
+        else:
+            broken.extend(failed)
+
+    if not broken:
+        return message
+
+    webhook_deliveries.labels(webhook.name, "failed").inc(len(broken))
+    raise requests.exceptions.RequestException(
+        f"{len(broken)} out of {len(deliveries)} deliveries FAILED to process after {attempt} attempt(s)"
+    )
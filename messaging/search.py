@@ -0,0 +1,22 @@
+from peering_manager.search import SearchIndex, register_search
+
+from .models import Contact, Email
+
+
+@register_search
+class ContactIndex(SearchIndex):
+    model = Contact
+    fields = (
+        ("name", 100),
+        ("email", 200),
+        ("phone", 200),
+        ("title", 300),
+        ("address", 400),
+        ("comments", 1000),
+    )
+
+
+@register_search
+class EmailIndex(SearchIndex):
+    model = Email
+    fields = (("name", 100), ("subject", 200), ("template", 1000))
@@ -1,6 +1,7 @@
 import django_tables2 as tables
 
 from peering_manager.tables import PeeringManagerTable, columns, linkify_phone
+from utils.functions import count_related
 
 from .models import Contact, ContactAssignment, ContactRole, Email
 
@@ -19,7 +20,10 @@ class ContactRoleTable(PeeringManagerTable):
 class ContactTable(PeeringManagerTable):
     name = tables.Column(linkify=True)
     phone = tables.Column(linkify=linkify_phone)
-    assignment_count = tables.Column(verbose_name="Assignments")
+    assignment_count = columns.Column(
+        annotations={"assignment_count": count_related(ContactAssignment, "contact")},
+        verbose_name="Assignments",
+    )
     tags = columns.TagColumn(url_name="messaging:contact_list")
 
     class Meta(PeeringManagerTable.Meta):
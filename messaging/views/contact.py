@@ -6,7 +6,6 @@ from peering_manager.views.generic import (
     ObjectListView,
     ObjectView,
 )
-from utils.functions import count_related
 from utils.views import register_model_view
 
 from ..filtersets import ContactFilterSet
@@ -27,9 +26,7 @@ __all__ = (
 @register_model_view(model=Contact, name="list", path="", detail=False)
 class ContactList(ObjectListView):
     permission_required = "messaging.view_contact"
-    queryset = Contact.objects.annotate(
-        assignment_count=count_related(ContactAssignment, "contact")
-    )
+    queryset = Contact.objects.all()
     filterset = ContactFilterSet
     filterset_form = ContactFilterForm
     table = ContactTable
@@ -71,9 +68,7 @@ class ContactDelete(ObjectDeleteView):
 @register_model_view(model=Contact, name="bulk_edit", path="edit", detail=False)
 class ContactBulkEdit(BulkEditView):
     permission_required = "messaging.change_contact"
-    queryset = Contact.objects.annotate(
-        assignment_count=count_related(ContactAssignment, "contact")
-    )
+    queryset = Contact.objects.all()
     filterset = ContactFilterSet
     table = ContactTable
     form = ContactBulkEditForm
@@ -81,8 +76,6 @@ class ContactBulkEdit(BulkEditView):
 
 @register_model_view(model=Contact, name="bulk_delete", path="delete", detail=False)
 class ContactBulkDelete(BulkDeleteView):
-    queryset = Contact.objects.annotate(
-        assignment_count=count_related(ContactAssignment, "contact")
-    )
+    queryset = Contact.objects.all()
     filterset = ContactFilterSet
     table = ContactTable
@@ -0,0 +1,20 @@
+from peering_manager.search import SearchIndex, register_search
+
+from .models import BFD, Connection
+
+
+@register_search
+class BFDIndex(SearchIndex):
+    model = BFD
+    fields = (("name", 100), ("slug", 110), ("description", 500))
+
+
+@register_search
+class ConnectionIndex(SearchIndex):
+    model = Connection
+    fields = (
+        ("ipv4_address", 100),
+        ("ipv6_address", 100),
+        ("interface", 200),
+        ("description", 500),
+    )
@@ -22,7 +22,7 @@ from ..filtersets import (
     InternetExchangePeeringSessionFilterSet,
     RoutingPolicyFilterSet,
 )
-from ..jobs import import_sessions_to_internet_exchange
+from ..jobs import encrypt_session_passwords, import_sessions_to_internet_exchange
 from ..models import (
     AutonomousSystem,
     BGPGroup,
@@ -317,6 +317,41 @@ class DirectPeeringSessionViewSet(PeeringManagerModelViewSet):
             )
         )
 
+    @extend_schema(
+        operation_id="peering_direct_peering_sessions_encrypt_passwords",
+        request=None,
+        responses={
+            202: OpenApiResponse(
+                response=JobSerializer,
+                description="Job scheduled to encrypt the session passwords.",
+            ),
+            403: OpenApiResponse(
+                response=OpenApiTypes.NONE,
+                description="The user does not have the permission to encrypt passwords.",
+            ),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="encrypt-passwords")
+    def encrypt_passwords(self, request):
+        # Check user permission first
+        if not request.user.has_perm("peering.change_directpeeringsession"):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        # Sessions are selected with the usual filters, all of them by default
+        sessions = self.filter_queryset(self.get_queryset())
+        job = Job.enqueue(
+            encrypt_session_passwords,
+            DirectPeeringSession,
+            list(sessions.values_list("pk", flat=True)),
+            name="peering.directpeeringsession.encrypt_passwords",
+            object_model=DirectPeeringSession,
+            user=request.user,
+        )
+        return Response(
+            JobSerializer(instance=job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
     @extend_schema(
         operation_id="peering_direct_peering_sessions_poll",
         responses={
@@ -555,6 +590,41 @@ class InternetExchangePeeringSessionViewSet(PeeringManagerModelViewSet):
             )
         )
 
+    @extend_schema(
+        operation_id="peering_internet_exchange_peering_sessions_encrypt_passwords",
+        request=None,
+        responses={
+            202: OpenApiResponse(
+                response=JobSerializer,
+                description="Job scheduled to encrypt the session passwords.",
+            ),
+            403: OpenApiResponse(
+                response=OpenApiTypes.NONE,
+                description="The user does not have the permission to encrypt passwords.",
+            ),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="encrypt-passwords")
+    def encrypt_passwords(self, request):
+        # Check user permission first
+        if not request.user.has_perm("peering.change_internetexchangepeeringsession"):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        # Sessions are selected with the usual filters, all of them by default
+        sessions = self.filter_queryset(self.get_queryset())
+        job = Job.enqueue(
+            encrypt_session_passwords,
+            InternetExchangePeeringSession,
+            list(sessions.values_list("pk", flat=True)),
+            name="peering.internetexchangepeeringsession.encrypt_passwords",
+            object_model=InternetExchangePeeringSession,
+            user=request.user,
+        )
+        return Response(
+            JobSerializer(instance=job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
     @extend_schema(
         operation_id="peering_internet_exchange_peering_sessions_poll",
         responses={
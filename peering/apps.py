@@ -5,6 +5,7 @@ class PeeringConfig(AppConfig):
     name = "peering"
 
     def ready(self) -> None:
+        import peering.search
         import peering.signals  # noqa: F401
         from peering_manager.models.features import register_models
 
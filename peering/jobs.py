@@ -1,14 +1,16 @@
 import logging
 
+from django.template.defaultfilters import pluralize
 from django_rq import job
 
+from core.context_managers import job_change_logging
 from core.enums import LogLevel
 from net.models import Connection
 
 logger = logging.getLogger("peering.manager.peering.jobs")
 
 
-@job("default")
+@job("sync")
 def import_sessions_to_internet_exchange(internet_exchange, job):
     job.mark_running(
         "Trying to import peering sessions.", object=internet_exchange, logger=logger
@@ -51,3 +53,21 @@ def import_sessions_to_internet_exchange(internet_exchange, job):
     job.mark_completed("Import completed.", object=internet_exchange, logger=logger)
 
     return True
+
+
+@job("low")
+def encrypt_session_passwords(model, pks, job):
+    sessions = model.objects.filter(pk__in=pks)
+    count = len(pks)
+    job.mark_running(
+        f"Encrypting passwords of {count} session{pluralize(count)}.", logger=logger
+    )
+
+    with job_change_logging(job):
+        changed = model.encrypt_passwords(sessions)
+
+    job.mark_completed(
+        f"Encrypted password changed for {len(changed)} session{pluralize(len(changed))}.",
+        logger=logger,
+    )
+    return True
@@ -1025,6 +1025,10 @@ class InternetExchangePeeringSession(BGPSession):
         Returns `True` if a `NetworkIXLan` exists for this session's IP and if
         the `NetworkIXLan` ASN matches the autonomous system's.
         """
+        # Answered by the queryset if annotated (e.g. in tables)
+        if hasattr(self, "_exists_in_peeringdb"):
+            return self._exists_in_peeringdb
+
         if isinstance(self.ip_address, str):
             ip_version = ipaddress.ip_address(self.ip_address).version
         else:
@@ -1040,6 +1044,13 @@ class InternetExchangePeeringSession(BGPSession):
             return False
         return True
 
+    @property
+    def _has_peeringdb_network(self):
+        # Answered by the queryset if annotated (e.g. in tables)
+        if hasattr(self, "_network_in_peeringdb"):
+            return self._network_in_peeringdb and not self.autonomous_system.is_private
+        return self.autonomous_system.peeringdb_network is not None
+
     @property
     def is_abandoned(self):
         """
@@ -1059,7 +1070,7 @@ class InternetExchangePeeringSession(BGPSession):
                 self.ixp_connection.router
                 and not self.ixp_connection.router.poll_bgp_sessions_state
             )
-            or not self.autonomous_system.peeringdb_network
+            or not self._has_peeringdb_network
             or self.exists_in_peeringdb
             or self.bgp_state not in [BGPState.IDLE, BGPState.ACTIVE]
         )
@@ -1,10 +1,14 @@
 import ipaddress
 import logging
 
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 from netfields import InetAddressField, NetManager
 
+from core.enums import ObjectChangeAction
 from peering_manager.models import OrganisationalModel, PrimaryModel
 
 from ..enums import BGPGroupStatus, BGPSessionStatus, BGPState, IPFamily
@@ -319,3 +323,53 @@ class BGPSession(PrimaryModel, PolicyMixin):
         if commit:
             self.save()
         return True
+
+    @classmethod
+    def encrypt_passwords(cls, sessions, batch_size=1000):
+        """
+        Encrypts the passwords of many sessions like `encrypt_password()` does,
+        writing the ones which changed with a bulk update per batch of sessions.
+        Changes are logged if change logging is enabled (e.g. by a request or a job).
+
+        Returns the sessions which encrypted password has changed.
+        """
+        from core.context_managers import bulk_change_logging
+        from peering_manager.api.caching import invalidate_models
+        from peering_manager.context import current_request
+
+        try:
+            cls._meta.get_field("router")
+            router = "router"
+        except FieldDoesNotExist:
+            router = "ixp_connection__router"
+        sessions = sessions.select_related(f"{router}__platform").order_by("pk")
+
+        changed = []
+        for start in range(0, sessions.count(), batch_size):
+            batch, previous_passwords = [], []
+            for session in sessions[start : start + batch_size]:
+                encrypted_password = session.encrypted_password
+                if (
+                    session.encrypt_password(commit=False)
+                    and session.encrypted_password != encrypted_password
+                ):
+                    session.updated = timezone.now()
+                    batch.append(session)
+                    previous_passwords.append(encrypted_password)
+
+            if batch and current_request.get() is not None:
+                # Snapshot changed sessions as they were before being encrypted
+                prefetch_related_objects(batch, "tags")
+                for session, previous in zip(batch, previous_passwords, strict=True):
+                    encrypted_password = session.encrypted_password
+                    session.encrypted_password = previous
+                    session.snapshot()
+                    session.encrypted_password = encrypted_password
+
+            with bulk_change_logging(batch, ObjectChangeAction.UPDATE):
+                cls.objects.bulk_update(batch, ["encrypted_password", "updated"])
+            changed.extend(batch)
+
+        if changed:
+            invalidate_models(cls)
+        return changed
@@ -0,0 +1,63 @@
+from peering_manager.search import SearchIndex, register_search
+
+from .models import (
+    AutonomousSystem,
+    BGPGroup,
+    DirectPeeringSession,
+    InternetExchange,
+    InternetExchangePeeringSession,
+    RoutingPolicy,
+)
+
+
+@register_search
+class AutonomousSystemIndex(SearchIndex):
+    model = AutonomousSystem
+    fields = (
+        ("asn", 100),
+        ("name", 100),
+        ("irr_as_set", 200),
+        ("description", 500),
+        ("comments", 1000),
+    )
+
+
+@register_search
+class BGPGroupIndex(SearchIndex):
+    model = BGPGroup
+    fields = (("name", 100), ("slug", 110), ("description", 500))
+
+
+@register_search
+class DirectPeeringSessionIndex(SearchIndex):
+    model = DirectPeeringSession
+    fields = (
+        ("ip_address", 100),
+        ("local_ip_address", 150),
+        ("service_reference", 200),
+        ("description", 500),
+        ("comments", 1000),
+    )
+
+
+@register_search
+class InternetExchangeIndex(SearchIndex):
+    model = InternetExchange
+    fields = (("name", 100), ("slug", 110), ("description", 500))
+
+
+@register_search
+class InternetExchangePeeringSessionIndex(SearchIndex):
+    model = InternetExchangePeeringSession
+    fields = (
+        ("ip_address", 100),
+        ("service_reference", 200),
+        ("description", 500),
+        ("comments", 1000),
+    )
+
+
+@register_search
+class RoutingPolicyIndex(SearchIndex):
+    model = RoutingPolicy
+    fields = (("name", 100), ("slug", 110), ("description", 500))
@@ -1,7 +1,11 @@
 import django_tables2 as tables
+from django.db.models import Exists, OuterRef, Q
 
 from bgp.tables import CommunityColumn
+from net.models import Connection
 from peering_manager.tables import BaseTable, PeeringManagerTable, columns
+from peeringdb.models import Network, NetworkIXLan
+from utils.functions import count_related
 
 from ..models import (
     AutonomousSystem,
@@ -14,6 +18,15 @@ from ..models import (
 from .columns import BGPSessionStateColumn, RoutingPolicyColumn
 
 BGP_RELATIONSHIP = "{{ record.relationship.get_html }}"
+# PeeringDB record of the IP address and AS of an IX peering session
+NETIXLAN_EXISTS = Exists(
+    NetworkIXLan.objects.filter(
+        Q(ipaddr4=OuterRef("ip_address")) | Q(ipaddr6=OuterRef("ip_address")),
+        net__asn=OuterRef("autonomous_system__asn"),
+    )
+)
+# PeeringDB record of the AS of a peering session
+NETWORK_EXISTS = Exists(Network.objects.filter(asn=OuterRef("autonomous_system__asn")))
 COMMUNITY_TYPE = "{{ record.get_type_html }}"
 ROUTING_POLICY_TYPE = "{{ record.get_type_html }}"
 
@@ -30,12 +43,22 @@ class AutonomousSystemTable(PeeringManagerTable):
     directpeeringsession_count = columns.LinkedCountColumn(
         viewname="peering:autonomoussystem_direct_peering_sessions",
         view_kwargs={"pk": True},
+        annotations={
+            "directpeeringsession_count": count_related(
+                DirectPeeringSession, "autonomous_system"
+            )
+        },
         verbose_name="Direct Sessions",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
     internetexchangepeeringsession_count = columns.LinkedCountColumn(
         viewname="peering:autonomoussystem_internet_exchange_peering_sessions",
         view_kwargs={"pk": True},
+        annotations={
+            "internetexchangepeeringsession_count": count_related(
+                InternetExchangePeeringSession, "autonomous_system"
+            )
+        },
         verbose_name="IX Sessions",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
@@ -80,7 +103,12 @@ class BGPGroupTable(PeeringManagerTable):
     import_routing_policies = RoutingPolicyColumn(verbose_name="Import Policies")
     export_routing_policies = RoutingPolicyColumn(verbose_name="Export Policies")
     communities = CommunityColumn()
-    directpeeringsession_count = tables.Column(
+    directpeeringsession_count = columns.Column(
+        annotations={
+            "directpeeringsession_count": count_related(
+                DirectPeeringSession, "bgp_group"
+            )
+        },
         verbose_name="Direct Sessions",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
@@ -192,11 +220,20 @@ class InternetExchangeTable(PeeringManagerTable):
     import_routing_policies = RoutingPolicyColumn(verbose_name="Import Policies")
     export_routing_policies = RoutingPolicyColumn(verbose_name="Export Policies")
     communities = CommunityColumn()
-    connection_count = tables.Column(
+    connection_count = columns.Column(
+        annotations={
+            "connection_count": count_related(Connection, "internet_exchange_point")
+        },
         verbose_name="Connections",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
-    session_count = tables.Column(
+    session_count = columns.Column(
+        annotations={
+            "session_count": count_related(
+                InternetExchangePeeringSession,
+                "ixp_connection__internet_exchange_point",
+            )
+        },
         verbose_name="Sessions",
         attrs={"td": {"class": "text-center"}, "th": {"class": "text-center"}},
     )
@@ -262,10 +299,24 @@ class InternetExchangePeeringSessionTable(PeeringManagerTable):
     communities = CommunityColumn()
     bfd = tables.Column(verbose_name="BFD", linkify=True)
     exists_in_peeringdb = columns.BooleanColumn(
-        accessor="exists_in_peeringdb", verbose_name="In PeeringDB", orderable=False
+        accessor="exists_in_peeringdb",
+        annotations={"_exists_in_peeringdb": NETIXLAN_EXISTS},
+        verbose_name="In PeeringDB",
+        orderable=False,
     )
     is_abandoned = columns.BooleanColumn(
-        accessor="is_abandoned", verbose_name="Is Abandoned", orderable=False
+        accessor="is_abandoned",
+        select_related=(
+            "ixp_connection__router",
+            "ixp_connection__peeringdb_netixlan",
+            "autonomous_system",
+        ),
+        annotations={
+            "_exists_in_peeringdb": NETIXLAN_EXISTS,
+            "_network_in_peeringdb": NETWORK_EXISTS,
+        },
+        verbose_name="Is Abandoned",
+        orderable=False,
     )
     state = BGPSessionStateColumn(accessor="bgp_state")
     tags = columns.TagColumn(url_name="peering:internetexchangepeeringsession_list")
@@ -197,6 +197,14 @@ class DirectPeeringSessionTest(APIViewTestCases.View):
             },
         ]
 
+    def test_encrypt_passwords(self):
+        url = reverse("peering-api:directpeeringsession-encrypt-passwords")
+        response = self.client.post(f"{url}?ip_address=2001:db8::1", **self.header)
+        self.assertHttpStatus(response, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            "peering.directpeeringsession.encrypt_passwords", response.data["name"]
+        )
+
 
 class InternetExchangeTest(APIViewTestCases.View):
     model = InternetExchange
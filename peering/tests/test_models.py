@@ -1,15 +1,20 @@
+import uuid
 from unittest.mock import patch
 
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
 from bgp.models import Relationship
+from core.models import Job, ObjectChange
 from devices.models import PasswordAlgorithm, Platform, Router
 from net.models import Connection
 from utils.testing import load_json
 
 from ..enums import *
 from ..functions import *
+from ..jobs import encrypt_session_passwords
 from ..models import *
 from .mocked_data import load_peeringdb_data, mocked_subprocess_popen
 
@@ -297,6 +302,77 @@ class InternetExchangePeeringSessionTest(TestCase):
         self.assertIsNone(self.session.password)
         self.assertIsNone(self.session.encrypted_password)
 
+    def test_encrypt_passwords(self):
+        platform = Platform.objects.get(name="Arista EOS")
+        platform.password_algorithm = PasswordAlgorithm.ARISTA_TYPE7
+        platform.save()
+        self.router.platform = platform
+        self.router.encrypt_passwords = True
+        self.router.save()
+        InternetExchangePeeringSession.objects.bulk_create(
+            [
+                InternetExchangePeeringSession(
+                    autonomous_system=self.a_s,
+                    ixp_connection=self.ixp_connection,
+                    ip_address=f"2001:db8::{i}",
+                    password=f"password{i}",
+                )
+                for i in range(2, 5)
+            ]
+        )
+
+        sessions = InternetExchangePeeringSession.objects.all()
+        with self.assertNumQueries(5):
+            # Count, then a select and an update per batch
+            changed = InternetExchangePeeringSession.encrypt_passwords(
+                sessions, batch_size=2
+            )
+        self.assertEqual(4, len(changed))
+        for session in sessions:
+            self.assertEqual(
+                session.password,
+                platform.decrypt_password(
+                    session.encrypted_password, key=str(session.ip_address)
+                ),
+            )
+
+        # Up to date passwords are not written again
+        self.assertListEqual(
+            [], InternetExchangePeeringSession.encrypt_passwords(sessions)
+        )
+
+    def test_encrypt_passwords_job(self):
+        platform = Platform.objects.get(name="Arista EOS")
+        platform.password_algorithm = PasswordAlgorithm.ARISTA_TYPE7
+        platform.save()
+        self.router.platform = platform
+        self.router.encrypt_passwords = True
+        self.router.save()
+        user = User.objects.create_user(username="testuser")
+        job = Job.objects.create(
+            name="test",
+            object_type=ContentType.objects.get_for_model(
+                InternetExchangePeeringSession
+            ),
+            user=user,
+            job_id=uuid.uuid4(),
+        )
+
+        encrypt_session_passwords(
+            InternetExchangePeeringSession, [self.session.pk], job=job
+        )
+
+        # Changes are logged on behalf of the user who started the job
+        change = ObjectChange.objects.get(changed_object_id=self.session.pk)
+        self.assertEqual(user, change.user)
+        self.assertEqual(job.job_id, change.request_id)
+        self.assertIsNone(change.prechange_data["encrypted_password"])
+        self.session.refresh_from_db()
+        self.assertEqual(
+            self.session.encrypted_password,
+            change.postchange_data["encrypted_password"],
+        )
+
     def test_exists_in_peeringdb(self):
         self.assertFalse(self.session.exists_in_peeringdb)
 
@@ -3,7 +3,6 @@ from typing import Any
 from django.conf import settings
 from django.contrib import messages
 from django.core.mail import EmailMessage
-from django.db.models import Count
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.safestring import mark_safe
@@ -71,16 +70,7 @@ __all__ = (
 @register_model_view(AutonomousSystem, name="list", path="", detail=False)
 class AutonomousSystemList(ObjectListView):
     permission_required = "peering.view_autonomoussystem"
-    queryset = (
-        AutonomousSystem.objects.all()
-        .annotate(
-            directpeeringsession_count=Count("directpeeringsession", distinct=True),
-            internetexchangepeeringsession_count=Count(
-                "internetexchangepeeringsession", distinct=True
-            ),
-        )
-        .order_by("affiliated", "asn")
-    )
+    queryset = AutonomousSystem.objects.order_by("affiliated", "asn")
     filterset = AutonomousSystemFilterSet
     filterset_form = AutonomousSystemFilterForm
     table = AutonomousSystemTable
@@ -1,5 +1,3 @@
-from django.db.models import Count
-
 from extras.views import ObjectConfigContextView
 from peering_manager.views.generic import (
     BulkDeleteView,
@@ -37,9 +35,7 @@ __all__ = (
 @register_model_view(BGPGroup, name="list", path="", detail=False)
 class BGPGroupList(ObjectListView):
     permission_required = "peering.view_bgpgroup"
-    queryset = BGPGroup.objects.annotate(
-        directpeeringsession_count=Count("directpeeringsession")
-    ).order_by("name", "slug")
+    queryset = BGPGroup.objects.order_by("name", "slug")
     filterset = BGPGroupFilterSet
     filterset_form = BGPGroupFilterForm
     table = BGPGroupTable
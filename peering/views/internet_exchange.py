@@ -25,7 +25,6 @@ from peeringdb.filtersets import NetworkIXLanFilterSet
 from peeringdb.forms import NetworkIXLanFilterForm
 from peeringdb.tables import NetworkIXLanTable
 from utils.forms import ConfirmationForm
-from utils.functions import count_related
 from utils.views import ViewTab, register_model_view
 
 from ..filtersets import (
@@ -65,16 +64,8 @@ __all__ = (
 @register_model_view(InternetExchange, name="list", path="", detail=False)
 class InternetExchangeList(ObjectListView):
     permission_required = "peering.view_internetexchange"
-    queryset = (
-        InternetExchange.objects.all()
-        .order_by("local_autonomous_system", "name", "slug")
-        .annotate(
-            connection_count=count_related(Connection, "internet_exchange_point"),
-            session_count=count_related(
-                InternetExchangePeeringSession,
-                "ixp_connection__internet_exchange_point",
-            ),
-        )
+    queryset = InternetExchange.objects.order_by(
+        "local_autonomous_system", "name", "slug"
     )
     table = InternetExchangeTable
     filterset = InternetExchangeFilterSet
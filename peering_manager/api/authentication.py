@@ -1,7 +1,10 @@
+import hashlib
 import ipaddress
 from urllib.parse import urlparse
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import authentication, exceptions
 from rest_framework.permissions import (
@@ -12,6 +15,26 @@ from rest_framework.permissions import (
 
 from users.models import Token
 
+TOKEN_KEY_PREFIX = "api_token"
+# Minimum number of seconds between two updates of the time a token was used at
+TOKEN_LAST_USED_INTERVAL = 60
+
+
+def get_token_cache_key(key):
+    # Do not expose token keys in cache keys
+    return f"{TOKEN_KEY_PREFIX}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def invalidate_tokens(*keys):
+    """
+    Removes tokens from the cache, once the current transaction (if any) is
+    committed.
+    """
+    if keys:
+        transaction.on_commit(
+            lambda: cache.delete_many([get_token_cache_key(k) for k in keys])
+        )
+
 
 def get_client_ip(request) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
     http_headers = ["HTTP_X_REAL_IP", "HTTP_X_FORWARDED_FOR", "REMOTE_ADDR"]
@@ -63,24 +86,55 @@ class TokenAuthentication(authentication.TokenAuthentication):
 
         return result
 
-    def authenticate_credentials(self, key):
-        model = self.get_model()
+    def get_token(self, key):
+        """
+        Returns the token matching the key along with its user, cached for
+        `CACHE_TOKEN_TIMEOUT` seconds.
+        """
+        cache_key = get_token_cache_key(key)
+        if settings.CACHE_TOKEN_TIMEOUT:
+            token = cache.get(cache_key)
+            if token is not None:
+                return token
 
+        model = self.get_model()
         try:
-            token = model.objects.prefetch_related("user").get(key=key)
+            token = model.objects.select_related("user").get(key=key)
         except model.DoesNotExist:
             raise exceptions.AuthenticationFailed("Invalid token") from None
 
+        if settings.CACHE_TOKEN_TIMEOUT:
+            # Cache the allowed networks parsed
+            token.allowed_networks  # noqa: B018
+            cache.set(cache_key, token, timeout=settings.CACHE_TOKEN_TIMEOUT)
+        return token
+
+    def update_last_used(self, token):
+        """
+        Records the time the token is used at, at most once per interval whatever
+        the number of requests and processes using it.
+        """
+        now = timezone.now()
+        if (
+            token.last_used
+            and (now - token.last_used).total_seconds() < TOKEN_LAST_USED_INTERVAL
+        ):
+            return
+        if cache.add(
+            f"{TOKEN_KEY_PREFIX}_used:{token.pk}",
+            True,
+            timeout=TOKEN_LAST_USED_INTERVAL,
+        ):
+            Token.objects.filter(pk=token.pk).update(last_used=now)
+
+    def authenticate_credentials(self, key):
+        token = self.get_token(key)
+
         # Enforce the Token's expiration time
         if token.is_expired:
             raise exceptions.AuthenticationFailed("Token expired")
 
-        # 60 seconds delay to avoid updating last_used too frequently
-        if (
-            not token.last_used
-            or (timezone.now() - token.last_used).total_seconds() > 60
-        ):
-            Token.objects.filter(pk=token.pk).update(last_used=timezone.now())
+        self.update_last_used(token)
 
         if not token.user.is_active:
             raise exceptions.AuthenticationFailed("User inactive")
@@ -0,0 +1,131 @@
+import hashlib
+import time
+from functools import cache as cache_result
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+__all__ = (
+    "get_cache_key",
+    "get_model_versions",
+    "get_permissions_fingerprint",
+    "invalidate_models",
+)
+
+VERSION_KEY_PREFIX = "api_cache_version"
+RESPONSE_KEY_PREFIX = "api_cache_response"
+
+# Models attached to objects but never found in their API representation
+UNSERIALIZED_MODELS = ("core.job", "extras.journalentry")
+
+
+def _get_version_key(model):
+    return f"{VERSION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+@cache_result
+def get_cached_models(model):
+    """
+    Return the models which data can be found in API responses for the given
+    model: the model itself and all models it is related to, as they can be nested
+    in serialized objects or used to annotate them.
+
+    Forward relations are followed transitively since nested objects are
+    displayed using their own relations (e.g. a connection name depends on its
+    IXP and router) and some serialized values are reached through intermediate
+    models (e.g. config contexts through their assignments).
+    """
+    models = {model}
+    pending = [model]
+    while pending:
+        current = pending.pop()
+        for field in current._meta.get_fields():
+            if not field.is_relation or field.related_model is None:
+                continue
+            # Reverse relations are only used to annotate the model itself
+            if field.auto_created and not field.concrete and current is not model:
+                continue
+            if field.related_model._meta.label_lower in UNSERIALIZED_MODELS:
+                continue
+            if field.related_model not in models:
+                models.add(field.related_model)
+                pending.append(field.related_model)
+    return sorted(models, key=lambda m: m._meta.label_lower)
+
+
+def get_model_versions(models):
+    """
+    Return the current version of each model, all fetched at once.
+
+    Missing versions (never bumped or evicted) are initialised with the current
+    time, so that a version never goes back to a value used by older responses.
+    """
+    keys = [_get_version_key(m) for m in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key, 0)
+    return [versions[k] for k in keys]
+
+
+def invalidate_models(*models):
+    """
+    Bump the version of the given models, making all cached API responses which
+    depend on them stale.
+
+    When called inside a transaction, versions are bumped only once the
+    transaction is committed to prevent caching data that is about to change.
+    """
+    if not settings.CACHE_API_TIMEOUT:
+        return
+
+    def bump():
+        for model in models:
+            key = _get_version_key(model)
+            cache.add(key, time.time_ns(), timeout=None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Key evicted in the meantime
+                cache.set(key, time.time_ns(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def get_permissions_fingerprint(user):
+    """
+    Return a string identifying the set of permissions granted to a user, users
+    sharing the same permissions get the same API responses.
+    """
+    if not user.is_authenticated:
+        return "anonymous"
+    if user.is_superuser:
+        return "superuser"
+    return hashlib.sha256(
+        ",".join(sorted(user.get_all_permissions())).encode()
+    ).hexdigest()
+
+
+def get_cache_key(request, model):
+    """
+    Return the key used to cache the data of a response. It depends on the
+    requested endpoint, the normalised query parameters, the permissions of the
+    user and the versions of all the models found in the response.
+    """
+    query = sorted(
+        (k, sorted(request.query_params.getlist(k))) for k in request.query_params
+    )
+    versions = get_model_versions(get_cached_models(model))
+    digest = hashlib.sha256(
+        repr(
+            (
+                request.build_absolute_uri(request.path),
+                query,
+                get_permissions_fingerprint(request.user),
+                versions,
+            )
+        ).encode()
+    ).hexdigest()
+    return f"{RESPONSE_KEY_PREFIX}:{model._meta.label_lower}:{digest}"
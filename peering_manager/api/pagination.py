@@ -1,6 +1,38 @@
+import base64
+import binascii
+import json
+import operator
+from datetime import datetime, time
+from functools import reduce
+
 from django.conf import settings
-from django.db.models import QuerySet
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from utils.paginators import count_objects
+
+CURSOR_ANNOTATION_PREFIX = "_cursor_"
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Encoder used to build cursors, objects that are not natively handled (like IP
+    addresses) are encoded as strings which the database is able to cast back.
+    Date and time values keep their full precision as they are compared exactly.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime | time):
+            return o.isoformat()
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
 
 
 class OptionalLimitOffsetPagination(LimitOffsetPagination):
@@ -9,31 +41,213 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     a request. This returns all objects matching a query, but retains the same format
     as a paginated request. The limit can only be disabled if MAX_PAGE_SIZE has been
     set to `0` or `None`.
+
+    Passing the `cursor` query parameter (empty for the first page) switches to a
+    keyset pagination mode. Pages are then retrieved by filtering on the ordering
+    fields (and the primary key) of the last object of the previous page instead of
+    using an `OFFSET` and the total count of objects is not computed.
+
+    Counts of large querysets may be estimated (see `count_objects()`), which is
+    told by the `count_exact` field of responses. In that case, a next page link is
+    given as long as pages are full.
     """
 
+    cursor_query_param = "cursor"
+
     def __init__(self):
         self.default_limit = settings.PAGINATE_COUNT
+        self.cursor = None
+        self.use_cursor = False
+        self.count_exact = True
+        self.page_length = None
 
     def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        self.request = request
+
+        if self.cursor_query_param in request.query_params and isinstance(
+            queryset, QuerySet
+        ):
+            return self.paginate_queryset_with_cursor(queryset, request)
+
         if isinstance(queryset, QuerySet):
             self.count = self.get_queryset_count(queryset)
         else:
             # We're dealing with an iterable, not a QuerySet
             self.count = len(queryset)
 
-        self.limit = self.get_limit(request)
         self.offset = self.get_offset(request)
-        self.request = request
 
         if self.limit and self.count > self.limit and self.template is not None:
             self.display_page_controls = True
 
-        if self.count == 0 or self.offset > self.count:
+        if self.count_exact and (self.count == 0 or self.offset > self.count):
             return []
 
         if self.limit:
-            return list(queryset[self.offset : self.offset + self.limit])
-        return list(queryset[self.offset :])
+            results = list(queryset[self.offset : self.offset + self.limit])
+        else:
+            results = list(queryset[self.offset :])
+        self.page_length = len(results)
+        return results
+
+    def paginate_queryset_with_cursor(self, queryset, request):
+        """
+        Return a page of objects located right after the position encoded in the
+        cursor, following the queryset ordering with the primary key used as a
+        tie-breaker.
+        """
+        self.use_cursor = True
+        self.count = None
+        self.offset = 0
+
+        keys = self.get_cursor_keys(queryset)
+        queryset = queryset.annotate(
+            **{f"{CURSOR_ANNOTATION_PREFIX}{i}": F(k[0]) for i, k in enumerate(keys)}
+        ).order_by(*self.get_cursor_ordering(keys))
+
+        if position := self.decode_cursor(request, len(keys)):
+            queryset = queryset.filter(self.get_cursor_filter(keys, position))
+
+        if self.limit:
+            results = list(queryset[: self.limit + 1])
+            has_next = len(results) > self.limit
+            results = results[: self.limit]
+        else:
+            results = list(queryset)
+            has_next = False
+
+        self.cursor = (
+            self.encode_cursor(
+                [
+                    getattr(results[-1], f"{CURSOR_ANNOTATION_PREFIX}{i}")
+                    for i in range(len(keys))
+                ]
+            )
+            if has_next
+            else None
+        )
+
+        return results
+
+    def get_cursor_keys(self, queryset):
+        """
+        Return the list of `(field, descending, nullable)` tuples defining the
+        position of an object in the queryset.
+
+        Orderings on relations are expanded using the related model ordering like
+        Django does. The primary key is always used as the last key to make sure that
+        the position of each object is unique. Expression-based orderings cannot be
+        expressed as cursors, in that case the primary key is the only key.
+        """
+        model = queryset.model
+        ordering = queryset.query.order_by or model._meta.ordering or []
+
+        keys = []
+        if all(isinstance(o, str) for o in ordering):
+            for o in ordering:
+                if o == "?":
+                    continue
+                keys.extend(self._expand_ordering(model, o.lstrip("-"), o[0] == "-"))
+
+        # Stop at the first unique key, anything after it is meaningless
+        for i, (name, _, _) in enumerate(keys):
+            if name in ("pk", model._meta.pk.name):
+                return [*keys[:i], ("pk", keys[i][1], False)]
+
+        return [*keys, ("pk", False, False)]
+
+    def _expand_ordering(self, model, name, descending, depth=0):
+        field = None
+        current = model
+        try:
+            for part in name.split("__"):
+                if part == "pk":
+                    field = current._meta.pk
+                else:
+                    field = current._meta.get_field(part)
+                current = field.related_model if field.is_relation else None
+        except (AttributeError, FieldDoesNotExist):
+            # Annotation or unknown field, assume it can be null
+            return [(name, descending, True)]
+
+        if field.is_relation and depth < 5:
+            related_ordering = field.related_model._meta.ordering or ["pk"]
+            keys = []
+            for o in related_ordering:
+                if not isinstance(o, str):
+                    return [(f"{name}__pk", descending, field.null)]
+                keys.extend(
+                    (n, d, nullable or field.null)
+                    for n, d, nullable in self._expand_ordering(
+                        field.related_model,
+                        o.lstrip("-"),
+                        descending != (o[0] == "-"),
+                        depth=depth + 1,
+                    )
+                )
+            return [(f"{name}__{n}", d, nullable) for n, d, nullable in keys]
+
+        return [(name, descending, field.null)]
+
+    def get_cursor_ordering(self, keys):
+        """
+        Return the ordering matching cursor keys, placing null values at the end in
+        ascending order and at the beginning in descending order.
+        """
+        return [
+            F(name).desc(nulls_first=True)
+            if descending
+            else F(name).asc(nulls_last=True)
+            for name, descending, _ in keys
+        ]
+
+    def get_cursor_filter(self, keys, position):
+        """
+        Return a filter matching all objects located after the given position.
+        """
+        conditions = []
+        equal = Q()
+
+        for (name, descending, nullable), value in zip(keys, position, strict=True):
+            if value is None:
+                after = Q(**{f"{name}__isnull": False}) if descending else None
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if nullable and not descending:
+                    after |= Q(**{f"{name}__isnull": True})
+                same = Q(**{name: value})
+
+            if after is not None:
+                conditions.append(equal & after)
+            equal &= same
+
+        return reduce(operator.or_, conditions)
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(
+            json.dumps(position, cls=CursorEncoder).encode()
+        ).decode()
+
+    def decode_cursor(self, request, length):
+        """
+        Return the position encoded in the cursor passed in the request, `None` if
+        the first page is requested.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("Invalid cursor.") from None
+
+        if not isinstance(position, list) or len(position) != length:
+            raise NotFound("Invalid cursor.")
+
+        return position
 
     def get_limit(self, request):
         if self.limit_query_param:
@@ -52,18 +266,70 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         return self.default_limit
 
     def get_queryset_count(self, queryset):
-        return queryset.count()
+        count, self.count_exact = count_objects(queryset)
+        return count
 
     def get_next_link(self):
+        if self.use_cursor:
+            if not self.cursor:
+                return None
+            url = remove_query_param(
+                self.request.build_absolute_uri(), self.offset_query_param
+            )
+            return replace_query_param(url, self.cursor_query_param, self.cursor)
+
         # Pagination has been disabled
         if not self.limit:
             return None
 
+        if not self.count_exact:
+            if self.page_length < self.limit:
+                return None
+            url = replace_query_param(
+                self.request.build_absolute_uri(), self.limit_query_param, self.limit
+            )
+            return replace_query_param(
+                url, self.offset_query_param, self.offset + self.limit
+            )
+
         return super().get_next_link()
 
     def get_previous_link(self):
-        # Pagination has been disabled
-        if not self.limit:
+        # Pagination has been disabled or cursors are used (forward only)
+        if not self.limit or self.use_cursor:
             return None
 
         return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The cursor pointing to the page of results to return, empty for the first page.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "count_exact": self.count_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["count"]["nullable"] = True
+        schema["properties"] = {
+            "count": schema["properties"]["count"],
+            "count_exact": {"type": "boolean", "example": True},
+            **schema["properties"],
+        }
+        return schema
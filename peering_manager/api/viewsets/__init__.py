@@ -8,6 +8,8 @@ from rest_framework import mixins as drf_mixins
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from extras.signals import clear_webhooks
+from peering_manager.models import ConfigContextMixin
 from utils.api import get_serializer_for_model
 from utils.exceptions import AbortRequestError
 
@@ -34,6 +36,18 @@ class BaseViewSet(GenericViewSet):
         if self.requested_fields:
             kwargs["fields"] = self.requested_fields
 
+        # Resolve config contexts of all listed objects at once
+        if (
+            kwargs.get("many")
+            and not self.brief
+            and args
+            and hasattr(args[0], "__iter__")
+            and issubclass(self.queryset.model, ConfigContextMixin)
+            and "config_context" in (self.requested_fields or ["config_context"])
+        ):
+            args = (list(args[0]), *args[1:])
+            self.queryset.model.prefetch_config_contexts(args[0])
+
         # if self.brief:
         #   return get_serializer_for_model(serializer.Meta.model, prefix="Nested")
         return super().get_serializer(*args, **kwargs)
@@ -58,6 +72,7 @@ class BaseViewSet(GenericViewSet):
 class PeeringManagerReadOnlyModelViewSet(
     mixins.BriefModeMixin,
     mixins.ExportTemplatesMixin,
+    mixins.ResponseCacheMixin,
     drf_mixins.RetrieveModelMixin,
     drf_mixins.ListModelMixin,
     BaseViewSet,
@@ -71,6 +86,7 @@ class PeeringManagerModelViewSet(
     mixins.ObjectValidationMixin,
     mixins.BriefModeMixin,
     mixins.ExportTemplatesMixin,
+    mixins.ResponseCacheMixin,
     drf_mixins.CreateModelMixin,
     drf_mixins.RetrieveModelMixin,
     drf_mixins.UpdateModelMixin,
@@ -132,6 +148,11 @@ class PeeringManagerModelViewSet(
                 request, Response({"detail": e.message}, status=400), *args, **kwargs
             )
 
+    def handle_exception(self, exc):
+        # Changes made before the error have been rolled back, do not log them
+        clear_webhooks.send(sender=self)
+        return super().handle_exception(exc)
+
     # Creates
 
     def perform_create(self, serializer):
@@ -1,13 +1,26 @@
+import csv
+import hashlib
+import json
 import logging
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
-from django.http import Http404
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db import models, router, transaction
+from django.db.models.signals import pre_save
+from django.http import Http404, StreamingHttpResponse
+from django.utils.http import parse_etags
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
+from core.context_managers import bulk_change_logging
+from core.enums import ObjectChangeAction
+from core.models import CachedValue
 from extras.models import ExportTemplate
+from peering_manager.api.caching import get_cache_key, invalidate_models
 from peering_manager.api.exceptions import SerializerNotFoundError
 from peering_manager.api.serializers import BulkOperationSerializer
 from peering_manager.constants import NESTED_SERIALIZER_PREFIX
@@ -19,6 +32,8 @@ __all__ = (
     "BulkUpdateModelMixin",
     "ExportTemplatesMixin",
     "ObjectValidationMixin",
+    "ResponseCacheMixin",
+    "SetBasedWritesMixin",
 )
 
 
@@ -73,28 +88,200 @@ class BriefModeMixin:
         return qs
 
 
+class _Echo:
+    """
+    File-like object returning what is written to it, used to stream CSV rows.
+    """
+
+    def write(self, value):
+        return value
+
+
 class ExportTemplatesMixin:
     """
     Enable `ExportTemplate` support for list views.
+
+    Objects can also be exported as newline delimited JSON or CSV by using the
+    `ndjson` and `csv` reserved export names, for example:
+
+        GET /api/peering/autonomous-systems/?export=ndjson
+
+    In all cases, the filtered queryset is streamed in chunks to avoid loading all
+    objects in memory at once.
     """
 
+    export_chunk_size = 2000
+
     def list(self, request, *args, **kwargs):
         if "export" in request.GET:
+            queryset = self.filter_queryset(self.get_queryset())
+
+            if request.GET["export"] == "ndjson":
+                return self.export_ndjson(queryset)
+            if request.GET["export"] == "csv":
+                return self.export_csv(queryset)
+
             content_type = ContentType.objects.get_for_model(
                 self.get_serializer_class().Meta.model
             )
             et = ExportTemplate.objects.filter(
-                content_types=content_type, name=request.GET["export"]
+                content_type=content_type, name=request.GET["export"]
             ).first()
             if et is None:
                 raise Http404
-            queryset = self.filter_queryset(self.get_queryset())
-            return et.render_to_response(queryset)
+            return et.render_to_response(queryset, chunk_size=self.export_chunk_size)
 
         return super().list(request, *args, **kwargs)
 
+    def _iter_serialized(self, queryset):
+        # A single serializer is used to represent every object
+        serializer = self.get_serializer()
+        for obj in queryset.iterator(chunk_size=self.export_chunk_size):
+            yield serializer.to_representation(obj)
+
+    def _get_export_filename(self, queryset, extension):
+        return (
+            f"{queryset.model._meta.verbose_name_plural.replace(' ', '_')}.{extension}"
+        )
+
+    def export_ndjson(self, queryset):
+        """
+        Stream objects as newline delimited JSON, one serialized object per line.
+        """
+        response = StreamingHttpResponse(
+            (
+                json.dumps(data, cls=JSONEncoder) + "\n"
+                for data in self._iter_serialized(queryset)
+            ),
+            content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self._get_export_filename(queryset, "ndjson")}"'
+        )
+        return response
+
+    @staticmethod
+    def _flatten_for_csv(value):
+        """
+        Turn a serialized value into something fitting in a CSV cell. Choices are
+        represented by their values and nested objects by their display strings.
+        """
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return ",".join(ExportTemplatesMixin._flatten_for_csv(v) for v in value)
+        if isinstance(value, dict):
+            for key in ("value", "display", "id"):
+                if key in value:
+                    return str(value[key])
+            return json.dumps(value, cls=JSONEncoder)
+        return str(value)
+
+    def _iter_csv(self, queryset):
+        writer = csv.writer(_Echo())
+        header = None
+        for data in self._iter_serialized(queryset):
+            if header is None:
+                header = list(data)
+                yield writer.writerow(header)
+            yield writer.writerow(
+                [self._flatten_for_csv(data.get(key)) for key in header]
+            )
+
+    def export_csv(self, queryset):
+        """
+        Stream objects as CSV, serialized fields being used as columns.
+        """
+        response = StreamingHttpResponse(
+            self._iter_csv(queryset), content_type="text/csv; charset=utf-8"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self._get_export_filename(queryset, "csv")}"'
+        )
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Cache the data of list and detail responses when `CACHE_API_TIMEOUT` is set.
+
+    Cached data are shared by users with the same permissions and become stale as
+    soon as an object of the endpoint model (or of a related model) is changed. An
+    `ETag` header, computed from the cached data, is also set: a client sending it
+    back with `If-None-Match` gets a 304 response as long as the same data are
+    cached, without any serialization.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        timeout = settings.CACHE_API_TIMEOUT
+        if not timeout or request.method not in ("GET", "HEAD"):
+            return handler(request, *args, **kwargs)
+
+        key = get_cache_key(request, self.queryset.model)
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            # The ETag identifies the data themselves, not the request
+            body = json.dumps(response.data, cls=JSONEncoder, sort_keys=True)
+            entry = (
+                response.data,
+                hashlib.sha256(
+                    f"{body}:{request.accepted_media_type}".encode()
+                ).hexdigest()[:32],
+            )
+            cache.set(key, entry, timeout=timeout)
+        else:
+            response = None
+
+        data, etag = entry
+        etag = f'"{etag}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        if response is None:
+            response = Response(data)
+        response["ETag"] = etag
+        return response
+
+
+class SetBasedWritesMixin:
+    """
+    Helpers for bulk operations writing all objects at once instead of one by one,
+    enabled by passing `set_based=true` as a query parameter.
+
+    Set-based writes skip `save()` and `delete()` of each object, so they are only
+    used for models which do not customise these methods. Changes are logged and
+    webhooks queued as a whole by the `bulk_change_logging` context manager.
+    """
 
-class BulkUpdateModelMixin:
+    bulk_batch_size = 500
+
+    def use_set_based_writes(self, method):
+        """
+        Return whether the request asks for set-based writes and the model does not
+        define its own `method`.
+        """
+        if not self.request.query_params.get("set_based"):
+            return False
+
+        model = self.queryset.model
+        for klass in model.__mro__:
+            if klass is models.Model:
+                break
+            if method in vars(klass):
+                return False
+        return True
+
+
+class BulkUpdateModelMixin(SetBasedWritesMixin):
     """
     Support bulk modification of objects using the list endpoint for a model.
 
@@ -113,6 +300,9 @@ class BulkUpdateModelMixin:
             "status": "maintenance"
         }
     ]
+
+    All objects are validated before any of them is written. With `set_based=true`,
+    objects are written using `bulk_update()` unless many-to-many fields are set.
     """
 
     def bulk_update(self, request, *args, **kwargs):
@@ -130,24 +320,86 @@ class BulkUpdateModelMixin:
 
     def perform_bulk_update(self, objects, update_data, partial):
         with transaction.atomic():
-            data_list = []
+            serializers = []
+            errors = []
             for obj in objects:
                 data = update_data.get(obj.id)
                 if hasattr(obj, "snapshot"):
                     obj.snapshot()
                 serializer = self.get_serializer(obj, data=data, partial=partial)
-                serializer.is_valid(raise_exception=True)
-                self.perform_update(serializer)
-                data_list.append(serializer.data)
+                errors.append({} if serializer.is_valid() else serializer.errors)
+                serializers.append(serializer)
+
+            if any(errors):
+                raise ValidationError(errors)
+
+            if self.use_set_based_update(serializers):
+                self.perform_set_based_update(serializers)
+            else:
+                for serializer in serializers:
+                    self.perform_update(serializer)
 
-            return data_list
+            return [serializer.data for serializer in serializers]
+
+    def use_set_based_update(self, serializers):
+        if not serializers or not self.use_set_based_writes("save"):
+            return False
+
+        # Many-to-many fields, such as tags, cannot be written with bulk_update()
+        fields = {f.name for f in self.queryset.model._meta.concrete_fields}
+        return all(set(s.validated_data) <= fields for s in serializers)
+
+    def perform_set_based_update(self, serializers):
+        model = self.queryset.model
+        logger = logging.getLogger(
+            f"peering_manager.api.views.{self.__class__.__name__}"
+        )
+        logger.info(f"updating {len(serializers)} {model._meta.verbose_name_plural}")
+
+        db = router.db_for_write(model)
+        fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+        instances = []
+        for serializer in serializers:
+            instance = serializer.instance
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+
+            # Do what save() would do: let receivers alter the object and fields
+            # update their values (e.g. auto_now timestamps)
+            pre_save.send(
+                sender=model,
+                instance=instance,
+                raw=False,
+                using=db,
+                update_fields=None,
+            )
+            for field in fields:
+                setattr(instance, field.attname, field.pre_save(instance, False))
+            instances.append(instance)
+
+        # Enforce object-level permissions on save()
+        try:
+            with bulk_change_logging(instances, ObjectChangeAction.UPDATE):
+                model._default_manager.db_manager(db).bulk_update(
+                    instances,
+                    [f.name for f in fields],
+                    batch_size=self.bulk_batch_size,
+                )
+                self._validate_objects(instances)
+        except ObjectDoesNotExist:
+            raise PermissionDenied() from None
+
+        # post_save is not sent, make cached API responses and search values stale
+        # explicitly
+        invalidate_models(model)
+        CachedValue.cache_objects(instances)
 
     def bulk_partial_update(self, request, *args, **kwargs):
         kwargs["partial"] = True
         return self.bulk_update(request, *args, **kwargs)
 
 
-class BulkDestroyModelMixin:
+class BulkDestroyModelMixin(SetBasedWritesMixin):
     """
     Support bulk deletion of objects using the list endpoint for a model.
 
@@ -159,6 +411,9 @@ class BulkDestroyModelMixin:
         {"id": 123},
         {"id": 456}
     ]
+
+    With `set_based=true`, objects are deleted using a single `delete()` call on
+    the queryset.
     """
 
     def bulk_destroy(self, request, *args, **kwargs):
@@ -172,11 +427,31 @@ class BulkDestroyModelMixin:
 
     def perform_bulk_destroy(self, objects):
         with transaction.atomic():
+            if self.use_set_based_writes("delete"):
+                self.perform_set_based_destroy(objects)
+                return
+
             for obj in objects:
                 if hasattr(obj, "snapshot"):
                     obj.snapshot()
                 self.perform_destroy(obj)
 
+    def perform_set_based_destroy(self, objects):
+        model = self.queryset.model
+        logger = logging.getLogger(
+            f"peering_manager.api.views.{self.__class__.__name__}"
+        )
+
+        instances = list(objects)
+        logger.info(f"deleting {len(instances)} {model._meta.verbose_name_plural}")
+        for instance in instances:
+            if hasattr(instance, "snapshot"):
+                instance.snapshot()
+
+        # Objects deleted in cascade are still logged one by one by signal receivers
+        with bulk_change_logging(instances, ObjectChangeAction.DELETE):
+            model._default_manager.filter(pk__in=[i.pk for i in instances]).delete()
+
 
 class ObjectValidationMixin:
     def _validate_objects(self, instance):
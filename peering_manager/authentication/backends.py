@@ -6,11 +6,17 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend as DjangoModelBackend
 from django.contrib.auth.backends import RemoteUserBackend as DjangoRemoteUserBackend
 from django.contrib.auth.models import AnonymousUser, Group, Permission
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 
 User = get_user_model()
 logger = logging.getLogger("peering.manager.authentication.RemoteAuthBackend")
 
+PERMISSIONS_KEY_PREFIX = "permissions"
+PERMISSIONS_VERSION_KEY = "permissions_version"
+
 AUTH_BACKEND_ATTRS = {
     "amazon": ("Amazon AWS", "fa-fw fa-brands fa-aws"),
     "apple": ("Apple", "fa-fw fa-brands fa-apple"),
@@ -68,13 +74,61 @@ def resolve_permission(name):
         ) from e
 
 
-class ModelBackend(DjangoModelBackend):
+def invalidate_permissions():
     """
-    This class simply inherits Django's model backend in order to have it imported from this package.
+    Makes all cached permissions stale, immediately and once the current
+    transaction (if any) is committed, so that permissions cached in the meantime
+    are not kept.
     """
 
+    def bump():
+        cache.add(PERMISSIONS_VERSION_KEY, 0, timeout=None)
+        try:
+            cache.incr(PERMISSIONS_VERSION_KEY)
+        except ValueError:
+            # Key evicted in the meantime
+            cache.set(PERMISSIONS_VERSION_KEY, 1, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
 
-class RemoteUserBackend(DjangoRemoteUserBackend):
+class CachedPermissionsMixin:
+    """
+    Caches the permissions of users, granted directly or through their groups,
+    for `CACHE_PERMISSIONS_TIMEOUT` seconds instead of querying them on each
+    request.
+
+    Cached permissions are made stale by bumping a version whenever permissions
+    are assigned to users or groups, or users are added to or removed from groups.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not settings.CACHE_PERMISSIONS_TIMEOUT or hasattr(user_obj, "_perm_cache"):
+            return super().get_all_permissions(user_obj, obj=obj)
+
+        version = cache.get(PERMISSIONS_VERSION_KEY, 0)
+        key = (
+            f"{PERMISSIONS_KEY_PREFIX}:{user_obj.pk}:{user_obj.is_superuser:d}:"
+            f"{version}"
+        )
+        permissions = cache.get(key)
+        if permissions is None:
+            permissions = super().get_all_permissions(user_obj, obj=obj)
+            cache.set(key, permissions, timeout=settings.CACHE_PERMISSIONS_TIMEOUT)
+        user_obj._perm_cache = permissions
+        return permissions
+
+
+class ModelBackend(CachedPermissionsMixin, DjangoModelBackend):
+    """
+    Django's model backend, with permissions of users cached.
+    """
+
+
+class RemoteUserBackend(CachedPermissionsMixin, DjangoRemoteUserBackend):
     def _is_superuser(self, user):
         superuser_groups = settings.REMOTE_AUTH_SUPERUSER_GROUPS
         logger.debug(f"superuser groups: '{superuser_groups}")
@@ -110,33 +164,44 @@ class RemoteUserBackend(DjangoRemoteUserBackend):
         return settings.REMOTE_AUTH_AUTO_CREATE_USER
 
     def configure_groups(self, user, remote_groups):
-        groups = []
+        """
+        Synchronises the groups of a user with the remote ones, only writing to the
+        database if they differ.
+        """
+        remote_groups = list(dict.fromkeys(remote_groups or []))
+        existing = {g.name: g for g in Group.objects.filter(name__in=remote_groups)}
 
+        groups = []
         for name in remote_groups:
-            try:
-                groups.append(Group.objects.get(name=name))
-            except Group.DoesNotExist:
-                if settings.REMOTE_AUTH_AUTO_CREATE_GROUPS:
-                    groups.append(Group.objects.create(name=name))
-                else:
-                    logging.error(
-                        f"could not assign group '{name}' to remote user '{user}': group not found"
-                    )
-
-        if groups:
-            user.groups.set(groups)
-            logger.debug(f"assigned groups to remote user {user}: {groups}")
-        else:
-            user.groups.clear()
-            logger.debug(f"stripping user {user} from groups")
-
-        user.is_superuser = self._is_superuser(user)
-        logger.debug(f"user '{user}' is superuser: {user.is_superuser}")
-
-        user.is_staff = self._is_staff(user)
-        logger.debug(f"user '{user}' is staff: {user.is_staff}")
+            if name in existing:
+                groups.append(existing[name])
+            elif settings.REMOTE_AUTH_AUTO_CREATE_GROUPS:
+                groups.append(Group.objects.create(name=name))
+            else:
+                logging.error(
+                    f"could not assign group '{name}' to remote user '{user}': group not found"
+                )
 
-        user.save()
+        # Groups are fetched once for both the comparison and the flags below
+        prefetch_related_objects([user], "groups")
+        if {g.pk for g in groups} != {g.pk for g in user.groups.all()}:
+            if groups:
+                user.groups.set(groups)
+                logger.debug(f"assigned groups to remote user {user}: {groups}")
+            else:
+                user.groups.clear()
+                logger.debug(f"stripping user {user} from groups")
+
+        is_superuser = self._is_superuser(user)
+        logger.debug(f"user '{user}' is superuser: {is_superuser}")
+
+        is_staff = self._is_staff(user)
+        logger.debug(f"user '{user}' is staff: {is_staff}")
+
+        if (user.is_superuser, user.is_staff) != (is_superuser, is_staff):
+            user.is_superuser = is_superuser
+            user.is_staff = is_staff
+            user.save(update_fields=["is_superuser", "is_staff"])
         return user
 
     def configure_user(self, request, user):
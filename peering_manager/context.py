@@ -1,7 +1,14 @@
 from contextvars import ContextVar
 
-__all__ = ("current_request", "webhooks_queue")
+__all__ = (
+    "bulk_changed_objects",
+    "current_request",
+    "objectchanges_queue",
+    "webhooks_queue",
+)
 
 
 current_request = ContextVar("current_request", default=None)
 webhooks_queue = ContextVar("webhooks_queue")
+objectchanges_queue = ContextVar("objectchanges_queue")
+bulk_changed_objects = ContextVar("bulk_changed_objects", default=frozenset())
@@ -56,11 +56,6 @@ class BaseFilterSet(django_filters.FilterSet):
         }
     )
 
-    def __init__(self, data=None, *args, **kwargs):
-        self.base_filters = self.__class__.get_filters()
-
-        super().__init__(data, *args, **kwargs)
-
     @staticmethod
     def _get_filter_lookup_dict(existing_filter):
         # Choose the lookup expression map based on the filter type
@@ -173,6 +168,9 @@ class BaseFilterSet(django_filters.FilterSet):
 
         For specific filter types, new filters are created based on defined lookup
         expressions in the form `<field_name>__<lookup_expr>`
+
+        This is only run once per class, when it is created, to set `base_filters`.
+        Instances work on deep copies of these filters.
         """
         filters = super().get_filters()
 
@@ -4,14 +4,8 @@ from .functions import *
 from .loaders import *
 
 
-def render_jinja2(template, context, trim=False, lstrip=False):
-    """
-    Render the template using Jinja2.
-    """
-    import traceback
-
+def _get_environment(trim=False, lstrip=False):
     from django.conf import settings
-    from jinja2 import TemplateSyntaxError
     from jinja2.sandbox import SandboxedEnvironment
 
     environment = SandboxedEnvironment(
@@ -25,12 +19,56 @@ def render_jinja2(template, context, trim=False, lstrip=False):
     environment.filters.update(FILTER_DICT)
     environment.globals.update(FUNCTION_DICT)
 
+    return environment
+
+
+def compile_jinja2(template, trim=False, lstrip=False):
+    """
+    Compile the template using Jinja2, allowing to render it several times.
+    """
+    return _get_environment(trim=trim, lstrip=lstrip).from_string(template)
+
+
+def render_jinja2(template, context, trim=False, lstrip=False):
+    """
+    Render the template using Jinja2. The template can also be an already compiled
+    one.
+    """
+    import traceback
+
+    from jinja2 import TemplateSyntaxError
+
     # Try rendering the template, return a message about syntax issues if there
     # are any
     try:
-        jinja2_template = environment.from_string(template)
-        return jinja2_template.render(**context)
+        if isinstance(template, str):
+            template = compile_jinja2(template, trim=trim, lstrip=lstrip)
+        return template.render(**context)
     except TemplateSyntaxError as e:
         return f"Syntax error in template at line {e.lineno}: {e.message}"
     except Exception:
         return traceback.format_exc()
+
+
+def stream_jinja2(template, context, trim=False, lstrip=False):
+    """
+    Render the template using Jinja2, yielding the output piece by piece instead of
+    building it as a whole.
+    """
+    import traceback
+
+    from jinja2 import TemplateSyntaxError
+
+    environment = _get_environment(trim=trim, lstrip=lstrip)
+
+    try:
+        jinja2_template = environment.from_string(template)
+    except TemplateSyntaxError as e:
+        yield f"Syntax error in template at line {e.lineno}: {e.message}"
+        return
+
+    # Output already sent cannot be taken back, errors are appended to it
+    try:
+        yield from jinja2_template.generate(**context)
+    except Exception:
+        yield traceback.format_exc()
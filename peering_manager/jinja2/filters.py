@@ -28,7 +28,7 @@ from peering.models import (
 from peering_manager.models.features import ConfigContextMixin, TagsMixin
 from peeringdb.functions import get_possible_peering_sessions, get_shared_facilities
 from peeringdb.models import Network
-from utils.functions import get_key_in_hash, serialize_object
+from utils.functions import QuerySetStream, get_key_in_hash, serialize_object
 
 __all__ = ("FILTER_DICT",)
 
@@ -246,7 +246,7 @@ def filter(value, **kwargs):
     """
     Returns a filtered queryset or iterable based on provided criteria.
     """
-    if type(value) is QuerySet:
+    if isinstance(value, QuerySet | QuerySetStream):
         return value.filter(**kwargs)
 
     try:
@@ -290,7 +290,7 @@ def unique_items(value, field):
     """
     Returns an iterable containing unique items based on a field (and its value).
     """
-    if type(value) is QuerySet:
+    if isinstance(value, QuerySet | QuerySetStream):
         return value.order_by().distinct(field)
 
     try:
@@ -454,7 +454,7 @@ def length(value):
     """
     Returns the number of items in a queryset or an iterable.
     """
-    if type(value) is QuerySet:
+    if isinstance(value, QuerySet | QuerySetStream):
         return value.count()
 
     # Fallback to python's len()
@@ -855,7 +855,7 @@ def _serialize(value):
     Serializes a queryset, an object or a basic value as something usable by a JSON or
     YAML dumper.
     """
-    if type(value) is QuerySet:
+    if isinstance(value, QuerySet | QuerySetStream):
         data = [serialize_object(i) for i in value]
     elif isinstance(value, models.Model):
         data = serialize_object(value)
@@ -1,8 +1,19 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
 from django_prometheus import middleware
 from django_prometheus.conf import NAMESPACE
-from prometheus_client import Counter
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from redis.exceptions import RedisError
 
-__all__ = ("Metrics",)
+__all__ = (
+    "Metrics",
+    "QueueCollector",
+    "StatisticsCollector",
+    "webhook_deliveries",
+    "webhook_delivery_latency",
+)
 
 
 class Metrics(middleware.Metrics):
@@ -27,3 +38,81 @@ class Metrics(middleware.Metrics):
             ["view", "method"],
             namespace=NAMESPACE,
         )
+
+
+webhook_deliveries = Counter(
+    "webhook_deliveries_total",
+    "Count of webhook deliveries by webhook and outcome",
+    ["webhook", "outcome"],
+    namespace=NAMESPACE,
+)
+webhook_delivery_latency = Histogram(
+    "webhook_delivery_latency_seconds",
+    "Histogram of webhook request latency by webhook",
+    ["webhook"],
+    namespace=NAMESPACE,
+)
+
+
+class QueueCollector:
+    """
+    Collects, when metrics are exposed, the number of jobs waiting in each
+    background task queue and for how long the oldest one has been waiting.
+    """
+
+    def collect(self):
+        from django_rq import get_queue
+
+        prefix = f"{NAMESPACE}_" if NAMESPACE else ""
+        depth = GaugeMetricFamily(
+            f"{prefix}rq_queue_depth",
+            "Number of jobs waiting in a background task queue",
+            labels=["queue"],
+        )
+        latency = GaugeMetricFamily(
+            f"{prefix}rq_queue_latency_seconds",
+            "Time the oldest job of a background task queue has been waiting",
+            labels=["queue"],
+        )
+
+        now = datetime.now(tz=timezone.utc)
+        for name in settings.RQ_QUEUES:
+            queue = get_queue(name)
+            try:
+                depth.add_metric([name], queue.count)
+                waiting = 0
+                if (job_ids := queue.get_job_ids(0, 1)) and (
+                    job := queue.fetch_job(job_ids[0])
+                ):
+                    enqueued_at = job.enqueued_at
+                    if enqueued_at.tzinfo is None:
+                        enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+                    waiting = max((now - enqueued_at).total_seconds(), 0)
+                latency.add_metric([name], waiting)
+            except RedisError:
+                # Do not fail exposing other metrics if Redis is unavailable
+                continue
+
+        yield depth
+        yield latency
+
+
+class StatisticsCollector:
+    """
+    Collects, when metrics are exposed, the number of objects of the models counted
+    on the home page, sharing their cache.
+    """
+
+    def collect(self):
+        from .statistics import STATISTICS, get_statistics
+
+        prefix = f"{NAMESPACE}_" if NAMESPACE else ""
+        objects = GaugeMetricFamily(
+            f"{prefix}objects", "Number of objects of a model", labels=["model"]
+        )
+
+        statistics = get_statistics()
+        for name, label in STATISTICS.items():
+            objects.add_metric([label], statistics[name])
+
+        yield objects
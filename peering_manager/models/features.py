@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.validators import ValidationError
 from django.db import models
 from django.utils import timezone
@@ -67,9 +71,15 @@ class ChangeLoggingMixin(models.Model):
         if hasattr(self, "_prechange_snapshot"):
             object_change.prechange_data = self._prechange_snapshot
         if action in (ObjectChangeAction.CREATE, ObjectChangeAction.UPDATE):
-            object_change.postchange_data = serialize_object(
-                self, exclude=self.excluded_fields
-            )
+            if (snapshot := getattr(self, "_postchange_snapshot", None)) is not None:
+                # Reuse the snapshot already computed for webhooks
+                object_change.postchange_data = {
+                    k: v for k, v in snapshot.items() if k not in self.excluded_fields
+                }
+            else:
+                object_change.postchange_data = serialize_object(
+                    self, exclude=self.excluded_fields
+                )
 
         return object_change
 
@@ -81,6 +91,10 @@ class ConfigContextMixin(models.Model):
     class Meta:
         abstract = True
 
+    def refresh_from_db(self, *args, **kwargs):
+        self.__dict__.pop("_config_context", None)
+        super().refresh_from_db(*args, **kwargs)
+
     @property
     def config_context(self):
         """
@@ -99,17 +113,32 @@ class ConfigContextMixin(models.Model):
                 }
             )
 
-    def get_config_context(self):
+    def _get_config_context_key(self, assignments):
         """
-        Merge the config contexts and the local context data all together according to
-        the pre-defined merge strategy.
+        Return the key used to cache the config context of an object, it changes as
+        soon as a config context is assigned, unassigned or changed, or when the
+        local context data changes.
+        """
+        digest = hashlib.sha256(
+            repr(
+                (
+                    assignments,
+                    json.dumps(self.local_context_data, sort_keys=True, default=str),
+                    settings.CONFIG_CONTEXT_MERGE_STRATEGY,
+                )
+            ).encode()
+        ).hexdigest()
+        return f"config_context:{digest}"
+
+    def _merge_config_context(self, contexts):
+        """
+        Merge the given config contexts data and the local context data all
+        together according to the pre-defined merge strategy.
         """
         rendered = {}
-        for assignment in self.config_contexts.all():
+        for data in contexts:
             rendered = merge_hash(
-                rendered,
-                assignment.config_context.data,
-                **settings.CONFIG_CONTEXT_MERGE_STRATEGY,
+                rendered, data, **settings.CONFIG_CONTEXT_MERGE_STRATEGY
             )
 
         if not self.local_context_data and not rendered:
@@ -124,6 +153,95 @@ class ConfigContextMixin(models.Model):
             rendered, self.local_context_data, **settings.CONFIG_CONTEXT_MERGE_STRATEGY
         )
 
+    def get_config_context(self):
+        """
+        Merge the config contexts and the local context data all together according to
+        the pre-defined merge strategy.
+
+        Merged contexts are cached, keyed by the assigned config contexts with their
+        versions and by the local context data, and kept by the object until it is
+        saved or reloaded (see `extras.signals.clear_config_context`). A copy is returned so that callers can change it.
+        """
+        if "_config_context" not in self.__dict__:
+            self._config_context = self._resolve_config_context()
+        return copy.deepcopy(self._config_context)
+
+    def _resolve_config_context(self):
+        assignments = list(
+            self.config_contexts.values_list(
+                "config_context_id", "config_context__updated"
+            )
+        )
+        if not assignments:
+            return self._merge_config_context([])
+
+        key = None
+        if settings.CACHE_CONFIG_CONTEXT_TIMEOUT:
+            key = self._get_config_context_key(assignments)
+            if (rendered := cache.get(key)) is not None:
+                return rendered
+
+        rendered = self._merge_config_context(
+            a.config_context.data
+            for a in self.config_contexts.select_related("config_context")
+        )
+        if key:
+            cache.set(key, rendered, timeout=settings.CACHE_CONFIG_CONTEXT_TIMEOUT)
+        return rendered
+
+    @classmethod
+    def prefetch_config_contexts(cls, objects):
+        """
+        Resolve the config contexts of several objects at once, with a query for
+        all their assignments and one for the data of the contexts not found in the
+        cache. Objects keep their config context until they are saved or reloaded.
+        """
+        from extras.models import ConfigContext, ConfigContextAssignment
+
+        objects = [o for o in objects if o.pk]
+        if not objects:
+            return
+
+        assignments = defaultdict(list)
+        for object_id, context_id, updated in ConfigContextAssignment.objects.filter(
+            content_type=ContentType.objects.get_for_model(cls),
+            object_id__in=[o.pk for o in objects],
+        ).values_list("object_id", "config_context_id", "config_context__updated"):
+            assignments[object_id].append((context_id, updated))
+
+        keys = {}
+        if settings.CACHE_CONFIG_CONTEXT_TIMEOUT:
+            keys = {
+                o.pk: o._get_config_context_key(assignments[o.pk])
+                for o in objects
+                if assignments[o.pk]
+            }
+        cached = cache.get_many(keys.values())
+
+        missing = {
+            o.pk for o in objects if assignments[o.pk] and keys.get(o.pk) not in cached
+        }
+        data = dict(
+            ConfigContext.objects.filter(
+                pk__in={c for pk in missing for c, _ in assignments[pk]}
+            ).values_list("pk", "data")
+        )
+
+        to_cache = {}
+        for o in objects:
+            if o.pk in missing:
+                o._config_context = o._merge_config_context(
+                    data[c] for c, _ in assignments[o.pk]
+                )
+                if o.pk in keys:
+                    to_cache[keys[o.pk]] = o._config_context
+            elif o.pk in keys:
+                o._config_context = cached[keys[o.pk]]
+            else:
+                o._config_context = o._merge_config_context([])
+        if to_cache:
+            cache.set_many(to_cache, timeout=settings.CACHE_CONFIG_CONTEXT_TIMEOUT)
+
 
 class ExportTemplatesMixin(models.Model):
     """
@@ -235,20 +353,30 @@ class PushedDataMixin(models.Model):
                 pass
         return None
 
-    def push_data(self):
+    def render_data(self) -> str:
         """
-        Inheriting models must override this method with specific logic to copy data
-        from the assigned `DataFile` to the local instance. This method should *NOT*
-        call `save()` on the instance.
+        Inheriting models must override this method to return the content of the
+        file to push to the assigned `DataSource`.
         """
         raise NotImplementedError()
 
+    def push_data(self):
+        """
+        Push the content returned by `render_data()` to the assigned `DataSource`
+        (if any). This method should *NOT* call `save()` on the instance.
+        """
+        if self.data_source and self.data_path:
+            self.data_source.push(self.data_path, self.render_data())
+
     def push(self, save=False):
         """
         Push the object from it's assigned `DataFile` (if any). This wraps
         `push_data()` and updates the `data_pushed` timestamp.
         """
         self.push_data()
+        self.mark_pushed(save=save)
+
+    def mark_pushed(self, save=False):
         self.data_pushed = timezone.now()
 
         data_file = self.resolve_data_file()
@@ -258,6 +386,52 @@ class PushedDataMixin(models.Model):
         if save:
             self.save()
 
+    @classmethod
+    def push_many(cls, objects, save=False):
+        """
+        Push objects to their assigned `DataSource`s, with a single commit per data
+        source for all their files.
+
+        Objects sharing the same file of a data source are not pushed, as only one
+        of them could be written.
+
+        Return the objects which have been pushed and a dict of errors by objects
+        which have not.
+        """
+        pushed, errors = [], {}
+
+        by_path = defaultdict(list)
+        for o in objects:
+            if o.data_source and o.data_path:
+                by_path[o.data_source, o.data_path].append(o)
+
+        by_source = defaultdict(dict)
+        for (data_source, data_path), same_path in by_path.items():
+            if len(same_path) > 1:
+                error = ValueError(
+                    f"{data_source}:{data_path} is used by {len(same_path)} objects"
+                )
+                errors.update(dict.fromkeys(same_path, error))
+                continue
+            o = same_path[0]
+            try:
+                by_source[data_source][o] = o.render_data()
+            except Exception as e:
+                errors[o] = e
+
+        for data_source, contents in by_source.items():
+            try:
+                data_source.push_files({o.data_path: c for o, c in contents.items()})
+            except Exception as e:
+                errors.update(dict.fromkeys(contents, e))
+                continue
+
+            for o in contents:
+                o.mark_pushed(save=save)
+                pushed.append(o)
+
+        return pushed, errors
+
 
 class SynchronisedDataMixin(models.Model):
     data_source = models.ForeignKey(
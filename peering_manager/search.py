@@ -0,0 +1,53 @@
+import ipaddress
+
+from .registry import SEARCH_KEY, registry
+
+__all__ = ("SearchIndex", "get_indexer", "register_search")
+
+
+class SearchIndex:
+    """
+    Declares the fields of a model copied in the search cache, as (name, weight)
+    pairs. The lower the weight, the more relevant a match on the field is.
+    """
+
+    model = None
+    fields = ()
+
+    @classmethod
+    def get_field_names(cls) -> set[str]:
+        return {name for name, _ in cls.fields}
+
+    @staticmethod
+    def get_field_value(instance, name) -> str | None:
+        value = getattr(instance, name)
+        if value is None or value == "":
+            return None
+        # Addresses are looked up without their prefix length
+        if isinstance(value, ipaddress.IPv4Interface | ipaddress.IPv6Interface):
+            return str(value.ip)
+        return str(value)
+
+    @classmethod
+    def to_cache(cls, instance) -> list[tuple[str, str, int]]:
+        """
+        Returns (field, value, weight) tuples of the object values to cache.
+        """
+        values = []
+        for name, weight in cls.fields:
+            value = cls.get_field_value(instance, name)
+            if value is not None:
+                values.append((name, value, weight))
+        return values
+
+
+def register_search(cls):
+    """
+    Decorator registering a `SearchIndex` for its model.
+    """
+    registry[SEARCH_KEY][cls.model._meta.label_lower] = cls
+    return cls
+
+
+def get_indexer(model) -> type[SearchIndex] | None:
+    return registry[SEARCH_KEY].get(model._meta.label_lower)
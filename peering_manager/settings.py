@@ -11,6 +11,7 @@ import importlib
 import os
 import platform
 import sys
+import tempfile
 import warnings
 from importlib.util import find_spec
 from pathlib import Path
@@ -79,9 +80,21 @@ DEBUG = getattr(configuration, "DEBUG", False)
 LOGGING = getattr(configuration, "LOGGING", {})
 REDIS = getattr(configuration, "REDIS", {})
 RQ_DEFAULT_TIMEOUT = getattr(configuration, "RQ_DEFAULT_TIMEOUT", 300)
+WEBHOOK_RETRIES = getattr(configuration, "WEBHOOK_RETRIES", 0)
+WEBHOOK_RETRY_BACKOFF = getattr(configuration, "WEBHOOK_RETRY_BACKOFF", 30)
+CACHE_API_TIMEOUT = getattr(configuration, "CACHE_API_TIMEOUT", 0)
 CACHE_BGP_DETAIL_TIMEOUT = getattr(configuration, "CACHE_BGP_DETAIL_TIMEOUT", 900)
+CACHE_COUNT_TIMEOUT = getattr(configuration, "CACHE_COUNT_TIMEOUT", 0)
+CACHE_CONFIG_CONTEXT_TIMEOUT = getattr(
+    configuration, "CACHE_CONFIG_CONTEXT_TIMEOUT", 86400
+)
+CACHE_IXAPI_TIMEOUT = getattr(configuration, "CACHE_IXAPI_TIMEOUT", 86400)
+CACHE_PERMISSIONS_TIMEOUT = getattr(configuration, "CACHE_PERMISSIONS_TIMEOUT", 3600)
 CACHE_PREFIX_LIST_TIMEOUT = getattr(configuration, "CACHE_PREFIX_LIST_TIMEOUT", 3600)
+CACHE_STATISTICS_TIMEOUT = getattr(configuration, "CACHE_STATISTICS_TIMEOUT", 3600)
+CACHE_TOKEN_TIMEOUT = getattr(configuration, "CACHE_TOKEN_TIMEOUT", 60)
 CHANGELOG_RETENTION = getattr(configuration, "CHANGELOG_RETENTION", 90)
+JOB_CONCURRENCY = getattr(configuration, "JOB_CONCURRENCY", {})
 JOB_RETENTION = getattr(configuration, "JOB_RETENTION", 90)
 LOGIN_PERSISTENCE = getattr(configuration, "LOGIN_PERSISTENCE", False)
 LOGIN_REQUIRED = getattr(configuration, "LOGIN_REQUIRED", False)
@@ -94,6 +107,7 @@ NAPALM_TIMEOUT = getattr(configuration, "NAPALM_TIMEOUT", 30)
 NAPALM_ARGS = getattr(configuration, "NAPALM_ARGS", {})
 PAGINATE_COUNT = getattr(configuration, "PAGINATE_COUNT", 20)
 MAX_PAGE_SIZE = getattr(configuration, "MAX_PAGE_SIZE", 1000)
+COUNT_ESTIMATE_THRESHOLD = getattr(configuration, "COUNT_ESTIMATE_THRESHOLD", 100000)
 DEFAULT_USER_PREFERENCES = getattr(configuration, "DEFAULT_USER_PREFERENCES", {})
 METRICS_ENABLED = getattr(configuration, "METRICS_ENABLED", False)
 
@@ -184,6 +198,11 @@ GIT_COMMIT_AUTHOR = getattr(
 GIT_COMMIT_MESSAGE = getattr(
     configuration, "GIT_COMMIT_MESSAGE", "Committed using Peering Manager"
 )
+DATA_SOURCE_CACHE_PATH = getattr(
+    configuration,
+    "DATA_SOURCE_CACHE_PATH",
+    str(Path(tempfile.gettempdir(), "peering-manager", "data-sources")),
+)
 VALIDATE_BGP_COMMUNITY_VALUE = getattr(
     configuration, "VALIDATE_BGP_COMMUNITY_VALUE", True
 )
@@ -392,6 +411,13 @@ CACHES = {
     }
 }
 
+if "test" in sys.argv:
+    # Keep cached data of tests run in parallel processes apart
+    def make_test_cache_key(key, key_prefix, version):
+        return f"test-{os.getpid()}:{key_prefix}:{version}:{key}"
+
+    CACHES["default"]["KEY_FUNCTION"] = make_test_cache_key
+
 if TASKS_REDIS_USING_SENTINEL:
     RQ_PARAMS = {
         "SENTINELS": TASKS_REDIS_SENTINELS,
@@ -426,7 +452,11 @@ if TASKS_REDIS_CA_CERT_PATH:
     RQ_PARAMS.setdefault("REDIS_CLIENT_KWARGS", {})
     RQ_PARAMS["REDIS_CLIENT_KWARGS"]["ssl_ca_certs"] = TASKS_REDIS_CA_CERT_PATH
 
-RQ_QUEUES = {"high": RQ_PARAMS, "default": RQ_PARAMS, "low": RQ_PARAMS}
+# Queues by decreasing priority, a worker listening on several queues always takes
+# jobs from the first non-empty one
+RQ_QUEUES = dict.fromkeys(
+    ("interactive", "high", "default", "deploy", "polling", "sync", "low"), RQ_PARAMS
+)
 RQ_EXCEPTION_HANDLERS = ["core.exceptions.exception_handler"]
 
 if LOGIN_TIMEOUT is not None:
@@ -0,0 +1,71 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+__all__ = ("STATISTICS", "get_statistics", "invalidate_statistics")
+
+STATISTICS_CACHE_KEY = "statistics"
+
+# Models counted on the home page, by statistic name
+STATISTICS = {
+    "autonomous_systems_count": "peering.autonomoussystem",
+    "bfd_count": "net.bfd",
+    "bgp_groups_count": "peering.bgpgroup",
+    "communities_count": "bgp.community",
+    "configurations_count": "devices.configuration",
+    "connections_count": "net.connection",
+    "contacts_count": "messaging.contact",
+    "direct_peering_sessions_count": "peering.directpeeringsession",
+    "emails_count": "messaging.email",
+    "internet_exchanges_count": "peering.internetexchange",
+    "internet_exchange_peering_sessions_count": "peering.internetexchangepeeringsession",
+    "routers_count": "devices.router",
+    "routing_policies_count": "peering.routingpolicy",
+}
+
+
+def count_objects():
+    """
+    Counts objects of all models with a single query.
+    """
+    tables = [
+        connection.ops.quote_name(apps.get_model(label)._meta.db_table)
+        for label in STATISTICS.values()
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table})" for table in tables)
+        )
+        return dict(zip(STATISTICS, cursor.fetchone(), strict=True))
+
+
+def get_statistics():
+    """
+    Returns the number of objects of each model, along with the time they were
+    counted at (in the `updated` key).
+
+    Statistics are cached until an object of a counted model is created or deleted,
+    or the cache timeout is reached.
+    """
+    statistics = cache.get(STATISTICS_CACHE_KEY)
+    if statistics is None:
+        statistics = count_objects()
+        statistics["updated"] = timezone.now()
+        if settings.CACHE_STATISTICS_TIMEOUT:
+            cache.set(
+                STATISTICS_CACHE_KEY,
+                statistics,
+                timeout=settings.CACHE_STATISTICS_TIMEOUT,
+            )
+    return statistics
+
+
+def invalidate_statistics(model):
+    """
+    Makes cached statistics stale if the model is counted, once the current
+    transaction (if any) is committed.
+    """
+    if model._meta.label_lower in STATISTICS.values():
+        transaction.on_commit(lambda: cache.delete(STATISTICS_CACHE_KEY))
@@ -19,17 +19,52 @@ __all__ = (
     "BooleanColumn",
     "ChoiceFieldColumn",
     "ColourColumn",
+    "Column",
     "ContentTypeColumn",
     "ContentTypesColumn",
     "DateTimeColumn",
     "LinkedCountColumn",
     "MarkdownColumn",
+    "QueryColumnMixin",
     "SelectColumn",
     "TagColumn",
     "ToggleColumn",
 )
 
 
+class QueryColumnMixin:
+    """
+    Let a column declare what it needs from the queryset of its table.
+
+    :param select_related: Relations to join when the column is used (optional)
+    :param prefetch_related: Relations to prefetch when the column is used (optional)
+    :param annotations: A dict of expressions to annotate objects with, by name,
+        when the column is used (optional)
+
+    A table only applies the needs of its visible columns and of the columns it is
+    ordered by, so hidden columns do not make queries slower.
+    """
+
+    def __init__(
+        self,
+        *args,
+        select_related=(),
+        prefetch_related=(),
+        annotations=None,
+        **kwargs,
+    ):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.annotations = annotations or {}
+        super().__init__(*args, **kwargs)
+
+
+class Column(QueryColumnMixin, tables.Column):
+    """
+    Generic column able to declare its queryset needs.
+    """
+
+
 @dataclass
 class ActionsItem:
     title: str
@@ -160,7 +195,7 @@ class ActionsColumn(tables.Column):
         return mark_safe(html)
 
 
-class BooleanColumn(tables.BooleanColumn):
+class BooleanColumn(QueryColumnMixin, tables.BooleanColumn):
     """
     Simple column customising boolean value rendering using icons and Bootstrap colors.
     """
@@ -285,7 +320,7 @@ class DateTimeColumn(tables.Column):
         return None
 
 
-class LinkedCountColumn(tables.Column):
+class LinkedCountColumn(QueryColumnMixin, tables.Column):
     """
     Render a count of related objects linked to a filtered URL.
 
@@ -82,7 +82,8 @@ class BaseTable(tables.Table):
             if not no_actions:
                 self.sequence.append("actions")
 
-        # Update the table's QuerySet to ensure related fields prefeching
+        # Update the table's QuerySet with what visible columns need, related fields
+        # being prefetched
         if isinstance(self.data, TableQuerysetData):
             prefetch_fields = []
             for column in self.columns:
@@ -108,6 +109,46 @@ class BaseTable(tables.Table):
                         prefetch_fields.append("__".join(prefetch_path))
 
             self.data.data = self.data.data.prefetch_related(*prefetch_fields)
+            self.apply_column_queries(
+                [column.name for column in self.columns if column.visible]
+            )
+
+    @tables.Table.order_by.setter
+    def order_by(self, value):
+        # Columns used for ordering must be annotated even if they are hidden
+        if value:
+            if isinstance(value, str):
+                value = value.split(",")
+            self.apply_column_queries(
+                [name.removeprefix("-") for name in value], related=False
+            )
+        tables.Table.order_by.fset(self, value)
+
+    def apply_column_queries(self, names, related=True):
+        """
+        Updates the table's QuerySet with the annotations and, if `related` is
+        `True`, the related objects declared by the given columns.
+        """
+        if not isinstance(self.data, TableQuerysetData):
+            return
+
+        queryset = self.data.data
+        for name in names:
+            if name not in self.columns:
+                continue
+            column = self.columns[name].column
+            annotations = {
+                alias: expression
+                for alias, expression in getattr(column, "annotations", {}).items()
+                if alias not in queryset.query.annotations
+            }
+            if annotations:
+                queryset = queryset.annotate(**annotations)
+            if related and getattr(column, "select_related", None):
+                queryset = queryset.select_related(*column.select_related)
+            if related and getattr(column, "prefetch_related", None):
+                queryset = queryset.prefetch_related(*column.prefetch_related)
+        self.data.data = queryset
 
     def _get_columns(self, visible=True):
         columns = []
@@ -1,6 +1,19 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 
-from utils.testing import APITestCase
+from extras.models import ConfigContext, ConfigContextAssignment
+from peering.models import AutonomousSystem
+from peering_manager.api.caching import (
+    RESPONSE_KEY_PREFIX,
+    _get_version_key,
+    get_cached_models,
+)
+from users.models import Token
+from utils.testing import APITestCase, clear_cache
 
 
 class AppTest(APITestCase):
@@ -15,3 +28,231 @@ class AppTest(APITestCase):
         response = self.client.get(f"{url}?format=api", **self.header)
 
         self.assertEqual(response.status_code, 200)
+
+
+class ConfigContextPrefetchTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        AutonomousSystem.objects.create(asn=64500, name="AS 1")
+
+    def test_prefetch(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        with patch.object(
+            AutonomousSystem,
+            "prefetch_config_contexts",
+            side_effect=AutonomousSystem.prefetch_config_contexts,
+        ) as prefetch:
+            self.assertEqual(200, self.client.get(url, **self.header).status_code)
+            prefetch.assert_called_once()
+
+            # Brief representations do not include config contexts
+            prefetch.reset_mock()
+            response = self.client.get(f"{url}?brief=1", **self.header)
+            self.assertEqual(200, response.status_code)
+            prefetch.assert_not_called()
+
+
+class PaginationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        AutonomousSystem.objects.bulk_create(
+            [
+                AutonomousSystem(
+                    asn=64500 + i,
+                    name=f"AS {i}",
+                    ipv6_max_prefixes=None if i % 3 == 0 else i % 2,
+                )
+                for i in range(10)
+            ]
+        )
+
+    def _walk(self, url):
+        pks = []
+        while url:
+            response = self.client.get(url, **self.header)
+            self.assertEqual(response.status_code, 200)
+            pks.extend(o["id"] for o in response.data["results"])
+            url = response.data["next"]
+        return pks
+
+    def test_cursor_follows_ordering(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        rows = list(
+            AutonomousSystem.objects.values_list("pk", "asn", "ipv6_max_prefixes")
+        )
+        # Values of ipv6_max_prefixes are tied and nullable, the primary key breaks
+        # ties, null values come last in ascending order and first in descending one
+        expected = {
+            "asn": sorted(rows, key=lambda r: r[1]),
+            "-asn": sorted(rows, key=lambda r: -r[1]),
+            "ipv6_max_prefixes": sorted(
+                rows, key=lambda r: (r[2] is None, r[2] or 0, r[0])
+            ),
+            "-ipv6_max_prefixes": sorted(
+                rows, key=lambda r: (r[2] is not None, -(r[2] or 0), r[0])
+            ),
+            "ipv6_max_prefixes,-asn": sorted(
+                rows, key=lambda r: (r[2] is None, r[2] or 0, -r[1])
+            ),
+        }
+        for ordering, sorted_rows in expected.items():
+            for limit in (1, 3, 4):
+                with self.subTest(ordering=ordering, limit=limit):
+                    self.assertEqual(
+                        self._walk(f"{url}?ordering={ordering}&cursor=&limit={limit}"),
+                        [r[0] for r in sorted_rows],
+                    )
+
+    def test_cursor_without_count(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(f"{url}?cursor=&limit=5", **self.header)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["count"])
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIn("cursor=", response.data["next"])
+
+    def test_invalid_cursor(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(f"{url}?cursor=invalid", **self.header)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_exact_count(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(f"{url}?limit=5", **self.header)
+
+        self.assertEqual(response.data["count"], 10)
+        self.assertTrue(response.data["count_exact"])
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1)
+    def test_estimated_count(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(f"{url}?limit=4", **self.header)
+
+        self.assertFalse(response.data["count_exact"])
+        self.assertGreaterEqual(response.data["count"], 1)
+        # Pages are followed until one is not full, whatever the estimate is
+        self.assertEqual(
+            sorted(self._walk(f"{url}?limit=4")),
+            sorted(AutonomousSystem.objects.values_list("pk", flat=True)),
+        )
+
+    @override_settings(CACHE_COUNT_TIMEOUT=60)
+    def test_cached_count(self):
+        clear_cache()
+        url = reverse("peering-api:autonomoussystem-list")
+        self.client.get(f"{url}?limit=5", **self.header)
+
+        AutonomousSystem.objects.filter(asn=64500).delete()
+        response = self.client.get(f"{url}?limit=5", **self.header)
+        self.assertEqual(response.data["count"], 10)
+        response = self.client.get(f"{url}?limit=5&asn__gte=64500", **self.header)
+        self.assertEqual(response.data["count"], 9)
+
+
+@override_settings(CACHE_API_TIMEOUT=60)
+class ResponseCacheTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        AutonomousSystem.objects.create(asn=64500, name="AS 1")
+
+    def setUp(self):
+        super().setUp()
+        clear_cache()
+
+    def test_cached_list(self):
+        url = reverse("peering-api:autonomoussystem-list")
+
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+
+        # Served from the cache, as well as the token, without any query
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, **self.header)
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+        # Different query parameters are cached separately
+        filtered = self.client.get(f"{url}?asn=64501", **self.header)
+        self.assertEqual(filtered.data["count"], 0)
+        self.assertNotEqual(filtered["ETag"], response["ETag"])
+
+    def test_not_modified(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(url, **self.header)
+
+        not_modified = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], **self.header
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_invalidation(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AutonomousSystem.objects.create(asn=64501, name="AS 2")
+
+        changed = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], **self.header
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.data["count"], 2)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    def test_transitive_invalidation(self):
+        autonomous_system = AutonomousSystem.objects.get(asn=64500)
+        config_context = ConfigContext.objects.create(name="Test", data={"a": 1})
+        ConfigContextAssignment.objects.create(
+            object=autonomous_system, config_context=config_context
+        )
+        url = reverse(
+            "peering-api:autonomoussystem-detail", kwargs={"pk": autonomous_system.pk}
+        )
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data["config_context"], {"a": 1})
+
+        # Config contexts are reached through their assignments
+        with self.captureOnCommitCallbacks(execute=True):
+            config_context.data = {"a": 2}
+            config_context.save()
+
+        changed = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], **self.header
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.data["config_context"], {"a": 2})
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    def test_evicted_versions(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(url, **self.header)
+
+        # Change not seen (no version bump) but versions evicted from the cache
+        AutonomousSystem.objects.create(asn=64501, name="AS 2")
+        cache.delete_many(
+            [_get_version_key(m) for m in get_cached_models(AutonomousSystem)]
+        )
+
+        changed = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], **self.header
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.data["count"], 2)
+
+    def test_permissions(self):
+        url = reverse("peering-api:autonomoussystem-list")
+        response = self.client.get(url, **self.header)
+
+        # Users with different permissions do not share cached responses
+        user = User.objects.create_user(username="unprivileged")
+        token = Token.objects.create(user=user)
+        other = self.client.get(url, HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.assertEqual(other.status_code, 200)
+        self.assertEqual(2, len(cache.keys(f"{RESPONSE_KEY_PREFIX}:*")))
+        # Identical data get the same ETag whoever they are cached for
+        self.assertEqual(other["ETag"], response["ETag"])
@@ -1,11 +1,15 @@
+from datetime import timedelta
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import Group, Permission
 from django.test import Client
 from django.test.utils import override_settings
 from django.urls import reverse
+from django.utils import timezone
 
-from utils.testing import TestCase
+from peering_manager.authentication import RemoteUserBackend
+from utils.testing import APITestCase, TestCase, clear_cache
 
 User = get_user_model()
 
@@ -297,3 +301,101 @@ class ExternalAuthenticationTestCase(TestCase):
             msg="Authentication failed",
         )
         self.assertListEqual([groups[0], groups[1]], list(new_user.groups.all()))
+
+
+class TokenAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        clear_cache()
+        self.url = reverse("api-status")
+
+    def test_token_cache(self):
+        # Token is looked up once, then cached, last use recorded once
+        with self.assertNumQueries(2):
+            self.assertEqual(200, self.client.get(self.url, **self.header).status_code)
+        with self.assertNumQueries(0):
+            self.assertEqual(200, self.client.get(self.url, **self.header).status_code)
+        self.token.refresh_from_db()
+        self.assertIsNotNone(self.token.last_used)
+
+        # Changes of the token are seen immediately
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.expires = timezone.now() - timedelta(days=1)
+            self.token.save()
+        self.assertEqual(403, self.client.get(self.url, **self.header).status_code)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+        self.assertEqual(403, self.client.get(self.url, **self.header).status_code)
+
+    def test_token_key_change(self):
+        self.assertEqual(200, self.client.get(self.url, **self.header).status_code)
+
+        # The previous key is not accepted anymore, even if cached
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.key = "b" * 40
+            self.token.save()
+        self.assertEqual(403, self.client.get(self.url, **self.header).status_code)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f"Token {'b' * 40}")
+        self.assertEqual(200, response.status_code)
+
+    def test_user_change(self):
+        self.assertEqual(200, self.client.get(self.url, **self.header).status_code)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(403, self.client.get(self.url, **self.header).status_code)
+
+    @override_settings(CACHE_TOKEN_TIMEOUT=0)
+    def test_allowed_ips(self):
+        self.token.allowed_ips = ["192.0.2.0/24", "2001:db8::/32"]
+        self.token.save()
+
+        for ip, status in (
+            ("192.0.2.1", 200),
+            ("2001:db8::1", 200),
+            ("198.51.100.1", 403),
+            ("2001:db9::1", 403),
+        ):
+            with self.subTest(ip=ip):
+                response = self.client.get(self.url, REMOTE_ADDR=ip, **self.header)
+                self.assertEqual(status, response.status_code)
+
+
+class PermissionCacheTestCase(TestCase):
+    def test_cached_permissions(self):
+        self.add_permissions("peering.view_autonomoussystem")
+
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.has_perm("peering.view_autonomoussystem"))
+        # Permissions are not queried again for later requests
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("peering.view_autonomoussystem"))
+            self.assertFalse(user.has_perm("peering.change_autonomoussystem"))
+
+        # Assigned permissions are seen immediately
+        group = Group.objects.create(name="Group 1")
+        self.add_permissions("peering.change_autonomoussystem")
+        group.permissions.add(
+            Permission.objects.get(codename="delete_autonomoussystem")
+        )
+        self.user.groups.add(group)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.has_perm("peering.change_autonomoussystem"))
+        self.assertTrue(user.has_perm("peering.delete_autonomoussystem"))
+
+    @override_settings(REMOTE_AUTH_AUTO_CREATE_GROUPS=True)
+    def test_group_sync(self):
+        backend = RemoteUserBackend()
+        backend.configure_groups(self.user, ["Group 1", "Group 2"])
+        self.assertListEqual(
+            ["Group 1", "Group 2"], [g.name for g in self.user.groups.all()]
+        )
+
+        # Unchanged groups: fetched twice (by name and the user's), not written
+        with self.assertNumQueries(2):
+            backend.configure_groups(self.user, ["Group 2", "Group 1"])
+
+        backend.configure_groups(self.user, ["Group 2"])
+        self.assertListEqual(["Group 2"], [g.name for g in self.user.groups.all()])
@@ -0,0 +1,125 @@
+from bgp.models import Relationship
+from devices.models import Router
+from net.models import Connection
+from peering.enums import BGPState
+from peering.models import (
+    AutonomousSystem,
+    DirectPeeringSession,
+    InternetExchange,
+    InternetExchangePeeringSession,
+)
+from peering.tables import AutonomousSystemTable, InternetExchangePeeringSessionTable
+from peeringdb.models import InternetExchange as Ix
+from peeringdb.models import IXLan, Network, NetworkIXLan, Organization
+from utils.testing import TestCase
+
+
+class BaseTableTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.local_as = AutonomousSystem.objects.create(
+            asn=64500, name="Local", affiliated=True
+        )
+        cls.remote_as = AutonomousSystem.objects.create(asn=64501, name="Remote")
+        relationship = Relationship.objects.create(name="Peer", slug="peer")
+        DirectPeeringSession.objects.bulk_create(
+            [
+                DirectPeeringSession(
+                    local_autonomous_system=cls.local_as,
+                    autonomous_system=cls.remote_as,
+                    relationship=relationship,
+                    ip_address=f"192.0.2.{i}",
+                )
+                for i in range(1, 3)
+            ]
+        )
+
+    def test_visible_column_queries(self):
+        table = AutonomousSystemTable(AutonomousSystem.objects.all())
+        annotations = table.data.data.query.annotations
+        self.assertIn("directpeeringsession_count", annotations)
+        self.assertIn("internetexchangepeeringsession_count", annotations)
+
+        counts = {r.asn: r.directpeeringsession_count for r in table.data.data}
+        self.assertEqual(counts, {64500: 0, 64501: 2})
+
+    def test_hidden_column_queries(self):
+        self.user.preferences.set(
+            "tables.AutonomousSystemTable.columns",
+            ["asn", "name", "directpeeringsession_count"],
+            commit=True,
+        )
+        table = AutonomousSystemTable(AutonomousSystem.objects.all(), user=self.user)
+        annotations = table.data.data.query.annotations
+        self.assertIn("directpeeringsession_count", annotations)
+        self.assertNotIn("internetexchangepeeringsession_count", annotations)
+
+    def test_ordering_by_hidden_column(self):
+        self.user.preferences.set(
+            "tables.AutonomousSystemTable.columns", ["asn", "name"], commit=True
+        )
+        table = AutonomousSystemTable(
+            AutonomousSystem.objects.all(),
+            user=self.user,
+            order_by="-directpeeringsession_count",
+        )
+        self.assertIn("directpeeringsession_count", table.data.data.query.annotations)
+        self.assertEqual([r.asn for r in table.data.data], [64501, 64500])
+
+    def test_is_abandoned_queries(self):
+        org = Organization.objects.create(name="Org")
+        ixlan = IXLan.objects.create(
+            name="IXLan", ix=Ix.objects.create(name="IX", org=org)
+        )
+        router = Router.objects.create(
+            local_autonomous_system=self.local_as,
+            name="Router",
+            hostname="router.example.com",
+            poll_bgp_sessions_state=True,
+        )
+        connection = Connection.objects.create(
+            vlan=2000,
+            internet_exchange_point=InternetExchange.objects.create(
+                local_autonomous_system=self.local_as, name="IXP", slug="ixp"
+            ),
+            router=router,
+            peeringdb_netixlan=NetworkIXLan.objects.create(
+                asn=self.local_as.asn,
+                ipaddr6="2001:db8::ffff",
+                speed=1000,
+                ixlan=ixlan,
+                net=Network.objects.create(name="Local", asn=64500, org=org),
+            ),
+        )
+        # Public ASNs, the ones with a PeeringDB network are abandoned
+        for i, asn in enumerate((15169, 13335, 2906), start=1):
+            InternetExchangePeeringSession.objects.create(
+                autonomous_system=AutonomousSystem.objects.create(
+                    asn=asn, name=f"AS{asn}"
+                ),
+                ixp_connection=connection,
+                ip_address=f"2001:db8::{i}",
+                bgp_state=BGPState.IDLE,
+            )
+            if asn != 2906:
+                Network.objects.create(name=f"AS{asn}", asn=asn, org=org)
+
+        self.user.preferences.set(
+            "tables.InternetExchangePeeringSessionTable.columns",
+            ["ip_address", "is_abandoned"],
+            commit=True,
+        )
+        table = InternetExchangePeeringSessionTable(
+            InternetExchangePeeringSession.objects.order_by("ip_address"),
+            user=self.user,
+        )
+        with self.assertNumQueries(1):
+            abandoned = [s.is_abandoned for s in table.data.data]
+        self.assertEqual([True, True, False], abandoned)
+        self.assertEqual(
+            abandoned,
+            [
+                s.is_abandoned
+                for s in InternetExchangePeeringSession.objects.order_by("ip_address")
+            ],
+        )
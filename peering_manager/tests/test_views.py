@@ -1,6 +1,12 @@
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
 
+from peering.models import AutonomousSystem
+from peering_manager.constants import SEARCH_MAX_RESULTS
+from peering_manager.metrics import StatisticsCollector
+from peering_manager.statistics import get_statistics
+from utils.testing import clear_cache
 from utils.tests import ViewTestCase
 
 
@@ -10,10 +16,51 @@ class PeeringManagerViewsTestCase(ViewTestCase):
         response = self.client.get(reverse("home"))
         self.assertEqual(response.status_code, 200)
 
+    @override_settings(LOGIN_REQUIRED=False)
+    def test_homepage_statistics(self):
+        clear_cache()
+        response = self.client.get(reverse("home"))
+        self.assertEqual(0, response.context["statistics"]["autonomous_systems_count"])
+
+        # Counts are cached until objects are created or deleted
+        with self.assertNumQueries(0):
+            statistics = get_statistics()
+        self.assertEqual(response.context["statistics"], statistics)
+        with self.captureOnCommitCallbacks(execute=True):
+            autonomous_system = AutonomousSystem.objects.create(asn=64500, name="AS")
+        self.assertEqual(1, get_statistics()["autonomous_systems_count"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            autonomous_system.name = "Renamed"
+            autonomous_system.save()
+        with self.assertNumQueries(0):
+            get_statistics()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            autonomous_system.delete()
+        metrics = {
+            s.labels["model"]: s.value
+            for m in StatisticsCollector().collect()
+            for s in m.samples
+        }
+        self.assertEqual(0, metrics["peering.autonomoussystem"])
+
     @override_settings(LOGIN_REQUIRED=False)
     def test_search(self):
         response = self.client.get(f"{reverse('search')}?q=foo")
         self.assertHttpStatus(response, 200)
+        self.assertEqual([], response.context["results"])
+
+        AutonomousSystem.objects.bulk_create(
+            [AutonomousSystem(asn=64500 + i, name=f"Foo {i}") for i in range(20)]
+        )
+        call_command("reindex", "peering", verbosity=0)
+        response = self.client.get(f"{reverse('search')}?q=foo")
+        self.assertHttpStatus(response, 200)
+        (result,) = response.context["results"]
+        self.assertEqual(20, result["count"])
+        self.assertTrue(result["has_more"])
+        self.assertEqual(SEARCH_MAX_RESULTS, len(result["table"].rows))
 
     @override_settings(LOGIN_REQUIRED=False)
     def test_error500_view(self):
@@ -1,25 +1,17 @@
+from collections import defaultdict
+
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.shortcuts import render
 from django.urls import reverse
 from django.views.generic import View
 from packaging import version
 
-from bgp.models import Community
-from core.models import ObjectChange
-from devices.models import Configuration, Router
-from messaging.models import Contact, Email
-from net.models import BFD, Connection
-from peering.models import (
-    AutonomousSystem,
-    BGPGroup,
-    DirectPeeringSession,
-    InternetExchange,
-    InternetExchangePeeringSession,
-    RoutingPolicy,
-)
+from core.models import CachedValue, ObjectChange
 from peering_manager.constants import SEARCH_MAX_RESULTS, SEARCH_TYPES
 from peering_manager.forms import SearchForm
+from peering_manager.statistics import get_statistics
 from peeringdb.models import Synchronisation
 
 __all__ = ("HomeView", "SearchView")
@@ -27,21 +19,7 @@ __all__ = ("HomeView", "SearchView")
 
 class HomeView(View):
     def get(self, request):
-        statistics = {
-            "autonomous_systems_count": AutonomousSystem.objects.count(),
-            "bfd_count": BFD.objects.count(),
-            "bgp_groups_count": BGPGroup.objects.count(),
-            "communities_count": Community.objects.count(),
-            "connections_count": Connection.objects.count(),
-            "direct_peering_sessions_count": DirectPeeringSession.objects.count(),
-            "internet_exchanges_count": InternetExchange.objects.count(),
-            "internet_exchange_peering_sessions_count": InternetExchangePeeringSession.objects.count(),
-            "routers_count": Router.objects.count(),
-            "routing_policies_count": RoutingPolicy.objects.count(),
-            "configurations_count": Configuration.objects.count(),
-            "contacts_count": Contact.objects.count(),
-            "emails_count": Email.objects.count(),
-        }
+        statistics = get_statistics()
 
         # Check whether a new release is available (staff and superusers only)
         new_release = None
@@ -56,7 +34,7 @@ class HomeView(View):
             "statistics": statistics,
             "changelog": ObjectChange.objects.select_related(
                 "user", "changed_object_type"
-            )[:15],
+            ).prefetch_related("changed_object")[:15],
             "synchronisations": Synchronisation.objects.all()[:5],
             "new_release": new_release,
         }
@@ -69,26 +47,47 @@ class SearchView(View):
         results = []
 
         if form.is_valid():
+            query = form.cleaned_data["q"]
+            object_types = {
+                ContentType.objects.get_for_model(
+                    SEARCH_TYPES[obj_type]["queryset"].model
+                ).pk: obj_type
+                for obj_type in SEARCH_TYPES
+            }
+
+            # Find matching objects of all types at once, most relevant first
+            matches = defaultdict(list)
+            for object_type, object_id in CachedValue.search(
+                query, object_types=object_types
+            ):
+                matches[object_types[object_type]].append(object_id)
+
             for obj_type in SEARCH_TYPES:
+                if not matches[obj_type]:
+                    continue
+
                 queryset = SEARCH_TYPES[obj_type]["queryset"]
-                filterset = SEARCH_TYPES[obj_type]["filterset"]
                 table = SEARCH_TYPES[obj_type]["table"]
                 url = SEARCH_TYPES[obj_type]["url"]
 
-                # Construct the results table for this object type
-                filtered_queryset = filterset(
-                    {"q": form.cleaned_data["q"]}, queryset=queryset
-                ).qs
-                table = table(filtered_queryset, orderable=False, no_actions=True)
-                table.paginate(per_page=SEARCH_MAX_RESULTS)
-
-                if table.page:
-                    results.append(
-                        {
-                            "name": queryset.model._meta.verbose_name_plural,
-                            "table": table,
-                            "url": f"{reverse(url)}?q={form.cleaned_data.get('q')}",
-                        }
-                    )
+                # Construct the results table for this object type, with the best
+                # matches only
+                pks = matches[obj_type][:SEARCH_MAX_RESULTS]
+                objects = queryset.in_bulk(pks)
+                table = table(
+                    [objects[pk] for pk in pks if pk in objects],
+                    orderable=False,
+                    no_actions=True,
+                )
+
+                results.append(
+                    {
+                        "name": queryset.model._meta.verbose_name_plural,
+                        "table": table,
+                        "count": len(matches[obj_type]),
+                        "has_more": len(matches[obj_type]) > SEARCH_MAX_RESULTS,
+                        "url": f"{reverse(url)}?q={query}",
+                    }
+                )
 
         return render(request, "search.html", {"form": form, "results": results})
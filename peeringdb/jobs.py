@@ -18,7 +18,7 @@ logger = logging.getLogger("peering.manager.peeringdb.jobs")
 
 # One hour and 30 minutes timeout as this process can take long depending on the host
 # properties
-@job("default", timeout=5400)
+@job("sync", timeout=5400)
 def synchronise(job: Job) -> None:
     job.mark_running("Synchronising PeeringDB local data.", logger=logger)
 
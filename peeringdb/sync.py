@@ -13,6 +13,7 @@ from django.db.utils import DEFAULT_DB_ALIAS
 from core.enums import ObjectChangeAction
 from net.models import Connection
 from peering.models import InternetExchange as Ixp
+from peering_manager.api.caching import invalidate_models
 
 from .models import (
     BaseModel,
@@ -355,3 +356,7 @@ class PeeringDB:
         for model in reversed(list(NAMESPACES.values())):
             model.objects.all()._raw_delete(using=DEFAULT_DB_ALIAS)
         Synchronisation.objects.all()._raw_delete(using=DEFAULT_DB_ALIAS)
+
+        invalidate_models(
+            Connection, Ixp, HiddenPeer, Synchronisation, *NAMESPACES.values()
+        )
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Make Peering Manager modules importable when run from anywhere
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from devices.crypto import CIPHERS
+
+
+def setup_cli():
+    parser = argparse.ArgumentParser(
+        description="Measure the time taken by each password cipher to encrypt a BGP session password"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=2000, help="number of sessions (keys) to use"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of runs, the best one is kept"
+    )
+
+    return parser.parse_args()
+
+
+def encrypt_sessions(cipher, passwords):
+    """
+    Runs the same cycle as `BGPSession.encrypt_password()` for each session:
+    encrypt, re-encrypt check of the encrypted value and decrypt.
+    """
+    for key, password in passwords:
+        encrypted = cipher.encrypt(password, key=key)
+        cipher.encrypt(encrypted, key=key)
+        cipher.decrypt(encrypted, key=key)
+
+
+if __name__ == "__main__":
+    args = setup_cli()
+    passwords = [(f"2001:db8::{i:x}", f"password{i}") for i in range(args.sessions)]
+
+    for algorithm, cipher in CIPHERS.items():
+        best = min(
+            timeit.repeat(
+                lambda cipher=cipher: encrypt_sessions(cipher, passwords),
+                repeat=args.repeat,
+                number=1,
+            )
+        )
+        print(f"{algorithm}: {best / args.sessions * 1e6:.1f} us per session")
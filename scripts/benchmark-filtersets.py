@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+# Make Peering Manager modules importable when run from anywhere
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "peering_manager.settings")
+
+import django
+
+
+def setup_cli():
+    parser = argparse.ArgumentParser(
+        description="Measure the time taken to instantiate filtersets, with the filters built once per class or regenerated for each instance"
+    )
+    parser.add_argument(
+        "--number", type=int, default=200, help="number of instantiations per run"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of runs, the best one is kept"
+    )
+
+    return parser.parse_args()
+
+
+def instantiate(filterset_class, regenerate):
+    if regenerate:
+        # What was done for each instance before filters were built once
+        filterset_class.get_filters()
+    filterset_class(data={"q": "test"}, queryset=filterset_class._meta.model.objects)
+
+
+def search_request(search_types, regenerate):
+    # A search request instantiates one filterset per search type
+    for search_type in search_types.values():
+        instantiate(search_type["filterset"], regenerate)
+
+
+def best_of(function, number, repeat):
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+if __name__ == "__main__":
+    args = setup_cli()
+    django.setup()
+
+    from peering.filtersets import DirectPeeringSessionFilterSet
+    from peering_manager.constants import SEARCH_TYPES
+
+    filterset_class = DirectPeeringSessionFilterSet
+    print(
+        f"{filterset_class.__name__} ({len(filterset_class.base_filters)} filters), "
+        f"{len(SEARCH_TYPES)} search types"
+    )
+
+    for label, function in (
+        ("one instantiation", lambda r: instantiate(filterset_class, r)),
+        ("one filterset per search type", lambda r: search_request(SEARCH_TYPES, r)),
+    ):
+        cached = best_of(lambda f=function: f(False), args.number, args.repeat)
+        regenerated = best_of(lambda f=function: f(True), args.number, args.repeat)
+        print(
+            f"{label}: {regenerated * 1e3:.1f} ms regenerated -> {cached * 1e3:.1f} ms"
+        )
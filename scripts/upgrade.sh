@@ -97,6 +97,10 @@ $DRY python manage.py collectstatic --no-input || exit 1
 echo "🔄 Removing stale content types"
 $DRY python manage.py remove_stale_contenttypes --no-input || exit 1
 
+# Build the search cache of models which are not indexed yet
+echo "🔄 Building the search cache"
+$DRY python manage.py reindex --lazy || exit 1
+
 # Delete any expired user sessions
 echo "🔄 Removing expired user sessions"
 $DRY python manage.py clearsessions || exit 1
@@ -7,6 +7,7 @@ from django.contrib.postgres.fields import ArrayField
 from django.core.validators import MinLengthValidator
 from django.db import models
 from django.utils import timezone
+from django.utils.functional import cached_property
 from netfields.fields import CidrAddressField
 
 __all__ = ("Token", "UserPreferences")
@@ -61,13 +62,29 @@ class Token(models.Model):
         """
         return (self.expires is not None) and (timezone.now() >= self.expires)
 
+    @cached_property
+    def allowed_networks(
+        self,
+    ) -> dict[int, tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]]:
+        """
+        Returns the allowed networks, parsed once and grouped by IP version.
+        """
+        networks = [ipaddress.ip_network(n) for n in self.allowed_ips or []]
+        return {
+            version: tuple(n for n in networks if n.version == version)
+            for version in (4, 6)
+        }
+
     def validate_client_ip(
         self, ip_address: ipaddress.IPv4Address | ipaddress.IPv6Address
     ) -> bool:
         if not self.allowed_ips:
             return True
 
-        return any(ip_address in allowed for allowed in self.allowed_ips)
+        return any(
+            ip_address in allowed
+            for allowed in self.allowed_networks[ip_address.version]
+        )
 
 
 class UserPreferences(models.Model):
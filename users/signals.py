@@ -1,12 +1,16 @@
+import copy
 import logging
 
 from django.conf import settings
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Group, Permission, User
 from django.contrib.auth.signals import user_login_failed
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import UserPreferences
+from peering_manager.api.authentication import invalidate_tokens
+from peering_manager.authentication.backends import invalidate_permissions
+
+from .models import Token, UserPreferences
 
 
 @receiver(user_login_failed)
@@ -22,4 +26,60 @@ def create_userpreferences(instance, created, **kwargs):
     Creates a new `UserPreferences` when a new `User` is created.
     """
     if created:
-        UserPreferences(user=instance, data=settings.DEFAULT_USER_PREFERENCES).save()
+        UserPreferences(
+            user=instance, data=copy.deepcopy(settings.DEFAULT_USER_PREFERENCES)
+        ).save()
+
+
+@receiver(pre_save, sender=Token)
+def invalidate_previous_token_cache(instance, **kwargs):
+    """
+    Removes the previous key of a `Token` from the cache when it is changed, so
+    that it cannot be used anymore.
+    """
+    if instance.pk is None:
+        return
+    previous_key = (
+        Token.objects.filter(pk=instance.pk).values_list("key", flat=True).first()
+    )
+    if previous_key and previous_key != instance.key:
+        invalidate_tokens(previous_key)
+
+
+@receiver((post_save, post_delete), sender=Token)
+def invalidate_token_cache(instance, **kwargs):
+    """
+    Removes a changed or deleted `Token` from the cache.
+    """
+    invalidate_tokens(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens_cache(instance, created, update_fields=None, **kwargs):
+    """
+    Removes the `Token`s of a changed `User` from the cache, unless only its last
+    login time is saved.
+    """
+    if created or (update_fields and set(update_fields) == {"last_login"}):
+        return
+    invalidate_tokens(*instance.tokens.values_list("key", flat=True))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permissions_cache_on_assignment(action, **kwargs):
+    """
+    Makes cached permissions stale when permissions or groups are assigned.
+    """
+    if action.startswith("post_"):
+        invalidate_permissions()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def invalidate_permissions_cache_on_delete(**kwargs):
+    """
+    Makes cached permissions stale when a group or a permission is deleted.
+    """
+    invalidate_permissions()
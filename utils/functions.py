@@ -1,10 +1,11 @@
+import functools
 import hashlib
 import hmac
 import json
 
 from django.contrib import messages
 from django.core.serializers import serialize
-from django.db.models import Count, OuterRef, Subquery
+from django.db.models import Count, OuterRef, QuerySet, Subquery
 from django.db.models.functions import Coalesce
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
@@ -13,6 +14,7 @@ from taggit.managers import _TaggableManager
 from .templatetags.helpers import title_with_uppers
 
 __all__ = (
+    "QuerySetStream",
     "content_type_identifier",
     "content_type_name",
     "count_related",
@@ -70,11 +72,16 @@ def generate_signature(data, secret):
     return signature.hexdigest()
 
 
-def sha256_hash(filepath):
+def sha256_hash(filepath, chunk_size=2**16):
     """
-    Returns the SHA256 hash of the file at the specified path.
+    Returns the SHA256 hash of the file at the specified path, reading it by chunks
+    to avoid loading it whole in memory.
     """
-    return hashlib.sha256(filepath.read_bytes())
+    h = hashlib.sha256()
+    with filepath.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h
 
 
 def is_taggable(instance):
@@ -100,6 +107,49 @@ def count_related(model, field):
     return Coalesce(subquery, 0)
 
 
+class QuerySetStream:
+    """
+    Iterable over the objects of a queryset, fetched in chunks with
+    `QuerySet.iterator()` each time it is iterated over instead of being loaded and
+    cached in memory. Its length is counted by the database.
+
+    Other queryset methods are available and run by the database, the querysets
+    they return (e.g. with `filter()` or `order_by()`) being streamed as well.
+    """
+
+    def __init__(self, queryset, chunk_size=2000):
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+
+    def __getattr__(self, name):
+        attribute = getattr(self.queryset, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def method(*args, **kwargs):
+            return self._wrap(attribute(*args, **kwargs))
+
+        return method
+
+    def __getitem__(self, key):
+        return self._wrap(self.queryset[key])
+
+    def __iter__(self):
+        return self.queryset.iterator(chunk_size=self.chunk_size)
+
+    def __len__(self):
+        return self.queryset.count()
+
+    def __bool__(self):
+        return self.queryset.exists()
+
+    def _wrap(self, value):
+        if isinstance(value, QuerySet):
+            return QuerySetStream(value, chunk_size=self.chunk_size)
+        return value
+
+
 def serialize_object(instance, extra=None, exclude=None):
     """
     Return a generic JSON representation of an object using Django's built-in
@@ -1,14 +1,72 @@
+import hashlib
+import json
 from itertools import pairwise
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
 from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 
-__all__ = ("EnhancedPaginator", "get_paginate_count")
+__all__ = ("EnhancedPaginator", "count_objects", "get_paginate_count")
+
+
+def estimate_count(queryset):
+    """
+    Returns the number of rows the PostgreSQL query planner expects the queryset to
+    return, without running it.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_objects(queryset):
+    """
+    Returns the number of objects matched by a queryset and whether this number is
+    exact.
+
+    With PostgreSQL, the number of rows estimated by the query planner is used
+    when it reaches `COUNT_ESTIMATE_THRESHOLD`, avoiding to scan large tables just
+    to count them. Exact counts are cached for `CACHE_COUNT_TIMEOUT` seconds, by
+    SQL query, so that browsing pages does not count the same objects again.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0, True
+
+    threshold = settings.COUNT_ESTIMATE_THRESHOLD
+    if threshold and connections[queryset.db].vendor == "postgresql":
+        estimate = estimate_count(queryset)
+        if estimate >= threshold:
+            return estimate, False
+
+    if not settings.CACHE_COUNT_TIMEOUT:
+        return queryset.count(), True
+
+    key = (
+        "count:" + hashlib.sha256(repr((queryset.db, sql, params)).encode()).hexdigest()
+    )
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=settings.CACHE_COUNT_TIMEOUT)
+    return count, True
 
 
 class EnhancedPaginator(Paginator):
     default_page_lengths = (25, 50, 100, 250, 500, 1000)
 
+    # Whether `count` is exact or estimated
+    count_exact = True
+
     def __init__(self, object_list, per_page, orphans=None, **kwargs):
         try:
             per_page = int(per_page)
@@ -23,6 +81,28 @@ class EnhancedPaginator(Paginator):
 
         super().__init__(object_list, per_page, orphans=orphans, **kwargs)
 
+    @cached_property
+    def count(self):
+        # Tables give their rows, wrapping the queryset into table data
+        data = getattr(self.object_list, "data", None)
+        queryset = getattr(data, "data", self.object_list)
+        if not isinstance(queryset, QuerySet):
+            return super().count
+
+        count, self.count_exact = count_objects(queryset)
+        if data is not None:
+            # Do not let the table count its rows again
+            data._length = count
+        return count
+
+    def page(self, number):
+        page = super().page(number)
+        if not self.count_exact:
+            # Do not cut the page at an estimated count, it may be too low
+            bottom = (page.number - 1) * self.per_page
+            page.object_list = self.object_list[bottom : bottom + self.per_page]
+        return page
+
     def _get_page(self, *args, **kwargs):
         return EnhancedPage(*args, **kwargs)
 
@@ -7,6 +7,7 @@ from rest_framework.test import APIClient
 from users.models import Token
 
 from .base import ModelTestCase
+from .functions import clear_cache
 
 __all__ = ("APITestCase", "APIViewTestCases")
 
@@ -19,6 +20,7 @@ class APITestCase(ModelTestCase):
         """
         Creates a superuser and token for API calls.
         """
+        clear_cache()
         self.user = User.objects.create(
             username="testuser", is_staff=True, is_superuser=True
         )
@@ -138,6 +140,25 @@ class APIViewTestCases:
             self.assertEqual(len(response.data["results"]), self.model.objects.count())
             self.assertEqual(sorted(response.data["results"][0]), sorted(fields))
 
+        def test_list_objects_cursor(self):
+            """
+            GET all objects, one page at a time, using the "cursor" parameter.
+            """
+            url = f"{self._get_list_url()}?cursor=&limit=1"
+            seen = []
+            while url:
+                response = self.client.get(url, **self.header)
+                self.assertHttpStatus(response, status.HTTP_200_OK)
+                self.assertIsNone(response.data["count"])
+                self.assertIsNone(response.data["previous"])
+                seen.extend(o["id"] for o in response.data["results"])
+                url = response.data["next"]
+
+            self.assertEqual(len(seen), len(set(seen)))
+            self.assertEqual(
+                sorted(seen), sorted(self.model.objects.values_list("pk", flat=True))
+            )
+
     class CreateObjectView(APITestCase):
         create_data = []
         validation_excluded_fields = []
@@ -225,6 +246,28 @@ class APIViewTestCases:
             for instance in self._get_queryset().filter(pk__in=id_list):
                 self.assertInstanceEqual(instance, self.bulk_update_data, api=True)
 
+        def test_bulk_update_objects_set_based(self):
+            """
+            PATCH a set of objects in a single request using set-based writes.
+            """
+            if self.bulk_update_data is None:
+                self.skipTest("Bulk update data not set")
+
+            id_list = self._get_queryset().values_list("id", flat=True)[:3]
+            self.assertEqual(len(id_list), 3, "Not enough objects to test bulk update")
+            data = [{"id": id, **self.bulk_update_data} for id in id_list]
+
+            response = self.client.patch(
+                f"{self._get_list_url()}?set_based=true",
+                data,
+                format="json",
+                **self.header,
+            )
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual(len(response.data), 3)
+            for instance in self._get_queryset().filter(pk__in=id_list):
+                self.assertInstanceEqual(instance, self.bulk_update_data, api=True)
+
     class DeleteObjectView(APITestCase):
         def test_delete_object(self):
             """
@@ -257,6 +300,28 @@ class APIViewTestCases:
             self.assertHttpStatus(response, status.HTTP_204_NO_CONTENT)
             self.assertEqual(self._get_queryset().count(), initial_count - 3)
 
+        def test_bulk_delete_objects_set_based(self):
+            """
+            DELETE a set of objects in a single request using set-based writes.
+            """
+            id_list = (
+                self._get_queryset().order_by("-id").values_list("id", flat=True)[:3]
+            )
+            self.assertEqual(
+                len(id_list), 3, "Not enough objects to test bulk deletion"
+            )
+            data = [{"id": id} for id in id_list]
+
+            initial_count = self._get_queryset().count()
+            response = self.client.delete(
+                f"{self._get_list_url()}?set_based=true",
+                data,
+                format="json",
+                **self.header,
+            )
+            self.assertHttpStatus(response, status.HTTP_204_NO_CONTENT)
+            self.assertEqual(self._get_queryset().count(), initial_count - 3)
+
     class View(
         GetObjectView,
         ListObjectsView,
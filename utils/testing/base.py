@@ -14,7 +14,7 @@ from rest_framework import status
 from taggit.managers import TaggableManager
 
 from ..functions import content_type_identifier
-from .functions import extract_form_failures
+from .functions import clear_cache, extract_form_failures
 
 __all__ = ("MockedResponse", "ModelTestCase", "TestCase")
 
@@ -52,6 +52,9 @@ class TestCase(_TestCase):
     user_permissions = ()
 
     def setUp(self):
+        # Do not reuse cached data (e.g. permissions) of other tests
+        clear_cache()
+
         # Create the test user and assign permissions
         self.user = User.objects.create_user(username="testuser")
         self.add_permissions(*self.user_permissions)
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from unittest.mock import patch
 
 __all__ = ("BaseFilterSetTests", "ChangeLoggedFilterSetTests")
 
@@ -15,6 +16,21 @@ class BaseFilterSetTests:
         self.assertGreater(self.queryset.count(), 2)
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
 
+    def test_filters(self):
+        """
+        Test that filters are generated once per class, each instance working on
+        copies of them.
+        """
+        with patch.object(self.filterset, "get_filters") as get_filters:
+            filterset = self.filterset({}, self.queryset)
+        get_filters.assert_not_called()
+
+        self.assertIn("id__n", filterset.filters)
+        self.assertEqual(set(self.filterset.base_filters), set(filterset.filters))
+        for name, filter_ in filterset.filters.items():
+            self.assertIsNot(self.filterset.base_filters[name], filter_)
+            self.assertIs(filterset, filter_.parent)
+
 
 class ChangeLoggedFilterSetTests(BaseFilterSetTests):
     """
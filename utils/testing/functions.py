@@ -4,6 +4,8 @@ import re
 from contextlib import contextmanager
 from pathlib import Path
 
+from django.core.cache import cache
+
 
 @contextmanager
 def disable_warnings(logger_name):
@@ -17,6 +19,14 @@ def disable_warnings(logger_name):
     logger.setLevel(current_level)
 
 
+def clear_cache():
+    """
+    Deletes data cached by the running test process only, the cache being shared
+    with tests run in parallel.
+    """
+    cache.delete_pattern("*")
+
+
 def load_json(filename):
     """
     Loads and return JSON from a file.
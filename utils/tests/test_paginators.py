@@ -0,0 +1,37 @@
+from django.test import TestCase, override_settings
+
+from peering.models import AutonomousSystem
+from peering.tables import AutonomousSystemTable
+
+from ..paginators import EnhancedPaginator, count_objects
+
+
+class EnhancedPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        AutonomousSystem.objects.bulk_create(
+            [AutonomousSystem(asn=64500 + i, name=f"AS {i}") for i in range(10)]
+        )
+
+    def test_count(self):
+        self.assertEqual((0, True), count_objects(AutonomousSystem.objects.none()))
+
+        table = AutonomousSystemTable(AutonomousSystem.objects.all())
+        # Planner estimate, then exact count as the table is small
+        with self.assertNumQueries(2):
+            table.paginate(paginator_class=EnhancedPaginator, per_page=5)
+            self.assertEqual(10, len(table.rows))
+        self.assertEqual(10, table.paginator.count)
+        self.assertTrue(table.paginator.count_exact)
+
+        # Not a queryset
+        paginator = EnhancedPaginator(list(range(3)), 5)
+        self.assertEqual(3, paginator.count)
+        self.assertTrue(paginator.count_exact)
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1)
+    def test_estimated_count(self):
+        table = AutonomousSystemTable(AutonomousSystem.objects.all())
+        table.paginate(paginator_class=EnhancedPaginator, per_page=5)
+        self.assertFalse(table.paginator.count_exact)
+        self.assertEqual(5, len(table.page.object_list))